@@ -23,6 +23,7 @@ from .errors import (
     Destiny2MissingManifest,
     Destiny2RefreshTokenError,
 )
+from .manifest import ManifestStore
 
 DEV_BOTS = [552261846951002112]
 # If you want parsing the manifest data to be easier add your
@@ -292,10 +293,19 @@ class DestinyAPI:
         url = BASE_URL + f"/Destiny2/{platform}/Profile/{user_id}/"
         return await self.request_url(url, params=params, headers=headers)
 
+    def manifest_store(self, d1: bool = False) -> ManifestStore:
+        if d1:
+            return ManifestStore(cog_data_path(self) / "d1/manifest.sqlite")
+        return ManifestStore(cog_data_path(self) / "manifest.sqlite")
+
     def get_entities(self, entity: str, d1: bool = False) -> dict:
         """
         This loads the entity from the saved manifest
         """
+        store = self.manifest_store(d1)
+        if store.exists() and store.has_entity(entity):
+            return store.table(entity)
+        # Manifests downloaded before the store existed are only saved as json
         if d1:
             path = cog_data_path(self) / f"d1/{entity}.json"
         else:
@@ -304,30 +314,36 @@ class DestinyAPI:
             data = json.load(f)
         return data
 
+    def get_stored_definitions(self, entity: str, entity_hash: list, d1: bool = False) -> dict:
+        """
+        This looks up only the requested hashes from the saved manifest
+        """
+        store = self.manifest_store(d1)
+        if not store.exists():
+            data = self.get_entities(entity, d1)
+            return {str(item): data[str(item)] for item in entity_hash if str(item) in data}
+        items = store.get(entity, entity_hash)
+        if not items and not store.has_entity(entity):
+            raise KeyError(entity)
+        return items
+
     async def get_definition(self, entity: str, entity_hash: list, d1: bool = False) -> dict:
         """
         This will attempt to get a definition from the manifest
         if the manifest is missing it will try and pull the data
         from the API
         """
-        items = {}
         try:
-            # the below is to prevent blocking reading the large
-            # ~130mb manifest files and save on API calls
-            task = functools.partial(self.get_entities, entity=entity, d1=d1)
+            # the below is to prevent blocking reading the manifest
+            # and save on API calls
+            task = functools.partial(
+                self.get_stored_definitions, entity=entity, entity_hash=entity_hash, d1=d1
+            )
             task = self.bot.loop.run_in_executor(None, task)
-            data = await asyncio.wait_for(task, timeout=60)
+            return await asyncio.wait_for(task, timeout=60)
         except Exception:
             log.info(_("No manifest found, getting response from API."))
             return await self.get_definition_from_api(entity.replace("Lite", ""), entity_hash)
-        for item in entity_hash:
-            try:
-                items[str(item)] = data[str(item)]
-                # items.append(data[str(item)])
-            except KeyError:
-                pass
-        return items
-        # return data[entity][entity_hash]
 
     async def get_definition_from_api(
         self, entity: str, entity_hash: list, d1: bool = False
@@ -347,19 +363,16 @@ class DestinyAPI:
             # items.append(data)
         return items
 
-    async def search_definition(self, entity: str, entity_hash: str, d1: bool = False) -> dict:
+    def search_stored_definitions(self, entity: str, entity_hash: str, d1: bool = False) -> dict:
         """
-        This is a helper to search clean names for a given definition of data
+        This searches the saved manifest for definitions matching `entity_hash`
         """
-        try:
-            # the below is to prevent blocking reading the large
-            # ~130mb manifest files and save on API calls
-            task = functools.partial(self.get_entities, entity=entity)
-            task = self.bot.loop.run_in_executor(None, task)
-            data: dict = await asyncio.wait_for(task, timeout=60)
-        except Exception:
-            err_msg = _("This command requires the Manifest to be downloaded to work.")
-            raise Destiny2MissingManifest(err_msg)
+        store = self.manifest_store(d1)
+        if store.exists():
+            items = store.search(entity, entity_hash)
+            if items or store.has_entity(entity):
+                return items
+        data = self.get_entities(entity, d1)
         items = {}
         for hash_key, data in data.items():
             if str(entity_hash) == hash_key:
@@ -374,6 +387,22 @@ class DestinyAPI:
                 items[str(data["hash"])] = data
         return items
 
+    async def search_definition(self, entity: str, entity_hash: str, d1: bool = False) -> dict:
+        """
+        This is a helper to search clean names for a given definition of data
+        """
+        try:
+            # the below is to prevent blocking reading the manifest
+            # and save on API calls
+            task = functools.partial(
+                self.search_stored_definitions, entity=entity, entity_hash=entity_hash, d1=d1
+            )
+            task = self.bot.loop.run_in_executor(None, task)
+            return await asyncio.wait_for(task, timeout=60)
+        except Exception:
+            err_msg = _("This command requires the Manifest to be downloaded to work.")
+            raise Destiny2MissingManifest(err_msg)
+
     async def get_vendor(self, user: discord.User, character: str, vendor: str) -> dict:
         """
         This gets the inventory of a specified Vendor
@@ -723,10 +752,12 @@ class DestinyAPI:
                     # response_data = await resp.text()
                     # data = json.loads(response_data)
                     data = await resp.json()
-                    for key, value in data.items():
-                        path = cog_data_path(self) / f"{key}.json"
-                        with path.open(encoding="utf-8", mode="w") as f:
-                            if self.bot.user.id in DEV_BOTS:
+                    task = functools.partial(self.manifest_store().build, tables=data.items())
+                    await self.bot.loop.run_in_executor(None, task)
+                    if self.bot.user.id in DEV_BOTS:
+                        for key, value in data.items():
+                            path = cog_data_path(self) / f"{key}.json"
+                            with path.open(encoding="utf-8", mode="w") as f:
                                 json.dump(
                                     value,
                                     f,
@@ -734,8 +765,12 @@ class DestinyAPI:
                                     sort_keys=False,
                                     separators=(",", " : "),
                                 )
-                            else:
-                                json.dump(value, f)
+                    else:
+                        # The json tables are only kept to make reading the manifest easier
+                        for key in data:
+                            path = cog_data_path(self) / f"{key}.json"
+                            if path.exists():
+                                path.unlink()
                     await self.config.manifest_version.set(manifest_data["version"])
         return manifest_data["version"]
 
@@ -768,6 +803,7 @@ class DestinyAPI:
         # conn.commit()
         # conn.close()
         # log.debug(rows)
+        tables = []
         for row in rows:
             json_data = {}
             name = dict(row)["name"]
@@ -786,9 +822,10 @@ class DestinyAPI:
                     hash_id = _id
                 json_data[str(hash_id)] = json.loads(datas)
             # log.debug(dict(row))
-            path = cog_data_path(self) / f"d1/{name}.json"
-            with path.open(encoding="utf-8", mode="w") as f:
-                if self.bot.user.id in DEV_BOTS:
+            tables.append((name, json_data))
+            if self.bot.user.id in DEV_BOTS:
+                path = cog_data_path(self) / f"d1/{name}.json"
+                with path.open(encoding="utf-8", mode="w") as f:
                     json.dump(
                         json_data,
                         f,
@@ -796,9 +833,9 @@ class DestinyAPI:
                         sort_keys=False,
                         separators=(",", " : "),
                     )
-                else:
-                    json.dump(value, f)
         conn.close()
+        task = functools.partial(self.manifest_store(d1=True).build, tables=tables)
+        await self.bot.loop.run_in_executor(None, task)
 
     async def get_char_colour(self, embed: discord.Embed, character):
         r = character["emblemColor"]["red"]
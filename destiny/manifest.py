@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+log = logging.getLogger("red.trusty-cogs.Destiny")
+
+# itemType of dummy items which are left out of name searches
+DUMMY_ITEM_TYPE = 20
+# sqlite limits how many parameters can be used in a single query
+MAX_QUERY_PARAMS = 900
+
+SCHEMA = """
+CREATE TABLE definitions (
+    entity TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    name TEXT,
+    item_type INTEGER,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX definition_hashes ON definitions (entity, hash);
+CREATE INDEX definition_names ON definitions (entity, name, item_type);
+"""
+
+DefinitionRow = Tuple[str, str, Optional[str], Optional[int], str]
+
+
+def definition_rows(entity: str, definitions: Dict[str, dict]) -> Iterator[DefinitionRow]:
+    for hash_key, data in definitions.items():
+        name = None
+        item_type = None
+        if isinstance(data, dict):
+            display_properties = data.get("displayProperties") or {}
+            if isinstance(display_properties.get("name"), str):
+                name = display_properties["name"].lower()
+            item_type = data.get("itemType")
+        yield entity, str(hash_key), name, item_type, json.dumps(data)
+
+
+class ManifestStore:
+    """
+    The manifest saved as a sqlite database keyed by table and hash
+
+    Looking up definitions only reads the requested rows instead
+    of loading an entire manifest table. The database is built
+    next to the old one and swapped in once it's complete so lookups
+    keep working while a new manifest is downloaded.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __repr__(self):
+        return "<ManifestStore path={}>".format(self.path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True)
+
+    def build(self, tables: Iterable[Tuple[str, Dict[str, dict]]]) -> None:
+        """
+        Replaces the store with the given `(entity, definitions)` tables
+        """
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        conn = sqlite3.connect(str(tmp_path))
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(SCHEMA)
+            for entity, definitions in tables:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO definitions VALUES (?, ?, ?, ?, ?)",
+                    definition_rows(entity, definitions),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, self.path)
+        log.debug("Built manifest store at %s", self.path)
+
+    def has_entity(self, entity: str) -> bool:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM definitions WHERE entity = ? LIMIT 1", (entity,)
+            ).fetchone()
+        return row is not None
+
+    def get(self, entity: str, entity_hash: Iterable) -> Dict[str, dict]:
+        """
+        Returns the definitions for each hash found in the `entity` table
+        """
+        hashes = list(dict.fromkeys(str(h) for h in entity_hash))
+        found = {}
+        with closing(self._connect()) as conn:
+            for i in range(0, len(hashes), MAX_QUERY_PARAMS):
+                chunk = hashes[i : i + MAX_QUERY_PARAMS]
+                rows = conn.execute(
+                    "SELECT hash, data FROM definitions WHERE entity = ? AND hash IN ({})".format(
+                        ", ".join("?" * len(chunk))
+                    ),
+                    (entity, *chunk),
+                )
+                for hash_key, data in rows:
+                    found[hash_key] = json.loads(data)
+        # keep the order the hashes were asked for
+        return {h: found[h] for h in hashes if h in found}
+
+    def search(self, entity: str, search: str) -> Dict[str, dict]:
+        """
+        Returns every definition in the `entity` table whose hash is `search`
+        or whose name contains `search`
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT hash, data FROM definitions WHERE entity = ? AND (hash = ? OR "
+                "(instr(name, ?) > 0 AND (item_type IS NULL OR item_type != ?))) "
+                "ORDER BY rowid",
+                (entity, str(search), str(search).lower(), DUMMY_ITEM_TYPE),
+            ).fetchall()
+        return {hash_key: json.loads(data) for hash_key, data in rows}
+
+    def table(self, entity: str) -> Dict[str, dict]:
+        """
+        Returns every definition in the `entity` table
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT hash, data FROM definitions WHERE entity = ? ORDER BY rowid", (entity,)
+            ).fetchall()
+        return {hash_key: json.loads(data) for hash_key, data in rows}
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger("red.trusty-cogs.ExtendedModLog")
+
+# Discord returns up to 100 audit log entries per request so fetching
+# fewer than this costs the same and lets more events share one fetch.
+AUDIT_LOG_FETCH_LIMIT = 100
+
+AuditLogKey = Tuple[int, discord.AuditLogAction]
+
+
+class AuditLogPage:
+    """
+    The most recent audit log entries for one action in a guild
+    indexed by target ID
+    """
+
+    __slots__ = ("fetched_at", "entries", "targets")
+
+    def __init__(self, entries: List[discord.AuditLogEntry]):
+        self.fetched_at = time.monotonic()
+        self.entries = entries
+        # target id -> position of the most recent entry for that target
+        self.targets: Dict[int, int] = {}
+        for position, entry in enumerate(entries):
+            target_id = getattr(entry.target, "id", None)
+            if target_id is not None and target_id not in self.targets:
+                self.targets[target_id] = position
+
+
+class AuditLogCache:
+    """
+    Shared cache of recent audit log entries per guild and action
+
+    Events which happen close together such as a channel purge or editing
+    many roles all look at the audit log for the same action. Instead of
+    every event making its own request, the first one fetches the latest
+    entries and every lookup within `ttl` seconds is served from that page.
+    Lookups made while a fetch is in progress wait for the same request.
+    """
+
+    def __init__(self, ttl: float = 3, max_size: int = 256):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._pages: "OrderedDict[AuditLogKey, AuditLogPage]" = OrderedDict()
+        self._pending: Dict[AuditLogKey, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __repr__(self):
+        return "<AuditLogCache pages={} hits={} misses={}>".format(
+            len(self._pages), self.hits, self.misses
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    async def _fetch(self, guild: discord.Guild, action: discord.AuditLogAction) -> AuditLogPage:
+        key = (guild.id, action)
+        try:
+            entries = [
+                entry
+                async for entry in guild.audit_logs(limit=AUDIT_LOG_FETCH_LIMIT, action=action)
+            ]
+        except discord.HTTPException:
+            logger.debug("Error fetching audit logs for %s", guild.id, exc_info=True)
+            entries = []
+        finally:
+            self._pending.pop(key, None)
+        page = AuditLogPage(entries)
+        self._pages[key] = page
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_size:
+            self._pages.popitem(last=False)
+        return page
+
+    async def get_page(self, guild: discord.Guild, action: discord.AuditLogAction) -> AuditLogPage:
+        key = (guild.id, action)
+        page = self._pages.get(key)
+        if page is not None and (time.monotonic() - page.fetched_at) <= self.ttl:
+            self.hits += 1
+            return page
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.get_running_loop().create_task(self._fetch(guild, action))
+            self._pending[key] = task
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+    async def entries(
+        self, guild: discord.Guild, action: discord.AuditLogAction, limit: int
+    ) -> List[discord.AuditLogEntry]:
+        """Returns up to `limit` of the most recent entries for `action`"""
+        page = await self.get_page(guild, action)
+        return page.entries[:limit]
+
+    async def find(
+        self,
+        guild: discord.Guild,
+        action: discord.AuditLogAction,
+        target_id: int,
+        limit: int = AUDIT_LOG_FETCH_LIMIT,
+    ) -> Optional[discord.AuditLogEntry]:
+        """
+        Returns the most recent entry for `action` targeting `target_id`
+        if it's within the latest `limit` entries
+        """
+        page = await self.get_page(guild, action)
+        position = page.targets.get(target_id)
+        if position is None or position >= limit:
+            return None
+        return page.entries[position]
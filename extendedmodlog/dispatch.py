@@ -0,0 +1,75 @@
+from typing import Dict, FrozenSet, Optional
+
+import discord
+
+DEFAULT_COLOURS: Dict[str, discord.Colour] = {
+    "message_edit": discord.Colour.orange(),
+    "message_delete": discord.Colour.dark_red(),
+    "user_change": discord.Colour.greyple(),
+    "role_change": discord.Colour.blue(),
+    "role_create": discord.Colour.blue(),
+    "role_delete": discord.Colour.dark_blue(),
+    "voice_change": discord.Colour.magenta(),
+    "user_join": discord.Colour.green(),
+    "user_left": discord.Colour.dark_green(),
+    "channel_change": discord.Colour.teal(),
+    "channel_create": discord.Colour.teal(),
+    "channel_delete": discord.Colour.dark_teal(),
+    "guild_change": discord.Colour.blurple(),
+    "emoji_change": discord.Colour.gold(),
+    "commands_used": discord.Colour.red(),
+    "invite_created": discord.Colour.blurple(),
+    "invite_deleted": discord.Colour.blurple(),
+}
+
+
+class EventSettings:
+    """
+    The resolved settings of a single enabled event in a guild
+    """
+
+    __slots__ = ("name", "embed", "emoji", "colour", "channel", "settings")
+
+    def __init__(self, name: str, settings: dict):
+        self.name = name
+        self.embed: bool = settings.get("embed", False)
+        self.emoji: str = settings.get("emoji", "")
+        colour = settings.get("colour")
+        self.colour: Optional[discord.Colour] = (
+            discord.Colour(colour) if colour is not None else None
+        )
+        self.channel: Optional[int] = settings.get("channel")
+        # The raw settings for event specific options like `bots` or `privs`
+        self.settings = settings
+
+    def __repr__(self):
+        return "<EventSettings name={} channel={}>".format(self.name, self.channel)
+
+
+class GuildDispatch:
+    """
+    A guilds modlog settings compiled for the event listeners
+
+    Only enabled events are kept so a disabled event is rejected
+    with a single lookup. This is rebuilt whenever the settings change.
+    """
+
+    __slots__ = ("events", "ignored_channels")
+
+    def __init__(self, settings: dict):
+        self.ignored_channels: FrozenSet[int] = frozenset(settings.get("ignored_channels", []))
+        self.events: Dict[str, EventSettings] = {}
+        for name, data in settings.items():
+            if not isinstance(data, dict) or not data.get("enabled", False):
+                continue
+            self.events[name] = EventSettings(name, data)
+
+    def __repr__(self):
+        return "<GuildDispatch events={} ignored={}>".format(
+            len(self.events), len(self.ignored_channels)
+        )
+
+    def is_ignored(self, channel: discord.abc.GuildChannel) -> bool:
+        if channel.id in self.ignored_channels:
+            return True
+        return getattr(channel, "category_id", None) in self.ignored_channels
@@ -17,9 +17,25 @@ from redbot.core.utils.chat_formatting import (
     pagify,
 )
 
+from .auditlog import AuditLogCache
+from .dispatch import DEFAULT_COLOURS, EventSettings, GuildDispatch
+from .invites import (
+    INVITE_SAVE_DELAY,
+    INVITE_WINDOW,
+    InviteUse,
+    JoinBatch,
+    attribute_joins,
+    invite_to_dict,
+)
+from .sendqueue import ModlogQueue
+
 _ = i18n.Translator("ExtendedModLog", __file__)
 logger = logging.getLogger("red.trusty-cogs.ExtendedModLog")
 
+# Features depending on the installed version of Red only need checking once
+CHECK_COG_DISABLED = version_info >= VersionInfo.from_str("3.4.0")
+SET_GUILD_LOCALE = version_info >= VersionInfo.from_str("3.4.1")
+
 
 class CommandPrivs(Converter):
     """
@@ -84,48 +100,46 @@ class EventMixin:
     config: Config
     bot: Red
     settings: Dict[int, Any]
+    dispatch: Dict[int, GuildDispatch]
     _ban_cache: Dict[int, List[int]]
+    _join_batches: Dict[int, JoinBatch]
+    audit_log_cache: AuditLogCache
+    modlog_queues: Dict[int, ModlogQueue]
+    _invite_save_tasks: Dict[int, asyncio.Task]
+
+    def rebuild_dispatch(self, guild_id: int) -> None:
+        """Compile a guilds settings after they have changed"""
+        if guild_id in self.settings:
+            self.dispatch[guild_id] = GuildDispatch(self.settings[guild_id])
+        else:
+            self.dispatch.pop(guild_id, None)
+
+    def get_event_settings(self, guild_id: int, event: str) -> Optional[EventSettings]:
+        """Returns the settings for `event` if it's enabled in the guild"""
+        dispatch = self.dispatch.get(guild_id)
+        if dispatch is None:
+            return None
+        return dispatch.events.get(event)
 
     async def get_event_colour(
         self, guild: discord.Guild, event_type: str, changed_object: Optional[discord.Role] = None
     ) -> discord.Colour:
-        if guild.text_channels:
-            cmd_colour = await self.bot.get_embed_colour(guild.text_channels[0])
-        else:
-            cmd_colour = discord.Colour.red()
-        defaults = {
-            "message_edit": discord.Colour.orange(),
-            "message_delete": discord.Colour.dark_red(),
-            "user_change": discord.Colour.greyple(),
-            "role_change": changed_object.colour if changed_object else discord.Colour.blue(),
-            "role_create": discord.Colour.blue(),
-            "role_delete": discord.Colour.dark_blue(),
-            "voice_change": discord.Colour.magenta(),
-            "user_join": discord.Colour.green(),
-            "user_left": discord.Colour.dark_green(),
-            "channel_change": discord.Colour.teal(),
-            "channel_create": discord.Colour.teal(),
-            "channel_delete": discord.Colour.dark_teal(),
-            "guild_change": discord.Colour.blurple(),
-            "emoji_change": discord.Colour.gold(),
-            "commands_used": cmd_colour,
-            "invite_created": discord.Colour.blurple(),
-            "invite_deleted": discord.Colour.blurple(),
-        }
-        colour = defaults[event_type]
-        if self.settings[guild.id][event_type]["colour"] is not None:
-            colour = discord.Colour(self.settings[guild.id][event_type]["colour"])
-        return colour
+        event = self.get_event_settings(guild.id, event_type)
+        if event is not None and event.colour is not None:
+            return event.colour
+        if event_type == "role_change" and changed_object:
+            return changed_object.colour
+        if event_type == "commands_used" and guild.text_channels:
+            return await self.bot.get_embed_colour(guild.text_channels[0])
+        return DEFAULT_COLOURS[event_type]
 
     async def is_ignored_channel(
         self, guild: discord.Guild, channel: discord.abc.GuildChannel
     ) -> bool:
-        ignored_channels = self.settings[guild.id]["ignored_channels"]
-        if channel.id in ignored_channels:
-            return True
-        if channel.category and channel.category.id in ignored_channels:
-            return True
-        return False
+        dispatch = self.dispatch.get(guild.id)
+        if dispatch is None:
+            return False
+        return dispatch.is_ignored(channel)
 
     async def member_can_run(self, ctx: commands.Context) -> bool:
         """Check if a user can run a command.
@@ -150,11 +164,32 @@ class EventMixin:
                 can = False
         return can
 
+    def queue_modlog(
+        self,
+        channel: discord.TextChannel,
+        content: Optional[str] = None,
+        *,
+        embed: Optional[discord.Embed] = None,
+    ) -> None:
+        """
+        Queues a modlog message to be sent to `channel`
+
+        Each channel has its own queue so a burst of events in one guild
+        is merged into fewer messages and paced to the channels rate limit
+        without holding up the event handlers.
+        """
+        queue = self.modlog_queues.get(channel.id)
+        if queue is None:
+            queue = ModlogQueue(channel)
+            self.modlog_queues[channel.id] = queue
+        queue.channel = channel
+        queue.put(content, embed=embed)
+
     async def modlog_channel(self, guild: discord.Guild, event: str) -> discord.TextChannel:
         channel = None
-        settings = self.settings[guild.id].get(event)
-        if "channel" in settings and settings["channel"]:
-            channel = guild.get_channel(settings["channel"])
+        event_settings = self.get_event_settings(guild.id, event)
+        if event_settings is not None and event_settings.channel:
+            channel = guild.get_channel(event_settings.channel)
         if channel is None:
             try:
                 channel = await modlog.get_modlog_channel(guild)
@@ -169,24 +204,20 @@ class EventMixin:
         guild = ctx.guild
         if guild is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        event = self.get_event_settings(guild.id, "commands_used")
+        if event is None:
+            return
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, ctx.guild):
                 return
-        if guild.id not in self.settings:
-            return
-        if not self.settings[guild.id]["commands_used"]["enabled"]:
-            return
         if await self.is_ignored_channel(ctx.guild, ctx.channel):
             return
         try:
             channel = await self.modlog_channel(guild, "commands_used")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["commands_used"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
 
@@ -233,7 +264,7 @@ class EventMixin:
         infomessage = _(
             "{emoji} `{time}` {author}(`{a_id}`) used the following command in {channel}\n> {com}"
         ).format(
-            emoji=self.settings[guild.id]["commands_used"]["emoji"],
+            emoji=event.emoji,
             time=message.created_at.strftime("%H:%M:%S"),
             author=message.author,
             a_id=message.author.id,
@@ -255,9 +286,9 @@ class EventMixin:
                 member=message.author, m_id=message.author.id
             )
             embed.set_author(name=author_title, icon_url=message.author.avatar_url)
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(infomessage[:2000])
+            self.queue_modlog(channel, infomessage[:2000])
 
     @commands.Cog.listener(name="on_raw_message_delete")
     async def on_raw_message_delete_listener(
@@ -268,15 +299,13 @@ class EventMixin:
         if guild_id is None:
             return
         guild = self.bot.get_guild(guild_id)
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "message_delete")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        # settings = await self.config.guild(guild).message_delete()
-        settings = self.settings[guild.id]["message_delete"]
-        if not settings["enabled"]:
-            return
+        settings = event.settings
         channel_id = payload.channel_id
         try:
             channel = await self.modlog_channel(guild, "message_delete")
@@ -284,11 +313,8 @@ class EventMixin:
             return
         if await self.is_ignored_channel(guild, guild.get_channel(channel_id)):
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["message_delete"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         message = payload.cached_message
@@ -303,14 +329,14 @@ class EventMixin:
                 )
                 embed.add_field(name=_("Channel"), value=message_channel.mention)
                 embed.set_author(name=_("Deleted Message"))
-                await channel.send(embed=embed)
+                self.queue_modlog(channel, embed=embed)
             else:
                 infomessage = _("{emoji} `{time}` A message was deleted in {channel}").format(
                     emoji=settings["emoji"],
                     time=datetime.datetime.utcnow().strftime("%H:%M:%S"),
                     channel=message_channel.mention,
                 )
-                await channel.send(f"{infomessage}\n> *Message's content unknown.*")
+                self.queue_modlog(channel, f"{infomessage}\n> *Message's content unknown.*")
             return
         await self._cached_message_delete(
             message, guild, settings, channel, check_audit_log=check_audit_log
@@ -330,15 +356,12 @@ class EventMixin:
             return
         if message.content == "" and message.attachments == []:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["message_delete"]["embed"]
-        )
+        embed_links = channel.permissions_for(guild.me).embed_links and settings["embed"]
         time = message.created_at
         perp = None
         if channel.permissions_for(guild.me).view_audit_log and check_audit_log:
             action = discord.AuditLogAction.message_delete
-            async for log in guild.audit_logs(limit=2, action=action):
+            for log in await self.audit_log_cache.entries(guild, action, limit=2):
                 same_chan = log.extra.channel.id == message.channel.id
                 if log.target.id == message.author.id and same_chan:
                     perp = f"{log.user}({log.user.id})"
@@ -368,7 +391,9 @@ class EventMixin:
                 channel=message_channel.mention,
             )
         if embed_links:
-            content = list(pagify(f"{message.author.mention}: {message.content}", page_length=1000))
+            content = list(
+                pagify(f"{message.author.mention}: {message.content}", page_length=1000)
+            )
             embed = discord.Embed(
                 description=content.pop(0),
                 colour=await self.get_event_colour(guild, "message_delete"),
@@ -388,12 +413,12 @@ class EventMixin:
                 name=_("{member} ({m_id})- Deleted Message").format(member=author, m_id=author.id),
                 icon_url=str(message.author.avatar_url),
             )
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
             clean_msg = escape(message.clean_content, mass_mentions=True)[
                 : (1990 - len(infomessage))
             ]
-            await channel.send(f"{infomessage}\n>>> {clean_msg}")
+            self.queue_modlog(channel, f"{infomessage}\n>>> {clean_msg}")
 
     @commands.Cog.listener()
     async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
@@ -401,14 +426,13 @@ class EventMixin:
         if guild_id is None:
             return
         guild = self.bot.get_guild(guild_id)
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "message_delete")
+        if event is None or not event.settings["bulk_enabled"]:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        settings = self.settings[guild.id]["message_delete"]
-        if not settings["enabled"] or not settings["bulk_enabled"]:
-            return
+        settings = event.settings
         channel_id = payload.channel_id
         message_channel = guild.get_channel(channel_id)
         try:
@@ -417,11 +441,8 @@ class EventMixin:
             return
         if await self.is_ignored_channel(guild, message_channel):
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["message_delete"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         message_amount = len(payload.message_ids)
@@ -433,7 +454,7 @@ class EventMixin:
             embed.set_author(name=_("Bulk message delete"), icon_url=guild.icon_url)
             embed.add_field(name=_("Channel"), value=message_channel.mention)
             embed.add_field(name=_("Messages deleted"), value=str(message_amount))
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
             infomessage = _(
                 "{emoji} `{time}` Bulk message delete in {channel}, {amount} messages deleted."
@@ -443,7 +464,7 @@ class EventMixin:
                 amount=message_amount,
                 channel=message_channel.mention,
             )
-            await channel.send(infomessage)
+            self.queue_modlog(channel, infomessage)
         if settings["bulk_individual"]:
             for message in payload.cached_messages:
                 new_payload = discord.RawMessageDeleteEvent(
@@ -468,31 +489,75 @@ class EventMixin:
             await asyncio.sleep(300)
 
     async def save_invite_links(self, guild: discord.Guild) -> bool:
-        invites = {}
+        """
+        Refreshes the cached invites for the guild saving them
+        only if they've changed since they were last seen
+        """
         if not guild.me.guild_permissions.manage_guild:
             return False
+        invites = {}
         for invite in await guild.invites():
             try:
-
-                created_at = getattr(invite, "created_at", datetime.datetime.utcnow())
-                channel = getattr(invite, "channel", discord.Object(id=0))
-                inviter = getattr(invite, "inviter", discord.Object(id=0))
-                invites[invite.code] = {
-                    "uses": getattr(invite, "uses", 0),
-                    "max_age": getattr(invite, "max_age", None),
-                    "created_at": created_at.timestamp(),
-                    "max_uses": getattr(invite, "max_uses", None),
-                    "temporary": getattr(invite, "temporary", False),
-                    "inviter": getattr(inviter, "id", "Unknown"),
-                    "channel": getattr(channel, "id", "Unknown"),
-                }
+                invites[invite.code] = invite_to_dict(invite)
             except Exception:
                 logger.exception("Error saving invites.")
                 pass
-        await self.config.guild(guild).invite_links.set(invites)
-        self.settings[guild.id]["invite_links"] = invites
+        if invites != self.settings[guild.id]["invite_links"]:
+            self.settings[guild.id]["invite_links"] = invites
+            self.schedule_invite_save(guild)
         return True
 
+    def schedule_invite_save(self, guild: discord.Guild) -> None:
+        """
+        Saves the cached invites after `INVITE_SAVE_DELAY` seconds
+        so that many changes in a short time only write to config once
+        """
+        task = self._invite_save_tasks.get(guild.id)
+        if task is not None and not task.done():
+            return
+        self._invite_save_tasks[guild.id] = self.bot.loop.create_task(
+            self._save_invites_later(guild)
+        )
+
+    async def _save_invites_later(self, guild: discord.Guild) -> None:
+        await asyncio.sleep(INVITE_SAVE_DELAY)
+        await self.config.guild(guild).invite_links.set(self.settings[guild.id]["invite_links"])
+
+    async def _resolve_joins(self, guild: discord.Guild, batch: JoinBatch) -> Dict[int, InviteUse]:
+        await asyncio.sleep(INVITE_WINDOW)
+        # joins after this point start a new batch and wait for their own fetch
+        if self._join_batches.get(guild.id) is batch:
+            del self._join_batches[guild.id]
+        try:
+            guild_invites = await guild.invites()
+        except discord.HTTPException:
+            logger.debug("Error fetching invites for %s", guild.id, exc_info=True)
+            return {}
+        cached = self.settings[guild.id]["invite_links"]
+        uses = attribute_joins(cached, guild_invites, batch.members)
+        self.settings[guild.id]["invite_links"] = {
+            i.code: invite_to_dict(i) for i in guild_invites
+        }
+        self.schedule_invite_save(guild)
+        return uses
+
+    async def get_invite_use(self, member: discord.Member) -> Optional[InviteUse]:
+        """
+        Finds which invite the member most likely used to join
+
+        Joins within `INVITE_WINDOW` seconds are grouped so a raid
+        only needs one request for the guilds invites.
+        """
+        guild = member.guild
+        batch = self._join_batches.get(guild.id)
+        if batch is None:
+            batch = JoinBatch()
+            batch.task = self.bot.loop.create_task(self._resolve_joins(guild, batch))
+            self._join_batches[guild.id] = batch
+        batch.members.append(member.id)
+        uses = await asyncio.shield(batch.task)
+        return uses.get(member.id)
+
     async def get_invite_link(self, member: discord.Member) -> str:
         guild = member.guild
         manage_guild = guild.me.guild_permissions.manage_guild
@@ -503,10 +568,9 @@ class EventMixin:
         if member.bot:
             if check_logs:
                 action = discord.AuditLogAction.bot_add
-                async for log in guild.audit_logs(action=action):
-                    if log.target.id == member.id:
-                        possible_link = _("Added by: {inviter}").format(inviter=str(log.user))
-                        break
+                log = await self.audit_log_cache.find(guild, action, member.id)
+                if log is not None:
+                    possible_link = _("Added by: {inviter}").format(inviter=str(log.user))
             return possible_link
         if manage_guild and "VANITY_URL" in guild.features:
             try:
@@ -515,45 +579,27 @@ class EventMixin:
                 pass
 
         if invites and manage_guild:
-            guild_invites = await guild.invites()
-            for invite in guild_invites:
-                if invite.code in invites:
-                    uses = invites[invite.code]["uses"]
-                    # logger.info(f"{invite.code}: {invite.uses} - {uses}")
-                    if invite.uses > uses:
-                        possible_link = _(
-                            "https://discord.gg/{code}\nInvited by: {inviter}"
-                        ).format(
-                            code=invite.code,
-                            inviter=str(getattr(invite, "inviter", _("Widget Integration"))),
-                        )
-
-            if not possible_link:
-                for code, data in invites.items():
+            invite_use = await self.get_invite_use(member)
+            if invite_use is not None:
+                code, inviter = invite_use
+                if inviter is None:
+                    inviter = _("Widget Integration")
+                elif isinstance(inviter, int):
+                    # The invite link was on its last uses and subsequently
+                    # deleted so we're fairly sure this was the one used
                     try:
-                        invite = await self.bot.fetch_invite(code)
-                    except Exception:
-                        logger.error("Error getting invite {code}".format(code=code))
-                        invite = None
-                        pass
-                    if invite is None:
-                        if (data["max_uses"] - data["uses"]) == 1:
-                            # The invite link was on its last uses and subsequently
-                            # deleted so we're fairly sure this was the one used
-                            try:
-                                if (inviter := guild.get_member(data["inviter"])) is None:
-                                    inviter = await self.bot.fetch_user(data["inviter"])
-                            except (discord.errors.NotFound, discord.errors.Forbidden):
-                                inviter = _("Unknown or deleted user ({inviter})").format(
-                                    inviter=data["inviter"]
-                                )
-                            possible_link = _(
-                                "https://discord.gg/{code}\nInvited by: {inviter}"
-                            ).format(code=code, inviter=str(inviter))
-            await self.save_invite_links(guild)  # Save all the invites again since they've changed
+                        if (user := guild.get_member(inviter)) is None:
+                            user = await self.bot.fetch_user(inviter)
+                        inviter = user
+                    except (discord.errors.NotFound, discord.errors.Forbidden):
+                        inviter = _("Unknown or deleted user ({inviter})").format(inviter=inviter)
+                possible_link = _("https://discord.gg/{code}\nInvited by: {inviter}").format(
+                    code=code, inviter=str(inviter)
+                )
+            invites = self.settings[guild.id]["invite_links"]
         if check_logs and not possible_link:
             action = discord.AuditLogAction.invite_create
-            async for log in guild.audit_logs(action=action):
+            for log in await self.audit_log_cache.entries(guild, action, limit=100):
                 if log.target.code not in invites:
                     possible_link = _("https://discord.gg/{code}\nInvited by: {inviter}").format(
                         code=log.target.code, inviter=str(log.target.inviter)
@@ -564,24 +610,20 @@ class EventMixin:
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         guild = member.guild
-        if guild.id not in self.settings:
-            return
-        if not self.settings[guild.id]["user_join"]["enabled"]:
+        event = self.get_event_settings(guild.id, "user_join")
+        if event is None:
             return
         # if not await self.config.guild(guild).user_join.enabled():
         # return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
         try:
             channel = await self.modlog_channel(guild, "user_join")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["user_join"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -611,20 +653,20 @@ class EventMixin:
             if possible_link:
                 embed.add_field(name=_("Invite Link"), value=possible_link)
             embed.set_thumbnail(url=member.avatar_url)
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
             time = datetime.datetime.utcnow()
             msg = _(
                 "{emoji} `{time}` **{member}**(`{m_id}`) "
                 "joined the guild. Total members: {users}"
             ).format(
-                emoji=self.settings[guild.id]["user_join"]["emoji"],
+                emoji=event.emoji,
                 time=time.strftime("%H:%M:%S"),
                 member=member,
                 m_id=member.id,
                 users=users,
             )
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild: discord.Guild, member: discord.Member):
@@ -643,22 +685,18 @@ class EventMixin:
         if guild.id in self._ban_cache and member.id in self._ban_cache[guild.id]:
             # was a ban so we can leave early
             return
-        if guild.id not in self.settings:
-            return
-        if not self.settings[guild.id]["user_left"]["enabled"]:
+        event = self.get_event_settings(guild.id, "user_left")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
         try:
             channel = await self.modlog_channel(guild, "user_left")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["user_left"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -682,13 +720,13 @@ class EventMixin:
                 icon_url=member.avatar_url,
             )
             embed.set_thumbnail(url=member.avatar_url)
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
             time = datetime.datetime.utcnow()
             msg = _(
                 "{emoji} `{time}` **{member}**(`{m_id}`) left the guild. Total members: {users}"
             ).format(
-                emoji=self.settings[guild.id]["user_left"]["emoji"],
+                emoji=event.emoji,
                 time=time.strftime("%H:%M:%S"),
                 member=member,
                 m_id=member.id,
@@ -699,14 +737,14 @@ class EventMixin:
                     "{emoji} `{time}` **{member}**(`{m_id}`) "
                     "was kicked by {perp}. Total members: {users}"
                 ).format(
-                    emoji=self.settings[guild.id]["user_left"]["emoji"],
+                    emoji=event.emoji,
                     time=time.strftime("%H:%M:%S"),
                     member=member,
                     m_id=member.id,
                     perp=perp,
                     users=len(guild.members),
                 )
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     async def get_permission_change(
         self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel, embed_links: bool
@@ -782,11 +820,10 @@ class EventMixin:
     @commands.Cog.listener()
     async def on_guild_channel_create(self, new_channel: discord.abc.GuildChannel) -> None:
         guild = new_channel.guild
-        if guild.id not in self.settings:
-            return
-        if not self.settings[guild.id]["channel_create"]["enabled"]:
+        event = self.get_event_settings(guild.id, "channel_create")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
         if await self.is_ignored_channel(guild, new_channel):
@@ -795,11 +832,8 @@ class EventMixin:
             channel = await self.modlog_channel(guild, "channel_create")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["channel_create"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -828,25 +862,24 @@ class EventMixin:
             perp_msg += _(" Reason: {reason}").format(reason=reason)
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         msg = _("{emoji} `{time}` {chan_type} channel created {perp_msg} {channel}").format(
-            emoji=self.settings[guild.id]["channel_create"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             chan_type=channel_type,
             perp_msg=perp_msg,
             channel=new_channel.mention,
         )
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, old_channel: discord.abc.GuildChannel):
         guild = old_channel.guild
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "channel_delete")
+        if event is None:
             return
-        if not self.settings[guild.id]["channel_delete"]["enabled"]:
-            return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
         if await self.is_ignored_channel(guild, old_channel):
@@ -855,11 +888,8 @@ class EventMixin:
             channel = await self.modlog_channel(guild, "channel_delete")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["channel_delete"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         channel_type = str(old_channel.type).title()
@@ -887,16 +917,16 @@ class EventMixin:
             perp_msg += _(" Reason: {reason}").format(reason=reason)
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         msg = _("{emoji} `{time}` {chan_type} channel deleted {perp_msg} {channel}").format(
-            emoji=self.settings[guild.id]["channel_delete"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             chan_type=channel_type,
             perp_msg=perp_msg,
             channel=f"#{old_channel.name} ({old_channel.id})",
         )
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     async def get_audit_log_reason(
         self,
@@ -907,12 +937,11 @@ class EventMixin:
         perp = None
         reason = None
         if guild.me.guild_permissions.view_audit_log:
-            async for log in guild.audit_logs(limit=5, action=action):
-                if log.target.id == target.id:
-                    perp = log.user
-                    if log.reason:
-                        reason = log.reason
-                    break
+            log = await self.audit_log_cache.find(guild, action, target.id, limit=5)
+            if log is not None:
+                perp = log.user
+                if log.reason:
+                    reason = log.reason
         return perp, reason
 
     @commands.Cog.listener()
@@ -920,24 +949,20 @@ class EventMixin:
         self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
     ) -> None:
         guild = before.guild
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "channel_change")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["channel_change"]["enabled"]:
-            return
         if await self.is_ignored_channel(guild, before):
             return
         try:
             channel = await self.modlog_channel(guild, "channel_change")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["channel_change"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         channel_type = str(after.type).title()
@@ -953,7 +978,7 @@ class EventMixin:
             )
         )
         msg = _("{emoji} `{time}` Updated channel {channel}\n").format(
-            emoji=self.settings[guild.id]["channel_change"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             channel=before.name,
         )
@@ -1033,9 +1058,9 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(escape(msg, mass_mentions=True))
+            self.queue_modlog(channel, escape(msg, mass_mentions=True))
 
     async def get_role_permission_change(self, before: discord.Role, after: discord.Role) -> str:
 
@@ -1049,13 +1074,12 @@ class EventMixin:
     @commands.Cog.listener()
     async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
         guild = before.guild
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "role_change")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["role_change"]["enabled"]:
-            return
         try:
             channel = await self.modlog_channel(guild, "role_change")
         except RuntimeError:
@@ -1063,17 +1087,14 @@ class EventMixin:
         perp, reason = await self.get_audit_log_reason(
             guild, before, discord.AuditLogAction.role_update
         )
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["role_change"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
         embed = discord.Embed(description=after.mention, colour=after.colour, timestamp=time)
         msg = _("{emoji} `{time}` Updated role **{role}**\n").format(
-            emoji=self.settings[guild.id]["role_change"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             role=before.name,
         )
@@ -1117,20 +1138,19 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_role_create(self, role: discord.Role) -> None:
         guild = role.guild
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "role_create")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["role_create"]["enabled"]:
-            return
         try:
             channel = await self.modlog_channel(guild, "role_create")
         except RuntimeError:
@@ -1138,11 +1158,8 @@ class EventMixin:
         perp, reason = await self.get_audit_log_reason(
             guild, role, discord.AuditLogAction.role_create
         )
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["role_create"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -1155,7 +1172,7 @@ class EventMixin:
             name=_("Role created {role} ({r_id})").format(role=role.name, r_id=role.id)
         )
         msg = _("{emoji} `{time}` Role created {role}\n").format(
-            emoji=self.settings[guild.id]["role_create"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             role=role.name,
         )
@@ -1166,20 +1183,19 @@ class EventMixin:
             msg += _("Reason ") + reason + "\n"
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(escape(msg, mass_mentions=True))
+            self.queue_modlog(channel, escape(msg, mass_mentions=True))
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role: discord.Role) -> None:
         guild = role.guild
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "role_delete")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["role_delete"]["enabled"]:
-            return
         try:
             channel = await self.modlog_channel(guild, "role_delete")
         except RuntimeError:
@@ -1187,11 +1203,8 @@ class EventMixin:
         perp, reason = await self.get_audit_log_reason(
             guild, role, discord.AuditLogAction.role_delete
         )
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["role_delete"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -1204,7 +1217,7 @@ class EventMixin:
             name=_("Role deleted {role} ({r_id})").format(role=role.name, r_id=role.id)
         )
         msg = _("{emoji} `{time}` Role deleted **{role}**\n").format(
-            emoji=self.settings[guild.id]["role_delete"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             role=role.name,
         )
@@ -1215,23 +1228,22 @@ class EventMixin:
             msg += _("Reason ") + reason + "\n"
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(escape(msg, mass_mentions=True))
+            self.queue_modlog(channel, escape(msg, mass_mentions=True))
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message) -> None:
         guild = before.guild
         if guild is None:
             return
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "message_edit")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        settings = self.settings[guild.id]["message_edit"]
-        if not settings["enabled"]:
-            return
+        settings = event.settings
         if before.author.bot and not settings["bots"]:
             return
         if before.content == after.content:
@@ -1242,11 +1254,8 @@ class EventMixin:
             return
         if await self.is_ignored_channel(guild, after.channel):
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["message_edit"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -1266,13 +1275,13 @@ class EventMixin:
                 ),
                 icon_url=str(before.author.avatar_url),
             )
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
             msg = _(
                 "{emoji} `{time}` **{author}** (`{a_id}`) edited a message "
                 "in {channel}.\nBefore:\n> {before}\nAfter:\n> {after}"
             ).format(
-                emoji=self.settings[guild.id]["message_edit"]["emoji"],
+                emoji=event.emoji,
                 time=time.strftime(fmt),
                 author=before.author,
                 a_id=before.author.id,
@@ -1280,27 +1289,23 @@ class EventMixin:
                 before=escape(before.content, mass_mentions=True),
                 after=escape(after.content, mass_mentions=True),
             )
-            await channel.send(msg[:2000])
+            self.queue_modlog(channel, msg[:2000])
 
     @commands.Cog.listener()
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
         guild = after
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "guild_change")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["guild_change"]["enabled"]:
-            return
         try:
             channel = await self.modlog_channel(guild, "guild_change")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["guild_change"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -1310,7 +1315,7 @@ class EventMixin:
         embed.set_author(name=_("Updated Guild"), icon_url=str(guild.icon_url))
         embed.set_thumbnail(url=str(guild.icon_url))
         msg = _("{emoji} `{time}` Guild updated\n").format(
-            emoji=self.settings[guild.id]["guild_change"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
         )
         guild_updates = {
@@ -1344,7 +1349,8 @@ class EventMixin:
         reasons = []
         if channel.permissions_for(guild.me).view_audit_log:
             action = discord.AuditLogAction.guild_update
-            async for log in guild.audit_logs(limit=int(len(embed.fields) / 2), action=action):
+            limit = int(len(embed.fields) / 2)
+            for log in await self.audit_log_cache.entries(guild, action, limit=limit):
                 perps.append(log.user)
                 if log.reason:
                     reasons.append(log.reason)
@@ -1358,30 +1364,26 @@ class EventMixin:
             msg += _("Reasons ") + f"{reasons}\n"
             embed.add_field(name=_("Reasons "), value=s_reasons, inline=False)
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     @commands.Cog.listener()
     async def on_guild_emojis_update(
         self, guild: discord.Guild, before: Sequence[discord.Emoji], after: Sequence[discord.Emoji]
     ) -> None:
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "emoji_change")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["emoji_change"]["enabled"]:
-            return
         try:
             channel = await self.modlog_channel(guild, "emoji_change")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["emoji_change"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         perp = None
@@ -1394,7 +1396,7 @@ class EventMixin:
         )
         embed.set_author(name=_("Updated Server Emojis"))
         msg = _("{emoji} `{time}` Updated Server Emojis").format(
-            emoji=self.settings[guild.id]["emoji_change"]["emoji"], time=time.strftime("%H:%M:%S")
+            emoji=event.emoji, time=time.strftime("%H:%M:%S")
         )
         worth_updating = False
         b = set(before)
@@ -1492,7 +1494,7 @@ class EventMixin:
             return
         if channel.permissions_for(guild.me).view_audit_log:
             if action:
-                async for log in guild.audit_logs(limit=1, action=action):
+                for log in await self.audit_log_cache.entries(guild, action, limit=1):
                     perp = log.user
                     if log.reason:
                         reason = log.reason
@@ -1504,22 +1506,21 @@ class EventMixin:
             msg += _("Reason ") + reason + "\n"
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     @commands.Cog.listener()
     async def on_voice_state_update(
         self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState
     ) -> None:
         guild = member.guild
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "voice_change")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["voice_change"]["enabled"]:
-            return
         if member.bot and not self.settings[guild.id]["voice_change"]["bots"]:
             return
         try:
@@ -1532,11 +1533,8 @@ class EventMixin:
         if before.channel is not None:
             if await self.is_ignored_channel(guild, before.channel):
                 return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["voice_change"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -1545,7 +1543,7 @@ class EventMixin:
             colour=await self.get_event_colour(guild, "voice_change"),
         )
         msg = _("{emoji} `{time}` Updated Voice State for **{member}** (`{m_id}`)").format(
-            emoji=self.settings[guild.id]["voice_change"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             member=member,
             m_id=member.id,
@@ -1599,9 +1597,7 @@ class EventMixin:
                 msg += chan_msg + "\n"
                 embed.description = chan_msg
             else:
-                after_chan = (
-                    f"`{after.channel.name}` ({after.channel.id}) {after.channel.mention}"
-                )
+                after_chan = f"`{after.channel.name}` ({after.channel.id}) {after.channel.mention}"
                 before_chan = (
                     f"`{before.channel.name}` ({before.channel.id}) {before.channel.mention}"
                 )
@@ -1618,7 +1614,7 @@ class EventMixin:
         reason = None
         if channel.permissions_for(guild.me).view_audit_log and change_type:
             action = discord.AuditLogAction.member_update
-            async for log in guild.audit_logs(limit=5, action=action):
+            for log in await self.audit_log_cache.entries(guild, action, limit=5):
                 is_change = getattr(log.after, change_type, None)
                 if log.target.id == member.id and is_change:
                     perp = log.user
@@ -1631,31 +1627,27 @@ class EventMixin:
             msg += _("Reason ") + reason + "\n"
             embed.add_field(name=_("Reason "), value=reason, inline=False)
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(escape(msg, mass_mentions=True))
+            self.queue_modlog(channel, escape(msg, mass_mentions=True))
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
         guild = before.guild
-        if guild.id not in self.settings:
+        event = self.get_event_settings(guild.id, "user_change")
+        if event is None:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["user_change"]["enabled"]:
-            return
         if not self.settings[guild.id]["user_change"]["bots"] and after.bot:
             return
         try:
             channel = await self.modlog_channel(guild, "user_change")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["user_change"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         time = datetime.datetime.utcnow()
@@ -1663,7 +1655,7 @@ class EventMixin:
             timestamp=time, colour=await self.get_event_colour(guild, "user_change")
         )
         msg = _("{emoji} `{time}` Member updated **{member}** (`{m_id}`)\n").format(
-            emoji=self.settings[guild.id]["user_change"]["emoji"],
+            emoji=event.emoji,
             time=time.strftime("%H:%M:%S"),
             member=before,
             m_id=before.id,
@@ -1729,9 +1721,9 @@ class EventMixin:
             msg += _("Reason: ") + f"{reason}\n"
             embed.add_field(name=_("Reason"), value=reason, inline=False)
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(msg)
+            self.queue_modlog(channel, msg)
 
     @commands.Cog.listener()
     async def on_invite_create(self, invite: discord.Invite) -> None:
@@ -1741,36 +1733,23 @@ class EventMixin:
         guild = invite.guild
         if guild.id not in self.settings:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
-            if await self.bot.cog_disabled_in_guild(self, guild):
-                return
+        # Keep the invite cache up to date even when invite logging is off
+        # so joins can still be attributed to this invite
         if invite.code not in self.settings[guild.id]["invite_links"]:
-            created_at = getattr(invite, "created_at", datetime.datetime.utcnow())
-            inviter = getattr(invite, "inviter", discord.Object(id=0))
-            channel = getattr(invite, "channel", discord.Object(id=0))
-            self.settings[guild.id]["invite_links"][invite.code] = {
-                "uses": getattr(invite, "uses", 0),
-                "max_age": getattr(invite, "max_age", None),
-                "created_at": created_at.timestamp(),
-                "max_uses": getattr(invite, "max_uses", None),
-                "temporary": getattr(invite, "temporary", False),
-                "inviter": getattr(inviter, "id", "Unknown"),
-                "channel": channel.id,
-            }
-            await self.config.guild(guild).invite_links.set(
-                self.settings[guild.id]["invite_links"]
-            )
-        if not self.settings[guild.id]["invite_created"]["enabled"]:
+            self.settings[guild.id]["invite_links"][invite.code] = invite_to_dict(invite)
+            self.schedule_invite_save(guild)
+        event = self.get_event_settings(guild.id, "invite_created")
+        if event is None:
             return
+        if CHECK_COG_DISABLED:
+            if await self.bot.cog_disabled_in_guild(self, guild):
+                return
         try:
             channel = await self.modlog_channel(guild, "invite_created")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["invite_created"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         invite_attrs = {
@@ -1786,7 +1765,7 @@ class EventMixin:
         except AttributeError:
             invite_time = datetime.datetime.utcnow().strftime("%H:%M:%S")
         msg = _("{emoji} `{time}` Invite created ").format(
-            emoji=self.settings[guild.id]["invite_created"]["emoji"],
+            emoji=event.emoji,
             time=invite_time,
         )
         embed = discord.Embed(
@@ -1808,9 +1787,9 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(escape(msg, mass_mentions=True))
+            self.queue_modlog(channel, escape(msg, mass_mentions=True))
 
     @commands.Cog.listener()
     async def on_invite_delete(self, invite: discord.Invite) -> None:
@@ -1820,20 +1799,27 @@ class EventMixin:
         guild = invite.guild
         if guild.id not in self.settings:
             return
-        if version_info >= VersionInfo.from_str("3.4.0"):
+        # Invites on their last use are kept so the join that used them
+        # up can still be attributed, anything else was revoked
+        invite_links = self.settings[guild.id]["invite_links"]
+        cached = invite_links.get(invite.code)
+        if cached is not None:
+            max_uses = cached.get("max_uses")
+            if not max_uses or (max_uses - cached.get("uses", 0)) != 1:
+                del invite_links[invite.code]
+                self.schedule_invite_save(guild)
+        event = self.get_event_settings(guild.id, "invite_deleted")
+        if event is None:
+            return
+        if CHECK_COG_DISABLED:
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not self.settings[guild.id]["invite_deleted"]["enabled"]:
-            return
         try:
             channel = await self.modlog_channel(guild, "invite_deleted")
         except RuntimeError:
             return
-        embed_links = (
-            channel.permissions_for(guild.me).embed_links
-            and self.settings[guild.id]["invite_deleted"]["embed"]
-        )
-        if version_info >= VersionInfo.from_str("3.4.1"):
+        embed_links = channel.permissions_for(guild.me).embed_links and event.embed
+        if SET_GUILD_LOCALE:
             await i18n.set_contextual_locales_from_guild(self.bot, guild)
         # set guild level i18n
         invite_attrs = {
@@ -1850,7 +1836,7 @@ class EventMixin:
         except AttributeError:
             invite_time = datetime.datetime.utcnow().strftime("%H:%M:%S")
         msg = _("{emoji} `{time}` Invite deleted ").format(
-            emoji=self.settings[guild.id]["invite_deleted"]["emoji"],
+            emoji=event.emoji,
             time=invite_time,
         )
         embed = discord.Embed(
@@ -1872,6 +1858,6 @@ class EventMixin:
         if not worth_updating:
             return
         if embed_links:
-            await channel.send(embed=embed)
+            self.queue_modlog(channel, embed=embed)
         else:
-            await channel.send(escape(msg, mass_mentions=True))
+            self.queue_modlog(channel, escape(msg, mass_mentions=True))
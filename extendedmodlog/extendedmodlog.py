@@ -6,6 +6,7 @@ from redbot.core import Config, checks, commands, modlog
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils.chat_formatting import humanize_list
 
+from .auditlog import AuditLogCache
 from .eventmixin import CommandPrivs, EventChooser, EventMixin
 from .settings import inv_settings
 
@@ -29,7 +30,12 @@ class ExtendedModLog(EventMixin, commands.Cog):
         self.config.register_guild(**inv_settings)
         self.config.register_global(version="0.0.0")
         self.settings = {}
+        self.dispatch = {}
         self._ban_cache = {}
+        self._join_batches = {}
+        self._invite_save_tasks = {}
+        self.audit_log_cache = AuditLogCache()
+        self.modlog_queues = {}
         self.loop = bot.loop.create_task(self.invite_links_loop())
 
     def format_help_for_context(self, ctx: commands.Context):
@@ -41,6 +47,14 @@ class ExtendedModLog(EventMixin, commands.Cog):
 
     def cog_unload(self):
         self.loop.cancel()
+        for queue in self.modlog_queues.values():
+            queue.close()
+
+    async def cog_after_invoke(self, ctx: commands.Context) -> None:
+        # Every change to the settings is made through a command
+        # so the listeners settings are rebuilt after any of them run
+        if ctx.guild is not None:
+            self.rebuild_dispatch(ctx.guild.id)
 
     async def red_delete_data_for_user(self, **kwargs):
         """
@@ -73,6 +87,8 @@ class ExtendedModLog(EventMixin, commands.Cog):
                 await self.config.version.set("2.8.5")
 
         self.settings = all_data
+        for guild_id in self.settings:
+            self.rebuild_dispatch(guild_id)
 
     async def modlog_settings(self, ctx: commands.Context) -> None:
         guild = ctx.message.guild
@@ -699,3 +715,50 @@ class ExtendedModLog(EventMixin, commands.Cog):
             await ctx.send(_(" Now tracking events in ") + channel.mention)
         else:
             await ctx.send(channel.mention + _(" is not being ignored."))
+
+    @_modlog.command(name="auditcache", hidden=True)
+    @checks.is_owner()
+    async def _audit_cache_stats(self, ctx: commands.Context) -> None:
+        """
+        Show how often audit log lookups are served from the shared cache
+        """
+        cache = self.audit_log_cache
+        msg = _(
+            "Audit log cache: {hits} hits, {misses} requests ({rate:.1%} hit rate), "
+            "{pages} cached pages."
+        ).format(
+            hits=cache.hits,
+            misses=cache.misses,
+            rate=cache.hit_rate,
+            pages=len(cache),
+        )
+        await ctx.send(msg)
+
+    @_modlog.command(name="queuestats", hidden=True)
+    @checks.is_owner()
+    async def _queue_stats(self, ctx: commands.Context) -> None:
+        """
+        Show the modlog output queues depth and latency
+        """
+        queues = list(self.modlog_queues.values())
+        events = sum(q.events_sent for q in queues)
+        msg = _(
+            "{queues} channel queues, {pending} events pending.\n"
+            "{events} events sent in {messages} messages.\n"
+            "Average latency {average:.2f}s, max {max_latency:.2f}s."
+        ).format(
+            queues=len(queues),
+            pending=sum(len(q.pending) for q in queues),
+            events=events,
+            messages=sum(q.messages_sent for q in queues),
+            average=sum(q.total_latency for q in queues) / events if events else 0.0,
+            max_latency=max((q.max_latency for q in queues), default=0.0),
+        )
+        busiest = sorted(queues, key=lambda q: len(q.pending), reverse=True)[:5]
+        for queue in busiest:
+            if not queue.pending:
+                break
+            msg += "\n{channel}: {pending}".format(
+                channel=queue.channel.mention, pending=len(queue.pending)
+            )
+        await ctx.send(msg)
@@ -0,0 +1,71 @@
+import asyncio
+import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import discord
+
+# How long joins are collected before checking which invites were used.
+# Every join within this window shares a single `guild.invites()` call.
+INVITE_WINDOW = 2
+# How long changes to the cached invites are held before being saved to config.
+INVITE_SAVE_DELAY = 30
+
+# The code of the invite used and either the inviter or their ID
+# when the invite is no longer available.
+InviteUse = Tuple[str, Union[discord.abc.User, int, None]]
+
+
+def invite_to_dict(invite: discord.Invite) -> dict:
+    created_at = getattr(invite, "created_at", None) or datetime.datetime.utcnow()
+    channel = getattr(invite, "channel", discord.Object(id=0))
+    inviter = getattr(invite, "inviter", discord.Object(id=0))
+    return {
+        "uses": getattr(invite, "uses", 0),
+        "max_age": getattr(invite, "max_age", None),
+        "created_at": created_at.timestamp(),
+        "max_uses": getattr(invite, "max_uses", None),
+        "temporary": getattr(invite, "temporary", False),
+        "inviter": getattr(inviter, "id", "Unknown"),
+        "channel": getattr(channel, "id", "Unknown"),
+    }
+
+
+class JoinBatch:
+    """
+    Members who joined a guild within the same `INVITE_WINDOW`
+    waiting for their invites to be resolved together
+    """
+
+    __slots__ = ("members", "task")
+
+    def __init__(self):
+        self.members: List[int] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+def attribute_joins(
+    cached: Dict[str, dict], invites: List[discord.Invite], members: List[int]
+) -> Dict[int, InviteUse]:
+    """
+    Compares the cached invite uses with the guilds current invites
+    and assigns each new use to the members who joined in order.
+
+    Invites that disappeared while on their last use are assumed to have
+    been used up by one of the joins.
+    """
+    used: List[InviteUse] = []
+    current = set()
+    for invite in invites:
+        current.add(invite.code)
+        before = cached.get(invite.code, {}).get("uses", 0)
+        new_uses = (invite.uses or 0) - before
+        if new_uses > 0:
+            inviter = getattr(invite, "inviter", None)
+            used.extend([(invite.code, inviter)] * new_uses)
+    for code, data in cached.items():
+        if code in current or not data.get("max_uses"):
+            continue
+        if (data["max_uses"] - data["uses"]) == 1:
+            inviter_id = data.get("inviter")
+            used.append((code, inviter_id if isinstance(inviter_id, int) else None))
+    return {member_id: use for member_id, use in zip(members, used)}
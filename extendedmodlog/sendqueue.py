@@ -0,0 +1,144 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+import discord
+from redbot.core.utils.chat_formatting import pagify
+
+logger = logging.getLogger("red.trusty-cogs.ExtendedModLog")
+
+# Sending several embeds in one message needs discord.py 2.0
+SUPPORTS_MULTIPLE_EMBEDS = "embeds" in inspect.signature(discord.abc.Messageable.send).parameters
+MAX_EMBEDS = 10 if SUPPORTS_MULTIPLE_EMBEDS else 1
+MAX_CONTENT = 2000
+# Discord rejects messages whose embeds add up to more than this
+MAX_EMBED_LENGTH = 6000
+# Block quotes run to the end of a message so nothing can be merged after one
+BLOCK_QUOTE = ">>>"
+# Discord allows 5 messages every 5 seconds in a channel
+RATE_LIMIT_MESSAGES = 5
+RATE_LIMIT_PER = 5.0
+
+QueuedEvent = Tuple[float, Optional[str], Optional[discord.Embed]]
+
+
+class ModlogQueue:
+    """
+    Outgoing messages for a single modlog channel
+
+    Events are sent in the order they were queued. Anything that queues
+    up while waiting on the rate limit is merged into as few messages as
+    possible, consecutive embeds are sent together (when supported) and
+    consecutive text events are joined up to the message length limit.
+    """
+
+    __slots__ = (
+        "channel",
+        "pending",
+        "task",
+        "messages_sent",
+        "events_sent",
+        "total_latency",
+        "max_latency",
+        "_sent_at",
+    )
+
+    def __init__(self, channel: discord.TextChannel):
+        self.channel = channel
+        self.pending: Deque[QueuedEvent] = deque()
+        self.task: Optional[asyncio.Task] = None
+        self.messages_sent = 0
+        self.events_sent = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._sent_at: Deque[float] = deque(maxlen=RATE_LIMIT_MESSAGES)
+
+    def __repr__(self):
+        return "<ModlogQueue channel={} pending={} sent={}>".format(
+            self.channel.id, len(self.pending), self.messages_sent
+        )
+
+    def put(self, content: Optional[str] = None, embed: Optional[discord.Embed] = None) -> None:
+        now = time.monotonic()
+        if embed is not None:
+            self.pending.append((now, None, embed))
+        elif content:
+            for page in pagify(content, page_length=MAX_CONTENT):
+                self.pending.append((now, page, None))
+        if self.pending and (self.task is None or self.task.done()):
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def close(self) -> None:
+        """Drops anything still queued and stops sending"""
+        self.pending.clear()
+        if self.task is not None:
+            self.task.cancel()
+
+    def _next_message(self) -> Tuple[List[float], Optional[str], List[discord.Embed]]:
+        queued_at: List[float] = []
+        embeds: List[discord.Embed] = []
+        lines: List[str] = []
+        length = 0
+        if self.pending[0][2] is not None:
+            while self.pending and self.pending[0][2] is not None and len(embeds) < MAX_EMBEDS:
+                embed = self.pending[0][2]
+                if embeds and length + len(embed) > MAX_EMBED_LENGTH:
+                    break
+                added, _content, _embed = self.pending.popleft()
+                queued_at.append(added)
+                embeds.append(embed)
+                length += len(embed)
+            return queued_at, None, embeds
+        while self.pending and self.pending[0][1] is not None:
+            content = self.pending[0][1]
+            if lines and length + len(content) + 1 > MAX_CONTENT:
+                break
+            added, _content, _embed = self.pending.popleft()
+            queued_at.append(added)
+            lines.append(content)
+            length += len(content) + 1
+            if BLOCK_QUOTE in content:
+                break
+        return queued_at, "\n".join(lines), embeds
+
+    async def _wait_for_rate_limit(self) -> None:
+        if len(self._sent_at) < RATE_LIMIT_MESSAGES:
+            return
+        wait = self._sent_at[0] + RATE_LIMIT_PER - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _send(self, content: Optional[str], embeds: List[discord.Embed]) -> None:
+        await self._wait_for_rate_limit()
+        try:
+            if len(embeds) > 1:
+                await self.channel.send(embeds=embeds)
+            elif embeds:
+                await self.channel.send(embed=embeds[0])
+            else:
+                await self.channel.send(content)
+        except discord.HTTPException as e:
+            self._sent_at.append(time.monotonic())
+            if e.status == 400 and len(embeds) > 1:
+                # One of the merged embeds was rejected so send them
+                # separately to only lose the bad one
+                for embed in embeds:
+                    await self._send(None, [embed])
+                return
+            logger.warning("Error sending modlog to %s", self.channel.id, exc_info=True)
+            return
+        self._sent_at.append(time.monotonic())
+        self.messages_sent += 1
+
+    async def _run(self) -> None:
+        while self.pending:
+            queued_at, content, embeds = self._next_message()
+            await self._send(content, embeds)
+            now = time.monotonic()
+            self.events_sent += len(queued_at)
+            for added in queued_at:
+                self.total_latency += now - added
+                self.max_latency = max(self.max_latency, now - added)
@@ -8,7 +8,9 @@ import discord
 from redbot.core import Config, commands
 from redbot.core.bot import Red
 
+from .api import HockeyAPI
 from .game import Game
+from .gamefeed import FeedReplay
 from .helper import (
     HockeyStandings,
     HockeyStates,
@@ -18,6 +20,8 @@ from .helper import (
     TimezoneFinder,
 )
 from .pickems import Pickems
+from .render import RenderCache
+from .subscriptions import SubscriptionIndex
 
 
 class MixinMeta(ABC):
@@ -32,8 +36,12 @@ class MixinMeta(ABC):
         self.bot: Red
         self.loop: Optional[asyncio.Task]
         self.TEST_LOOP: bool
+        self.feed_replay: Optional[FeedReplay]
+        self.subscriptions: SubscriptionIndex
+        self.render_cache: RenderCache
         self.all_pickems: dict
         self.session: aiohttp.ClientSession
+        self.api: HockeyAPI
         self.pickems_config: Config
         self._ready: asyncio.Event
 
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+log = logging.getLogger("red.trusty-cogs.Hockey")
+
+# How long in seconds each kind of response is reused
+# as (while games are live, otherwise)
+ENDPOINT_TTLS: Dict[str, Tuple[float, float]] = {
+    "/standings": (60, 1800),
+    "/schedule": (30, 300),
+    "/content": (60, 900),
+    "/roster": (1800, 3600),
+    "/people/": (300, 3600),
+    "records.nhl.com": (3600, 3600),
+}
+DEFAULT_TTL = (30, 300)
+# A single game's feed is cached based on that game's state
+FEED_TTLS: Dict[str, float] = {"Preview": 60, "Live": 10, "Final": 3600}
+MAX_CACHED_RESPONSES = 256
+
+_client: Optional["HockeyAPI"] = None
+
+
+class HockeyAPI:
+    """
+    Shared client for the NHL API using the cog's session
+
+    Responses are kept for a time based on the endpoint and whether any
+    games are live so commands, embeds and posts asking for the same
+    standings or schedule share one request. Requests for a URL made while
+    it is already being fetched wait for that request instead of making
+    their own. Cached responses are shared so they must not be modified.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, max_size: int = MAX_CACHED_RESPONSES):
+        self.session = session
+        self.max_size = max_size
+        self.live = False
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __repr__(self):
+        return "<HockeyAPI cached={} live={} hits={} misses={}>".format(
+            len(self._cache), self.live, self.hits, self.misses
+        )
+
+    def ttl(self, url: str, data: Any) -> float:
+        """How long a response from `url` can be reused"""
+        if "/feed/live" in url:
+            try:
+                state = data["gameData"]["status"]["abstractGameState"]
+            except (KeyError, TypeError):
+                state = None
+            return FEED_TTLS.get(state, DEFAULT_TTL[0])
+        live, idle = next(
+            (ttls for endpoint, ttls in ENDPOINT_TTLS.items() if endpoint in url), DEFAULT_TTL
+        )
+        return live if self.live else idle
+
+    def store(self, url: str, data: Any) -> None:
+        self._cache[url] = (time.monotonic() + self.ttl(url, data), data)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """Forget every cached response or only those whose URL contains `endpoint`"""
+        if endpoint is None:
+            self._cache.clear()
+            return
+        for url in [url for url in self._cache if endpoint in url]:
+            del self._cache[url]
+
+    async def _fetch(self, url: str) -> Any:
+        try:
+            async with self.session.get(url) as resp:
+                data = await resp.json()
+                if resp.status == 200:
+                    self.store(url, data)
+        finally:
+            self._pending.pop(url, None)
+        return data
+
+    async def get_json(self, url: str, refresh: bool = False) -> Any:
+        """
+        Returns the json from `url` reusing a recent response when possible
+
+        `refresh` skips the cached response but still shares
+        a request that's already in progress.
+        """
+        if not refresh:
+            cached = self._cache.get(url)
+            if cached is not None and cached[0] > time.monotonic():
+                self.hits += 1
+                return cached[1]
+        task = self._pending.get(url)
+        if task is None:
+            self.misses += 1
+            task = asyncio.get_running_loop().create_task(self._fetch(url))
+            self._pending[url] = task
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+
+def set_client(client: Optional[HockeyAPI]) -> None:
+    """Sets the client used by requests which don't have access to the cog"""
+    global _client
+    _client = client
+
+
+async def get_json(url: str, session: Optional[aiohttp.ClientSession] = None) -> Any:
+    """
+    Returns the json from `url` through the loaded cog's shared client
+
+    Falls back to `session` or a new session when the cog isn't loaded.
+    """
+    if _client is not None and not _client.session.closed:
+        return await _client.get_json(url)
+    if session is None:
+        async with aiohttp.ClientSession() as new_session:
+            async with new_session.get(url) as resp:
+                return await resp.json()
+    async with session.get(url) as resp:
+        return await resp.json()
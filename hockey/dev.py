@@ -2,6 +2,7 @@ import discord
 import json
 import logging
 from datetime import date, datetime, timedelta
+from pathlib import Path
 
 from redbot.core import commands
 from redbot.core.bot import Red
@@ -13,6 +14,7 @@ from .abc import MixinMeta
 from .constants import TEAMS
 from .errors import InvalidFileError
 from .game import Game
+from .gamefeed import FeedReplay
 from .helper import get_channel_obj
 from .menu import BaseMenu, SimplePages
 from .pickems import Pickems
@@ -379,6 +381,7 @@ class HockeyDev(MixinMeta):
             channel = guild.get_channel(channel_id)
             if channel is None:
                 await self.config.channel_from_id(channel_id).clear()
+                self.subscriptions.remove_channel(channel_id)
                 log.info(f"Removed the following channels {channel_id}")
                 continue
             else:
@@ -397,10 +400,12 @@ class HockeyDev(MixinMeta):
                 channel = self.bot.get_channel(channel_id)
                 guild = channel.guild
                 await self.config.channel(channel).guild_id.set(guild.id)
+                await self.subscriptions.refresh_channel(channel.id)
             else:
                 guild = self.bot.get_guild(data["guild_id"])
                 if not guild:
                     await self.config.channel_from_id(channel_id).clear()
+                    self.subscriptions.remove_channel(channel_id)
                     await self.config.guild_from_id(data["guild_id"]).clear()
                     log.info(f"Removed the following channels {channel_id}")
                     continue
@@ -408,6 +413,7 @@ class HockeyDev(MixinMeta):
 
             if channel is None:
                 await self.config.channel_from_id(channel_id).clear()
+                self.subscriptions.remove_channel(channel_id)
                 log.info(f"Removed the following channels {channel_id}")
                 continue
             # if await self.config.channel(channel).to_delete():
@@ -449,8 +455,35 @@ class HockeyDev(MixinMeta):
         Toggle the test game loop
         """
         self.TEST_LOOP = not self.TEST_LOOP
+        if not self.TEST_LOOP:
+            self.feed_replay = None
+        elif self.feed_replay is None:
+            self.feed_replay = FeedReplay(Path(__file__).parent / "testgame.json")
         await ctx.send(_("Test loop set to ") + str(self.TEST_LOOP))
 
+    @hockeydev.command(hidden=True)
+    async def replay(self, ctx: commands.Context, path: str, interval: float = 1.0) -> None:
+        """
+        Replay recorded game feeds through the test loop
+
+        `path` is either a single recorded feed or a folder of feeds
+        which are played back in filename order.
+        `interval` is how many seconds to wait between each feed.
+        """
+        try:
+            replay = FeedReplay(Path(path), interval)
+            link = replay.link
+        except (OSError, KeyError, json.JSONDecodeError):
+            await ctx.send(_("I could not find any recorded feeds at that path."))
+            return
+        self.feed_replay = replay
+        self.TEST_LOOP = True
+        await ctx.send(
+            _("Replaying {count} feeds for {link} every {interval} seconds.").format(
+                count=len(replay.files), link=link, interval=interval
+            )
+        )
+
     @hockeydev.command()
     async def clear_seasonal_leaderboard_all(self, ctx: commands.Context) -> None:
         """
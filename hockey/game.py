@@ -6,20 +6,19 @@ from typing import Dict, List, Literal, Optional, Tuple, Union
 
 import aiohttp
 import discord
-from redbot import VersionInfo, version_info
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator
-from redbot.core.utils import AsyncIter, bounded_gather
+from redbot.core.utils import bounded_gather
 
+from .api import get_json
 from .constants import BASE_URL, CONTENT_URL, TEAMS
 from .goal import Goal
 from .helper import (
-    check_to_post,
     get_channel_obj,
     get_team,
-    get_team_role,
     utc_to_local,
 )
+from .render import MENTION_ROLES, NO_ROLE_MENTIONS, resolve_targets
 from .standings import Standings
 
 _ = Translator("Hockey", __file__)
@@ -178,13 +177,7 @@ class Game:
         if games_list != []:
             for games in games_list:
                 try:
-                    if session is None:
-                        async with aiohttp.ClientSession() as new_session:
-                            async with new_session.get(BASE_URL + games["link"]) as resp:
-                                data = await resp.json()
-                    else:
-                        async with session.get(BASE_URL + games["link"]) as resp:
-                            data = await resp.json()
+                    data = await get_json(BASE_URL + games["link"], session)
                     # log.debug(BASE_URL + games["link"])
                     return_games_list.append(await Game.from_json(data))
                 except Exception:
@@ -226,13 +219,7 @@ class Game:
         if team not in ["all", None]:
             # if a team is provided get just that TEAMS data
             url += "&teamId={}".format(TEAMS[team]["id"])
-        if session is None:
-            async with aiohttp.ClientSession() as new_session:
-                async with new_session.get(url) as resp:
-                    data = await resp.json()
-        else:
-            async with session.get(url) as resp:
-                data = await resp.json()
+        data = await get_json(url, session)
         game_list = [game for date in data["dates"] for game in date["games"]]
         return game_list
 
@@ -373,6 +360,24 @@ class Game:
                 em.add_field(name="Period", value=msg)
         return em
 
+    def render_version(self) -> tuple:
+        """
+        Everything the game state embeds and text are built from
+        """
+        return (
+            self.game_state,
+            self.period_ord,
+            self.period_time_left,
+            self.home_score,
+            self.away_score,
+            self.home_shots,
+            self.away_shots,
+            self.first_star,
+            self.second_star,
+            self.third_star,
+            len(self.goals),
+        )
+
     async def game_state_embed(self) -> discord.Embed:
         """
         Makes the game state embed based on the game self provided
@@ -567,21 +572,23 @@ class Game:
         """
         Builds the period recap
         """
-        em = await self.make_game_embed(False, period)
-        tasks = []
+        hockey = bot.get_cog("Hockey")
+        em = await hockey.render_cache.get(
+            (self.link, ("Periodrecap", period), "embed"),
+            self.render_version(),
+            lambda: self.make_game_embed(False, period),
+        )
         post_state = ["all", self.home_team, self.away_team]
-        config = bot.get_cog("Hockey").config
-        all_channels = await bot.get_cog("Hockey").config.all_channels()
-        async for channel_id, data in AsyncIter(all_channels.items(), steps=100):
-            channel = await get_channel_obj(bot, channel_id, data)
+        tasks = []
+        for subscriber in hockey.subscriptions.subscribers(post_state, "Periodrecap"):
+            if self.game_state not in subscriber.settings["game_states"]:
+                continue
+            channel = await get_channel_obj(bot, subscriber.channel_id, subscriber.settings)
             if not channel:
                 continue
-
-            should_post = await check_to_post(bot, channel, data, post_state, self.game_state)
-            should_post &= "Periodrecap" in await config.channel(channel).game_states()
-            publish = "Periodrecap" in await config.channel(channel).publish_states()
-            if should_post:
-                bot.loop.create_task(self.post_period_recap(channel, em, publish))
+            publish = "Periodrecap" in subscriber.settings["publish_states"]
+            tasks.append(self.post_period_recap(channel, em, publish))
+        bot.loop.create_task(hockey.fan_out.gather(tasks))
 
     async def post_period_recap(
         self, channel: discord.TextChannel, embed: discord.Embed, publish: bool
@@ -606,82 +613,95 @@ class Game:
         and post in all channels
         """
         post_state = ["all", self.home_team, self.away_team]
-        state_embed = await self.game_state_embed()
-        state_text = await self.game_state_text()
+        hockey = bot.get_cog("Hockey")
+        event = (self.game_state, self.period_ord)
+        version = self.render_version()
+        state_embed = await hockey.render_cache.get(
+            (self.link, event, "embed"), version, self.game_state_embed
+        )
+        state_text = await hockey.render_cache.get(
+            (self.link, event, "text"), version, self.game_state_text
+        )
+        subscribers = hockey.subscriptions.subscribers(post_state, self.game_state)
         tasks = []
-        all_channels = await bot.get_cog("Hockey").config.all_channels()
-        async for channel_id, data in AsyncIter(all_channels.items(), steps=100):
-            channel = await get_channel_obj(bot, channel_id, data)
-            if not channel:
+        for channel, guild_post, channel_settings in await resolve_targets(bot, subscribers):
+            if self.game_state == "Preview" and channel.id in guild_post.game_day_channels:
+                # Don't post the preview message twice in the channel
                 continue
-
-            should_post = await check_to_post(bot, channel, data, post_state, self.game_state)
-            if should_post:
-                bot.loop.create_task(
-                    self.actually_post_state(bot, channel, state_embed, state_text)
+            content = None
+            allowed_mentions: dict = {}
+            if self.game_state == "Live":
+                if channel.id in guild_post.game_day_channels:
+                    # We don't want to ping people in the game day channels twice
+                    home_role, away_role = self.home_team, self.away_team
+                else:
+                    home_role, away_role = await guild_post.team_roles(
+                        self.home_team, self.away_team
+                    )
+                content = await hockey.render_cache.get(
+                    (self.link, event, ("start", home_role, away_role)),
+                    version,
+                    lambda: _("**{period} Period starting {away_role} at {home_role}**").format(
+                        period=self.period_ord, away_role=away_role, home_role=home_role
+                    ),
                 )
-        # previews = await bounded_gather(*tasks)
+                allowed_mentions = self.state_mentions(guild_post.settings, channel_settings)
+            tasks.append(
+                self.actually_post_state(
+                    bot, channel, state_embed, state_text, content, allowed_mentions
+                )
+            )
+        bot.loop.create_task(hockey.fan_out.gather(tasks))
+
+    def state_mentions(self, guild_settings: dict, channel_settings: dict) -> dict:
+        """
+        Whether the team roles can be pinged when a period starts
+        """
+        state_notifications = (
+            guild_settings["game_state_notifications"]
+            or channel_settings["game_state_notifications"]
+        )
+        # TODO: Something with these I can't remember what now
+        # guild_start = guild_settings["start_notifications"]
+        # channel_start = channel_settings["start_notifications"]
+        # start_notifications = guild_start or channel_start
+        # heh inclusive or
+        if self.game_type == "R" and "OT" in self.period_ord:
+            if not guild_settings["ot_notifications"]:
+                return NO_ROLE_MENTIONS
+        if "SO" in self.period_ord:
+            if not guild_settings["so_notifications"]:
+                return NO_ROLE_MENTIONS
+        return MENTION_ROLES if state_notifications else NO_ROLE_MENTIONS
 
     async def actually_post_state(
-        self, bot: Red, channel: discord.TextChannel, state_embed: discord.Embed, state_text: str
+        self,
+        bot: Red,
+        channel: discord.TextChannel,
+        state_embed: discord.Embed,
+        state_text: str,
+        content: Optional[str],
+        allowed_mentions: dict,
     ) -> Optional[Tuple[discord.TextChannel, discord.Message]]:
+        """
+        Posts the rendered game state in a single channel
+
+        `content` is the period start message posted with live updates
+        """
         guild = channel.guild
         if not channel.permissions_for(guild.me).send_messages:
             log.debug("No permission to send messages in %s", repr(channel))
             return None
-        config = bot.get_cog("Hockey").config
-        guild_settings = await config.guild(guild).all()
-        channel_settings = await config.channel(channel).all()
-        game_day_channels = guild_settings["gdc"]
         can_embed = channel.permissions_for(guild.me).embed_links
         publish_states = []  # await config.channel(channel).publish_states()
         # can_manage_webhooks = False  # channel.permissions_for(guild.me).manage_webhooks
 
         if self.game_state == "Live":
-
-            guild_notifications = guild_settings["game_state_notifications"]
-            channel_notifications = channel_settings["game_state_notifications"]
-            state_notifications = guild_notifications or channel_notifications
-            # TODO: Something with these I can't remember what now
-            # guild_start = guild_settings["start_notifications"]
-            # channel_start = channel_settings["start_notifications"]
-            # start_notifications = guild_start or channel_start
-            # heh inclusive or
-            allowed_mentions = {}
-            home_role, away_role = await get_team_role(guild, self.home_team, self.away_team)
-            if version_info >= VersionInfo.from_str("3.4.0"):
-                if state_notifications:
-                    allowed_mentions = {"allowed_mentions": discord.AllowedMentions(roles=True)}
-                else:
-                    allowed_mentions = {"allowed_mentions": discord.AllowedMentions(roles=False)}
-            if self.game_type == "R" and "OT" in self.period_ord:
-                if not guild_settings["ot_notifications"]:
-                    if version_info >= VersionInfo.from_str("3.4.0"):
-                        allowed_mentions = {
-                            "allowed_mentions": discord.AllowedMentions(roles=False)
-                        }
-                    else:
-                        allowed_mentions = {}
-            if "SO" in self.period_ord:
-                if not guild_settings["so_notifications"]:
-                    if version_info >= VersionInfo.from_str("3.4.0"):
-                        allowed_mentions = {
-                            "allowed_mentions": discord.AllowedMentions(roles=False)
-                        }
-                    else:
-                        allowed_mentions = {}
-            if game_day_channels is not None:
-                # We don't want to ping people in the game day channels twice
-                if channel.id in game_day_channels:
-                    home_role, away_role = self.home_team, self.away_team
-            msg = _("**{period} Period starting {away_role} at {home_role}**").format(
-                period=self.period_ord, away_role=away_role, home_role=home_role
-            )
             try:
                 if not can_embed:
-                    msg = await channel.send(msg + "\n{}".format(state_text), **allowed_mentions)
+                    await channel.send(content + "\n{}".format(state_text), **allowed_mentions)
                 else:
-                    msg = await channel.send(msg, embed=state_embed, **allowed_mentions)
+                    await channel.send(content, embed=state_embed, **allowed_mentions)
                 if self.game_state in publish_states:
                     try:
                         if channel.is_news():
@@ -694,11 +714,6 @@ class Game:
                 log.exception("Could not post goal in %s", repr(channel))
 
         else:
-            if self.game_state == "Preview":
-                if game_day_channels is not None:
-                    # Don't post the preview message twice in the channel
-                    if channel.id in game_day_channels:
-                        return None
             try:
                 if not can_embed:
                     preview_msg = await channel.send(state_text)
@@ -840,18 +855,16 @@ class Game:
             home_emoji=self.home_emoji,
             home=self.home_team,
         )
+        hockey = bot.get_cog("Hockey")
         tasks = []
-        all_channels = await bot.get_cog("Hockey").config.all_channels()
-        async for channel_id, data in AsyncIter(all_channels.items(), steps=100):
-            channel = await get_channel_obj(bot, channel_id, data)
+        for subscriber in hockey.subscriptions.subscribers(post_state, self.game_state):
+            if "all" in subscriber.settings["team"]:
+                continue
+            channel = await get_channel_obj(bot, subscriber.channel_id, subscriber.settings)
             if not channel:
                 continue
-
-            should_post = await check_to_post(bot, channel, data, post_state, self.game_state)
-            team_to_post = await bot.get_cog("Hockey").config.channel(channel).team()
-            if should_post and "all" not in team_to_post:
-                bot.loop.create_task(self.post_game_start(channel, msg))
-        # await bounded_gather(*tasks)
+            tasks.append(self.post_game_start(channel, msg))
+        bot.loop.create_task(hockey.fan_out.gather(tasks))
 
     async def post_game_start(self, channel: discord.TextChannel, msg: str) -> None:
         if not channel.permissions_for(channel.guild.me).send_messages:
@@ -868,16 +881,7 @@ class Game:
     ) -> Optional[Game]:
         url = url.replace(BASE_URL, "")  # strip the base url incase we already have it
         try:
-            if session is None:
-                # this should only happen in pickems objects
-                # since pickems don't have access to the full
-                # cogs session
-                async with aiohttp.ClientSession() as new_session:
-                    async with new_session.get(BASE_URL + url) as resp:
-                        data = await resp.json()
-            else:
-                async with session.get(BASE_URL + url) as resp:
-                    data = await resp.json()
+            data = await get_json(BASE_URL + url, session)
             return await Game.from_json(data)
         except Exception:
             log.exception("Error grabbing game data: ")
@@ -895,9 +899,7 @@ class Game:
         players.update(home_roster)
         game_id = data["gameData"]["game"]["pk"]
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(CONTENT_URL.format(game_id)) as resp:
-                    content = await resp.json()
+            content = await get_json(CONTENT_URL.format(game_id))
             # log.debug(CONTENT_URL.format(game_id))
         except Exception:
             log.debug("Error getting content")
@@ -349,6 +349,7 @@ class GameDayChannels(MixinMeta):
         await self.config.channel(new_chn).to_delete.set(delete_gdc)
         gdc_state_updates = await self.config.guild(guild).gdc_state_updates()
         await self.config.channel(new_chn).game_states.set(gdc_state_updates)
+        await self.subscriptions.refresh_channel(new_chn.id)
         # Gets the timezone to use for game day channel topic
         # timestamp = datetime.strptime(next_game.game_start, "%Y-%m-%dT%H:%M:%SZ")
         # guild_team = await config.guild(guild).gdc_team()
@@ -399,11 +400,13 @@ class GameDayChannels(MixinMeta):
             chn = guild.get_channel(channel)
             if chn is None:
                 await self.config.channel_from_id(channel).clear()
+                self.subscriptions.remove_channel(channel)
                 continue
             if not await self.config.channel(chn).to_delete():
                 continue
             try:
                 await self.config.channel(chn).clear()
+                self.subscriptions.remove_channel(chn.id)
                 await chn.delete()
             except discord.errors.Forbidden:
                 log.error(f"Cannot delete GDC channels in {guild.id} due to permissions issue.")
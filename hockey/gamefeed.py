@@ -0,0 +1,164 @@
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import aiohttp
+
+from .constants import BASE_URL
+
+log = logging.getLogger("red.trusty-cogs.Hockey")
+
+# How many live feeds are requested at the same time
+FEED_CONCURRENCY = 5
+# A single slow feed shouldn't hold up posting for every other game
+FEED_TIMEOUT = aiohttp.ClientTimeout(total=15)
+# Unchanged games are still rebuilt every few polls so goal
+# highlight links which come from a separate endpoint are picked up
+FULL_REFRESH_POLLS = 5
+
+FeedFingerprint = Tuple[
+    str, str, Optional[int], bool, int, int, Tuple[Tuple[str, str], ...], Optional[str]
+]
+
+
+def feed_fingerprint(data: dict) -> FeedFingerprint:
+    """
+    The parts of a live feed `Game.check_game_state` acts on
+
+    If none of these have changed since the last poll there's
+    nothing new to post for the game.
+    """
+    status = data["gameData"]["status"]
+    linescore = data["liveData"]["linescore"]
+    goals = tuple(
+        (play["result"].get("eventCode"), play["result"].get("description"))
+        for play in data["liveData"]["plays"]["allPlays"]
+        if play["result"]["eventTypeId"] == "GOAL"
+        or (
+            play["result"]["eventTypeId"] in ["SHOT", "MISSED_SHOT"]
+            and play["about"]["ordinalNum"] == "SO"
+        )
+    )
+    first_star = data["liveData"].get("decisions", {}).get("firstStar", {}).get("fullName")
+    return (
+        status["abstractGameState"],
+        status["detailedState"],
+        linescore.get("currentPeriod"),
+        linescore.get("currentPeriodTimeRemaining") == "END",
+        linescore["teams"]["home"]["goals"],
+        linescore["teams"]["away"]["goals"],
+        goals,
+        first_star,
+    )
+
+
+class GameFeed:
+    """
+    Tracks the last response seen from a single game's live feed
+    """
+
+    __slots__ = ("link", "etag", "last_modified", "fingerprint", "unchanged_polls")
+
+    def __init__(self, link: str):
+        self.link = link
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fingerprint: Optional[FeedFingerprint] = None
+        self.unchanged_polls = 0
+
+    def __repr__(self):
+        return "<GameFeed link={0.link} unchanged_polls={0.unchanged_polls}>".format(self)
+
+    def reset(self) -> None:
+        """Forget the last response so the next poll is treated as new"""
+        self.etag = None
+        self.last_modified = None
+        self.fingerprint = None
+        self.unchanged_polls = 0
+
+    async def fetch(self, session: aiohttp.ClientSession) -> Optional[dict]:
+        """
+        Returns the feed data or `None` when the API reports
+        it hasn't changed since the last request
+        """
+        headers = {}
+        if self.fingerprint is not None:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+        async with session.get(
+            BASE_URL + self.link, headers=headers, timeout=FEED_TIMEOUT
+        ) as resp:
+            if resp.status == 304:
+                return None
+            data = await resp.json()
+            self.etag = resp.headers.get("ETag")
+            self.last_modified = resp.headers.get("Last-Modified")
+        return data
+
+    def update(self, data: Optional[dict]) -> Optional[dict]:
+        """
+        Returns `data` if the game has changed since the last poll otherwise `None`
+        """
+        if data is not None:
+            fingerprint = feed_fingerprint(data)
+            if fingerprint != self.fingerprint:
+                self.fingerprint = fingerprint
+                self.unchanged_polls = 0
+                return data
+        self.unchanged_polls += 1
+        if self.unchanged_polls < FULL_REFRESH_POLLS:
+            return None
+        if data is None:
+            # The feed itself hasn't changed but the highlights might have
+            # so request the full feed next time
+            self.etag = None
+            self.last_modified = None
+            return None
+        self.unchanged_polls = 0
+        return data
+
+    async def poll(self, session: aiohttp.ClientSession) -> Optional[dict]:
+        return self.update(await self.fetch(session))
+
+
+class FeedReplay:
+    """
+    Plays back recorded live feeds in place of the NHL API
+
+    `path` is either a single feed such as `testgame.json` which is
+    returned on every poll or a folder of feeds which are returned
+    one per poll in filename order, staying on the last one.
+    `interval` is how many seconds to wait between polls.
+    """
+
+    def __init__(self, path: Path, interval: float = 10):
+        if path.is_dir():
+            self.files: List[Path] = sorted(path.glob("*.json"))
+        else:
+            self.files = [path]
+        if not self.files:
+            raise FileNotFoundError(f"No recorded feeds found in {path}")
+        self.interval = interval
+        self.position = 0
+        self._link: Optional[str] = None
+
+    def __repr__(self):
+        return "<FeedReplay files={} position={}>".format(len(self.files), self.position)
+
+    @property
+    def link(self) -> str:
+        """The game link the recorded feeds belong to"""
+        if self._link is None:
+            with self.files[0].open("r") as infile:
+                self._link = json.load(infile)["link"]
+        return self._link
+
+    def next_feed(self) -> dict:
+        path = self.files[min(self.position, len(self.files) - 1)]
+        self.position += 1
+        log.debug("Replaying recorded feed %s", path)
+        with path.open("r") as infile:
+            return json.load(infile)
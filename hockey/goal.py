@@ -12,7 +12,8 @@ from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter, bounded_gather
 
 from .constants import HEADSHOT_URL, TEAMS
-from .helper import check_to_post, get_channel_obj, get_team
+from .helper import get_team
+from .render import MENTION_ROLES, NO_ROLE_MENTIONS, RenderCache, resolve_guilds, resolve_targets
 
 if TYPE_CHECKING:
     from .game import Game
@@ -175,69 +176,71 @@ class Goal:
                 self.tasks.append(hue.goal_lights())
             except Exception:
                 pass
-        goal_embed = await self.goal_post_embed(game_data)
-        goal_text = await self.goal_post_text(game_data)
+        hockey = bot.get_cog("Hockey")
+        goal_embed = await self.rendered_embed(hockey.render_cache, game_data)
+        version = self.render_version(game_data)
+        goal_text = await hockey.render_cache.get(
+            (game_data.link, self.goal_id, "text"),
+            version,
+            lambda: self.goal_post_text(game_data),
+        )
+        subscribers = hockey.subscriptions.subscribers(post_state, "Goal")
         tasks = []
-        all_channels = await bot.get_cog("Hockey").config.all_channels()
-        post_data = []
-        async for channel_id, data in AsyncIter(all_channels.items(), steps=100):
-            channel = await get_channel_obj(bot, channel_id, data)
-            if not channel:
-                continue
-
-            should_post = await check_to_post(bot, channel, data, post_state, "Goal")
-            if should_post:
-                post_data.append(
-                    await self.actually_post_goal(bot, channel, goal_embed, goal_text)
+        for channel, guild_post, channel_settings in await resolve_targets(bot, subscribers):
+            role = None
+            if channel.id not in guild_post.game_day_channels:
+                # We don't want to ping people in the game day channels twice
+                role = guild_post.goal_role(self.team_name)
+            mention = None
+            text = goal_text
+            if role is not None:
+                mention = role.mention
+                text = await hockey.render_cache.get(
+                    (game_data.link, self.goal_id, ("text", role.id)),
+                    version,
+                    lambda: f"{role}\n{goal_text}",
+                )
+            notifications = (
+                guild_post.settings["goal_notifications"] or channel_settings["goal_notifications"]
+            )
+            tasks.append(
+                self.actually_post_goal(
+                    channel,
+                    goal_embed,
+                    text,
+                    mention,
+                    MENTION_ROLES if notifications else NO_ROLE_MENTIONS,
                 )
-        # data = await bounded_gather(*tasks)
+            )
+        post_data = await hockey.fan_out.gather(tasks)
         for channel in post_data:
-            if channel is None:
+            if channel is None or isinstance(channel, Exception):
                 continue
             else:
                 msg_list.append(channel)
         return msg_list
 
     async def actually_post_goal(
-        self, bot: Red, channel: discord.TextChannel, goal_embed: discord.Embed, goal_text: str
+        self,
+        channel: discord.TextChannel,
+        goal_embed: discord.Embed,
+        goal_text: str,
+        mention: Optional[str],
+        allowed_mentions: dict,
     ) -> Optional[Tuple[int, int, int]]:
+        """
+        Posts the rendered goal in a single channel
+
+        `goal_text` already includes the goal role when there is one
+        and `mention` is the role mention to go with the embed or `None`
+        """
         try:
             guild = channel.guild
             if not channel.permissions_for(guild.me).send_messages:
                 log.debug("No permission to send messages in %s", repr(channel))
                 return None
-            config = bot.get_cog("Hockey").config
-            game_day_channels = await config.guild(guild).gdc()
-            # Don't want to ping people in the game day channels
             can_embed = channel.permissions_for(guild.me).embed_links
             can_manage_webhooks = False  # channel.permissions_for(guild.me).manage_webhooks
-            role = None
-            guild_notifications = await config.guild(guild).goal_notifications()
-            channel_notifications = await config.channel(channel).goal_notifications()
-            goal_notifications = guild_notifications or channel_notifications
-            publish_goals = "Goal" in await config.channel(channel).publish_states()
-            allowed_mentions = {}
-            montreal = ["Montréal Canadiens", "Montreal Canadiens"]
-
-            role = discord.utils.get(guild.roles, name=f"{self.team_name} GOAL")
-            try:
-                if self.team_name in montreal:
-                    if not role:
-                        montreal.remove(self.team_name)
-                        role = discord.utils.get(guild.roles, name=f"{montreal[0]} GOAL")
-            except Exception:
-                log.error("Error trying to find montreal goal role")
-            if version_info >= VersionInfo.from_str("3.4.0"):
-                if goal_notifications:
-                    log.debug(goal_notifications)
-                    allowed_mentions = {"allowed_mentions": discord.AllowedMentions(roles=True)}
-                else:
-                    allowed_mentions = {"allowed_mentions": discord.AllowedMentions(roles=False)}
-
-            if game_day_channels is not None:
-                # We don't want to ping people in the game day channels twice
-                if channel.id in game_day_channels:
-                    role = None
 
             if not can_embed and can_manage_webhooks:
                 # try to create a webhook with the teams info to bypass embed permissions
@@ -256,18 +259,18 @@ class Goal:
 
             if not can_embed and not can_manage_webhooks:
                 # Create text only message if embed_links permission is not set
-                if role is not None:
-                    msg = await channel.send(f"{role}\n{goal_text}", **allowed_mentions)
+                if mention is not None:
+                    msg = await channel.send(goal_text, **allowed_mentions)
                 else:
                     msg = await channel.send(goal_text)
                 # msg_list[str(channel.id)] = msg.id
 
-            if role is None or "missed" in self.event.lower():
+            if mention is None or "missed" in self.event.lower():
                 msg = await channel.send(embed=goal_embed)
                 # msg_list[str(channel.id)] = msg.id
 
             else:
-                msg = await channel.send(role.mention, embed=goal_embed, **allowed_mentions)
+                msg = await channel.send(mention, embed=goal_embed, **allowed_mentions)
                 # msg_list[str(channel.id)] = msg.id
             return channel.guild.id, channel.id, msg.id
         except Exception:
@@ -339,15 +342,21 @@ class Goal:
         """
         # scorer = self.headshots.format(goal["players"][0]["player"]["id"])
         # post_state = ["all", game_data.home_team, game_data.away_team]
-        em = await self.goal_post_embed(game_data)
+        em = await self.rendered_embed(bot.get_cog("Hockey").render_cache, game_data)
+        guilds = [bot.get_guild(guild_id) for guild_id, channel_id, message_id in og_msg]
+        guild_posts = await resolve_guilds(bot, [guild for guild in guilds if guild])
         async for guild_id, channel_id, message_id in AsyncIter(og_msg, steps=100):
-            guild = bot.get_guild(guild_id)
-            if not guild:
+            guild_post = guild_posts.get(guild_id)
+            if not guild_post:
                 continue
-            channel = guild.get_channel(int(channel_id))
+            channel = guild_post.guild.get_channel(int(channel_id))
             if channel is None:
                 continue
-            bot.loop.create_task(self.edit_goal(bot, channel, message_id, em))
+            role = None
+            if channel.id not in guild_post.game_day_channels:
+                # We don't want to ping people in the game day channels twice
+                role = guild_post.goal_role(self.team_name)
+            bot.loop.create_task(self.edit_goal(channel, message_id, em, role))
             # This is to prevent endlessly waiting incase someone
             # decided to publish one of our messages we want to edit
             # if we did bounded_gather here the gather would wait until
@@ -358,7 +367,11 @@ class Goal:
         return
 
     async def edit_goal(
-        self, bot: Red, channel: discord.TextChannel, message_id: int, em: discord.Embed
+        self,
+        channel: discord.TextChannel,
+        message_id: int,
+        em: discord.Embed,
+        role: Optional[discord.Role],
     ) -> None:
         try:
             if not channel.permissions_for(channel.guild.me).embed_links:
@@ -370,13 +383,6 @@ class Goal:
                     message = await channel.fetch_message(message_id)
             except (discord.errors.NotFound, discord.errors.Forbidden):
                 return
-            guild = channel.guild
-            game_day_channels = await bot.get_cog("Hockey").config.guild(guild).gdc()
-            role = discord.utils.get(guild.roles, name=self.team_name + " GOAL")
-            if game_day_channels is not None:
-                # We don't want to ping people in the game day channels twice
-                if channel.id in game_day_channels:
-                    role = None
             if role is None or "missed" in self.event.lower():
                 await message.edit(embed=em)
             else:
@@ -415,6 +421,26 @@ class Goal:
                 away_msg += score.format(scorer=scorer)
         return home_msg, away_msg
 
+    def render_version(self, game: Game) -> tuple:
+        """
+        Everything the goal embed and text are built from
+        """
+        return (
+            *self.to_json().values(),
+            game.period_ord,
+            game.period_time_left,
+            game.home_score,
+            game.away_score,
+            len(game.goals),
+        )
+
+    async def rendered_embed(self, render_cache: RenderCache, game: Game) -> discord.Embed:
+        return await render_cache.get(
+            (game.link, self.goal_id, "embed"),
+            self.render_version(game),
+            lambda: self.goal_post_embed(game),
+        )
+
     async def goal_post_embed(self, game: Game) -> discord.Embed:
         """
         Gets the embed for goal posts
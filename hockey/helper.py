@@ -276,6 +276,18 @@ async def get_team_role(guild: discord.Guild, home_team: str, away_team: str) ->
     return home_role, away_role
 
 
+def get_goal_role(guild: discord.Guild, team_name: str) -> Optional[discord.Role]:
+    """
+    Returns the role to mention for a teams goals if the guild has one
+    """
+    role = discord.utils.get(guild.roles, name=f"{team_name} GOAL")
+    montreal = ["Montréal Canadiens", "Montreal Canadiens"]
+    if role is None and team_name in montreal:
+        montreal.remove(team_name)
+        role = discord.utils.get(guild.roles, name=f"{montreal[0]} GOAL")
+    return role
+
+
 async def get_team(bot: Red, team: str) -> TeamEntry:
     config = bot.get_cog("Hockey").config
     team_list = await config.teams()
@@ -350,23 +362,28 @@ async def get_channel_obj(bot: Red, channel_id: int, data: dict) -> Optional[dis
     This is used in Game objects and Goal objects so it's here to be shared
     between the two rather than duplicating the code
     """
+    hockey = bot.get_cog("Hockey")
     if not data["guild_id"]:
         channel = bot.get_channel(id=channel_id)
         if not channel:
-            await bot.get_cog("Hockey").config.channel_from_id(channel_id).clear()
+            await hockey.config.channel_from_id(channel_id).clear()
+            hockey.subscriptions.remove_channel(channel_id)
             log.info(f"{channel_id} channel was removed because it no longer exists")
             return None
         guild = channel.guild
-        await bot.get_cog("Hockey").config.channel(channel).guild_id.set(guild.id)
+        await hockey.config.channel(channel).guild_id.set(guild.id)
+        data["guild_id"] = guild.id
         return channel
     guild = bot.get_guild(data["guild_id"])
     if not guild:
-        await bot.get_cog("Hockey").config.channel_from_id(channel_id).clear()
+        await hockey.config.channel_from_id(channel_id).clear()
+        hockey.subscriptions.remove_channel(channel_id)
         log.info(f"{channel_id} channel was removed because it no longer exists")
         return None
     channel = guild.get_channel(channel_id)
     if channel is None:
-        await bot.get_cog("Hockey").config.channel_from_id(channel_id).clear()
+        await hockey.config.channel_from_id(channel_id).clear()
+        hockey.subscriptions.remove_channel(channel_id)
         log.info(f"{channel_id} channel was removed because it no longer exists")
         return None
     return channel
@@ -11,17 +11,21 @@ import discord
 import yaml
 from redbot.core import Config, commands
 from redbot.core.i18n import Translator, cog_i18n
-from redbot.core.utils import AsyncIter
+from redbot.core.utils import AsyncIter, bounded_gather
 
+from .api import HockeyAPI, set_client
 from .constants import BASE_URL, CONFIG_ID, CONTENT_URL, HEADSHOT_URL, TEAMS
 from .dev import HockeyDev
 from .errors import InvalidFileError
 from .game import Game
+from .gamefeed import FEED_CONCURRENCY, FeedReplay, GameFeed
 from .gamedaychannels import GameDayChannels
 from .hockey_commands import HockeyCommands
 from .hockeypickems import HockeyPickems
 from .hockeyset import HockeySetCommands
+from .render import RenderCache
 from .standings import Standings
+from .subscriptions import FanOut, SubscriptionIndex
 from .teamentry import TeamEntry
 
 _ = Translator("Hockey", __file__)
@@ -120,8 +124,15 @@ class Hockey(
         self.all_pickems = {}
         self.pickems_loop.start()
         self.current_games = {}
+        self.game_feeds: Dict[str, GameFeed] = {}
+        self.subscriptions = SubscriptionIndex(self.config)
+        self.fan_out = FanOut()
+        self.render_cache = RenderCache()
+        self.feed_replay: Optional[FeedReplay] = None
         self.games_playing = False
         self.session = aiohttp.ClientSession()
+        self.api = HockeyAPI(self.session)
+        set_client(self.api)
         self._ready: asyncio.Event = asyncio.Event()
         # self._ready is used to prevent pickems from opening
         # data from the wrong file location
@@ -142,6 +153,7 @@ class Hockey(
         if self.loop is not None:
             self.loop.cancel()
         self.pickems_loop.cancel()
+        set_client(None)
         self.bot.loop.create_task(self.session.close())
 
     async def red_delete_data_for_user(
@@ -162,6 +174,7 @@ class Hockey(
                 self.bot.add_dev_env_value("hockey", lambda x: self)
             except Exception:
                 pass
+        await self.subscriptions.load()
         self.loop = asyncio.create_task(self.game_check_loop())
         await self.migrate_settings()
 
@@ -253,11 +266,13 @@ class Hockey(
         await self._ready.wait()
         while True:
             try:
-                async with self.session.get(f"{BASE_URL}/api/v1/schedule") as resp:
-                    data = await resp.json()
+                data = await self.api.get_json(f"{BASE_URL}/api/v1/schedule", refresh=True)
             except Exception:
                 log.exception("Error grabbing the schedule for today.")
                 data = {"dates": []}
+            # Rebuild the channel subscriptions once a day in case
+            # anything changed them without going through the index
+            await self.subscriptions.load()
             if data["dates"] != []:
                 self.current_games = {
                     game["link"]: {"count": 0, "game": None}
@@ -271,32 +286,41 @@ class Hockey(
                 # the first preview message to delete old ones
                 await self.check_new_day()
             if self.TEST_LOOP:
-                self.current_games = {
-                    "https://statsapi.web.nhl.com/api/v1/game/2020020474/feed/live": {
-                        "count": 0,
-                        "game": None,
-                    }
-                }
+                if self.feed_replay is None:
+                    self.feed_replay = FeedReplay(Path(__file__).parent / "testgame.json")
+                self.current_games = {self.feed_replay.link: {"count": 0, "game": None}}
             while self.current_games != {}:
                 self.games_playing = True
                 to_delete = []
-                for link in self.current_games:
-                    if not self.TEST_LOOP:
+                feeds = await self.fetch_game_feeds()
+                self.api.live = any(
+                    game["game"] is not None and game["game"].game_state == "Live"
+                    for game in self.current_games.values()
+                )
+                for link, data in feeds.items():
+                    if self.TEST_LOOP:
+                        self.games_playing = False
+                    game = self.current_games[link]["game"]
+                    if data is not None or game is None:
+                        if data is None:
+                            # nothing new but we never managed to build the game
+                            self.game_feeds[link].reset()
+                            continue
                         try:
-                            async with self.session.get(BASE_URL + link) as resp:
-                                data = await resp.json()
+                            game = await Game.from_json(data)
+                            self.current_games[link]["game"] = game
                         except Exception:
-                            log.exception("Error grabbing game data: ")
+                            log.exception("Error creating game object from json.")
+                            self.game_feeds[link].reset()
                             continue
-                    else:
-                        self.games_playing = False
-                        with open(str(__file__)[:-9] + "testgame.json", "r") as infile:
-                            data = json.loads(infile.read())
-                    try:
-                        game = await Game.from_json(data)
-                        self.current_games[link]["game"] = game
-                    except Exception:
-                        log.exception("Error creating game object from json.")
+                        if game.game_state == "Final":
+                            # The standings change as soon as a game ends
+                            self.api.invalidate("/api/v1/standings")
+                    elif game.game_state == "Live":
+                        # Preview and Final still need checking since they
+                        # depend on the time until the game starts and
+                        # how many times we've seen the final state
+                        log.debug("No changes in %s @ %s", game.away_team, game.home_team)
                         continue
                     try:
                         await self.check_new_day()
@@ -327,11 +351,14 @@ class Hockey(
                         to_delete.append(link)
                 for link in to_delete:
                     del self.current_games[link]
+                    self.game_feeds.pop(link, None)
+                    self.render_cache.forget_game(BASE_URL + link)
                 if not self.TEST_LOOP:
                     await asyncio.sleep(60)
                 else:
-                    await asyncio.sleep(10)
+                    await asyncio.sleep(self.feed_replay.interval if self.feed_replay else 10)
             log.debug("Games Done Playing")
+            self.api.live = False
 
             if self.games_playing:
                 await self.config.created_gdc.set(False)
@@ -361,6 +388,39 @@ class Hockey(
 
             await asyncio.sleep(300)
 
+    async def fetch_game_feeds(self) -> Dict[str, Optional[dict]]:
+        """
+        Requests the live feed for all current games at once
+
+        Returns the feed data for each game that has changed since the last
+        poll or `None` for games with nothing new. Games whose feed could not
+        be grabbed are left out.
+        """
+        for link in self.current_games:
+            if link not in self.game_feeds:
+                self.game_feeds[link] = GameFeed(link)
+        if self.TEST_LOOP and self.feed_replay is not None:
+            return {
+                link: self.game_feeds[link].update(self.feed_replay.next_feed())
+                for link in self.current_games
+            }
+        links = list(self.current_games)
+        results = await bounded_gather(
+            *[self.game_feeds[link].poll(self.session) for link in links],
+            return_exceptions=True,
+            limit=FEED_CONCURRENCY,
+        )
+        feeds = {}
+        for link, result in zip(links, results):
+            if isinstance(result, Exception):
+                log.error("Error grabbing game data: ", exc_info=result)
+                continue
+            if result is not None:
+                # Share the new feed with anything else looking at this game
+                self.api.store(BASE_URL + link, result)
+            feeds[link] = result
+        return feeds
+
     async def check_new_day(self) -> None:
         if not await self.config.created_gdc():
             if datetime.now().weekday() == 6:
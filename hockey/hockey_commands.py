@@ -338,8 +338,7 @@ class HockeyCommands(MixinMeta):
         if teams != []:
             for team in teams:
                 url = f"{BASE_URL}/api/v1/teams/{TEAMS[team]['id']}/roster{season_url}"
-                async with self.session.get(url) as resp:
-                    data = await resp.json()
+                data = await self.api.get_json(url)
                 if "roster" in data:
                     for player in data["roster"]:
                         players.append(player["person"]["id"])
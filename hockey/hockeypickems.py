@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import discord
 from discord.ext import tasks
@@ -34,6 +34,32 @@ PICKEMS_MESSAGE = _(
     "{guild_message}"
 )
 
+DEFAULT_LEADERBOARD = {
+    "season": 0,
+    "weekly": 0,
+    "total": 0,
+    "playoffs": 0,
+    "playoffs_weekly": 0,
+    "playoffs_total": 0,
+    "pre-season": 0,
+    "pre-season_weekly": 0,
+    "pre-season_total": 0,
+}
+# The leaderboard keys increased for a correct or wrong pick by game type
+# The above needs to be adjusted when this current season playoffs is finished
+CORRECT_PICK_KEYS = {
+    "P": ("playoffs", "playoffs_weekly", "playoffs_total"),
+    "PR": ("pre-season", "pre-season_weekly", "pre-season_total"),
+    "R": ("season", "total", "weekly"),
+}
+WRONG_PICK_KEYS = {
+    "P": ("playoffs_total",),
+    "PR": ("pre-season_total",),
+    "R": ("total",),
+}
+# How many members are given credits for their correct picks at the same time
+CREDIT_DEPOSIT_CONCURRENCY = 10
+
 
 class HockeyPickems(MixinMeta):
     """
@@ -67,6 +93,9 @@ class HockeyPickems(MixinMeta):
         # we're not spamming the API with the same game over and over
         # this gets cleared and is only used with leaderboard tallying
         self.antispam = {}
+        # (channel_id, message_id) -> (guild_id, game_id) of the pickems
+        # the message belongs to so reactions don't need to search every pickems
+        self.pickems_messages: Dict[Tuple[int, int], Tuple[str, str]] = {}
 
     @commands.Cog.listener()
     async def on_hockey_preview_message(
@@ -82,51 +111,72 @@ class HockeyPickems(MixinMeta):
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
         if payload.guild_id is None:
             return
+        key = (payload.channel_id, payload.message_id)
+        if key not in self.pickems_messages:
+            return
+        guild_id, game_id = self.pickems_messages[key]
+        pickem = self.all_pickems.get(guild_id, {}).get(game_id)
+        if pickem is None:
+            # The pickems was removed without removing its messages
+            del self.pickems_messages[key]
+            return
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
         channel = guild.get_channel(payload.channel_id)
         if not channel:
             return
-        if str(guild.id) not in self.all_pickems:
-            return
         user = guild.get_member(payload.user_id)
         # log.debug(payload.user_id)
         if not user or user.bot:
             return
-        for name, pickem in self.all_pickems[str(guild.id)].items():
-            if f"{channel.id}-{payload.message_id}" in pickem.messages:
-                reply_message = None
-                remove_emoji = None
-                try:
-                    # log.debug(payload.emoji)
-                    log.debug("Adding vote")
-                    pickem.add_vote(user.id, payload.emoji)
-                except UserHasVotedError as team:
-                    log.debug("User has voted already")
-                    remove_emoji = (
-                        pickem.home_emoji
-                        if str(payload.emoji.id) in pickem.away_emoji
-                        else pickem.away_emoji
-                    )
-                    reply_message = _("You have already voted! Changing vote to: {team}").format(
-                        team=team
-                    )
-                except VotingHasEndedError as error_msg:
-                    log.debug("Voting has ended")
-                    remove_emoji = payload.emoji
-                    reply_message = _("Voting has ended! {voted_for}").format(
-                        voted_for=str(error_msg)
-                    )
-                except NotAValidTeamError:
-                    log.debug("Invalid emoji")
-                    remove_emoji = payload.emoji
-                    reply_message = _("Don't clutter the voting message with emojis!")
-                except Exception:
-                    log.exception(f"Error adding vote to {repr(pickem)}")
-                await self.handle_pickems_response(
-                    user, channel, remove_emoji, payload.message_id, reply_message
-                )
+        reply_message = None
+        remove_emoji = None
+        try:
+            # log.debug(payload.emoji)
+            log.debug("Adding vote")
+            pickem.add_vote(user.id, payload.emoji)
+        except UserHasVotedError as team:
+            log.debug("User has voted already")
+            remove_emoji = (
+                pickem.home_emoji
+                if str(payload.emoji.id) in pickem.away_emoji
+                else pickem.away_emoji
+            )
+            reply_message = _("You have already voted! Changing vote to: {team}").format(team=team)
+        except VotingHasEndedError as error_msg:
+            log.debug("Voting has ended")
+            remove_emoji = payload.emoji
+            reply_message = _("Voting has ended! {voted_for}").format(voted_for=str(error_msg))
+        except NotAValidTeamError:
+            log.debug("Invalid emoji")
+            remove_emoji = payload.emoji
+            reply_message = _("Don't clutter the voting message with emojis!")
+        except Exception:
+            log.exception(f"Error adding vote to {repr(pickem)}")
+        await self.handle_pickems_response(
+            user, channel, remove_emoji, payload.message_id, reply_message
+        )
+
+    def add_pickems_messages(self, guild_id: str, game_id: str, messages: List[str]) -> None:
+        """
+        Adds pickems messages to the reverse index used to find
+        which pickems a reaction was added to
+        """
+        for message in messages:
+            try:
+                channel_id, message_id = message.split("-")
+            except ValueError:
+                continue
+            self.pickems_messages[(int(channel_id), int(message_id))] = (guild_id, game_id)
+
+    def remove_pickems_messages(self, messages: List[str]) -> None:
+        for message in messages:
+            try:
+                channel_id, message_id = message.split("-")
+            except ValueError:
+                continue
+            self.pickems_messages.pop((int(channel_id), int(message_id)), None)
 
     async def handle_pickems_response(
         self,
@@ -212,6 +262,8 @@ class HockeyPickems(MixinMeta):
             # pickems = [Pickems.from_json(p) for p in pickems_list]
             pickems = {name: Pickems.from_json(p) for name, p in pickems_list.items()}
             self.all_pickems[str(guild_id)] = pickems
+            for name, pickem in pickems.items():
+                self.add_pickems_messages(str(guild_id), name, pickem.messages)
 
     def pickems_name(self, game: Game) -> str:
         return f"{game.away_abr}@{game.home_abr}-{game.game_start.month}-{game.game_start.day}"
@@ -317,12 +369,16 @@ class HockeyPickems(MixinMeta):
             )
 
             self.all_pickems[str(guild.id)][str(game.game_id)] = pickem
+            self.add_pickems_messages(str(guild.id), str(game.game_id), pickem.messages)
             log.debug("creating new pickems %s", pickems[str(game.game_id)])
             return True
         else:
             self.all_pickems[str(guild.id)][str(game.game_id)].messages.append(
                 f"{channel.id}-{message.id}"
             )
+            self.add_pickems_messages(
+                str(guild.id), str(game.game_id), [f"{channel.id}-{message.id}"]
+            )
             if old_pickem.name != new_name:
                 self.all_pickems[str(guild.id)][str(game.game_id)].name = new_name
             if old_pickem.game_start != game.game_start:
@@ -658,6 +714,12 @@ class HockeyPickems(MixinMeta):
             except Exception:
                 log.exception(f"Error deleting old pickems channels in {repr(guild)}")
 
+    async def deposit_pickems_credits(self, member: discord.Member, amount: int) -> None:
+        try:
+            await bank.deposit_credits(member, amount)
+        except Exception:
+            log.debug("Could not deposit pickems credits for %s", repr(member))
+
     async def tally_guild_leaderboard(self, guild: discord.Guild) -> None:
         """
         Allows individual guilds to tally pickems leaderboard
@@ -683,66 +745,62 @@ class HockeyPickems(MixinMeta):
                 continue
             log.debug("Tallying results for %s", repr(pickems))
             to_remove.append(name)
-            DEFAULT_LEADERBOARD = {
-                "season": 0,
-                "weekly": 0,
-                "total": 0,
-                "playoffs": 0,
-                "playoffs_weekly": 0,
-                "playoffs_total": 0,
-                "pre-season": 0,
-                "pre-season_weekly": 0,
-                "pre-season_total": 0,
-            }
-            async with self.pickems_config.guild(guild).leaderboard() as leaderboard:
-                for user, choice in pickems.votes.items():
-                    if str(user) not in leaderboard:
-                        leaderboard[str(user)] = DEFAULT_LEADERBOARD.copy()
-                    for key, value in DEFAULT_LEADERBOARD.items():
-                        # verify all defaults are in the setting
-                        if key not in leaderboard[str(user)]:
-                            leaderboard[str(user)][key] = value
-
-                    if choice == pickems.winner:
-                        if member := guild.get_member(int(user)):
-                            try:
-                                await bank.deposit_credits(member, int(base_credits))
-                            except Exception:
-                                log.debug("Could not deposit pickems credits for %s", repr(member))
-                        if pickems.game_type == "P":
-                            leaderboard[str(user)]["playoffs"] += 1
-                            leaderboard[str(user)]["playoffs_weekly"] += 1
-                            leaderboard[str(user)]["playoffs_total"] += 1
-                        elif pickems.game_type == "PR":
-                            leaderboard[str(user)]["pre-season"] += 1
-                            leaderboard[str(user)]["pre-season_weekly"] += 1
-                            leaderboard[str(user)]["pre-season_total"] += 1
-                        else:
-                            leaderboard[str(user)]["season"] += 1
-                            leaderboard[str(user)]["total"] += 1
-                            # The above needs to be adjusted when this current season
-                            # playoffs is finished
-                            leaderboard[str(user)]["weekly"] += 1
-                    else:
-                        if pickems.game_type == "P":
-                            leaderboard[str(user)]["playoffs_total"] += 1
-                        elif pickems.game_type == "PR":
-                            leaderboard[str(user)]["pre-season_total"] += 1
-                        else:
-                            leaderboard[str(user)]["total"] += 1
-                        # Weekly reset weekly but we want to track this
-                        # regardless of playoffs and pre-season
-                        # If this causes confusion I can change it later
-                        # leaving this comment so I remember
+        if not to_remove:
+            return
+
+        # Add up every finished game first so the leaderboard
+        # is only written once for the guild
+        results: Dict[str, Dict[str, int]] = {}
+        correct_picks: Dict[str, int] = {}
         for name in to_remove:
-            try:
-                log.debug(f"Removing pickem {name}")
-                del self.all_pickems[str(guild.id)][name]
-                async with self.pickems_config.guild(guild).pickems() as data:
-                    if name in data:
-                        del data[name]
-            except Exception:
-                log.error("Error removing pickems from memory", exc_info=True)
+            pickems = pickems_list[name]
+            correct_keys = CORRECT_PICK_KEYS.get(pickems.game_type, CORRECT_PICK_KEYS["R"])
+            wrong_keys = WRONG_PICK_KEYS.get(pickems.game_type, WRONG_PICK_KEYS["R"])
+            for user, choice in pickems.votes.items():
+                user_results = results.setdefault(str(user), {})
+                if choice == pickems.winner:
+                    correct_picks[str(user)] = correct_picks.get(str(user), 0) + 1
+                    keys = correct_keys
+                else:
+                    # Weekly reset weekly but we want to track this
+                    # regardless of playoffs and pre-season
+                    # If this causes confusion I can change it later
+                    # leaving this comment so I remember
+                    keys = wrong_keys
+                for key in keys:
+                    user_results[key] = user_results.get(key, 0) + 1
+
+        async with self.pickems_config.guild(guild).leaderboard() as leaderboard:
+            for user, user_results in results.items():
+                if user not in leaderboard:
+                    leaderboard[user] = DEFAULT_LEADERBOARD.copy()
+                for key, value in DEFAULT_LEADERBOARD.items():
+                    # verify all defaults are in the setting
+                    if key not in leaderboard[user]:
+                        leaderboard[user][key] = value
+                for key, value in user_results.items():
+                    leaderboard[user][key] += value
+
+        if base_credits:
+            deposits = []
+            for user, correct in correct_picks.items():
+                if member := guild.get_member(int(user)):
+                    deposits.append(
+                        self.deposit_pickems_credits(member, int(base_credits) * correct)
+                    )
+            await bounded_gather(*deposits, limit=CREDIT_DEPOSIT_CONCURRENCY)
+
+        for name in to_remove:
+            log.debug(f"Removing pickem {name}")
+            pickem = self.all_pickems[str(guild.id)].pop(name, None)
+            if pickem is not None:
+                self.remove_pickems_messages(pickem.messages)
+        try:
+            async with self.pickems_config.guild(guild).pickems() as data:
+                for name in to_remove:
+                    data.pop(name, None)
+        except Exception:
+            log.error("Error removing pickems from memory", exc_info=True)
 
     async def tally_leaderboard(self) -> None:
         """
@@ -1115,10 +1173,9 @@ class HockeyPickems(MixinMeta):
         """
         if true_or_false:
             await self.pickems_config.guild(ctx.guild).pickems.clear()
-            try:
-                del self.all_pickems[str(ctx.guild.id)]
-            except KeyError:
-                pass
+            pickems = self.all_pickems.pop(str(ctx.guild.id), {})
+            for pickem in pickems.values():
+                self.remove_pickems_messages(pickem.messages)
             await ctx.send(_("All pickems removed on this server."))
         else:
             await ctx.send(_("I will not remove the current pickems on this server."))
@@ -385,6 +385,7 @@ class HockeySetCommands(MixinMeta):
             )
             return await ctx.maybe_send_embed(reply)
         await self.config.channel(channel).goal_notifications.set(on_off)
+        await self.subscriptions.refresh_channel(channel.id)
         if on_off:
             reply = _("__Goal Notifications:__ **On**\n\n")
             reply += await self.check_notification_settings(ctx.guild)
@@ -429,6 +430,7 @@ class HockeySetCommands(MixinMeta):
             )
             return await ctx.maybe_send_embed(reply)
         await self.config.channel(channel).game_state_notifications.set(on_off)
+        await self.subscriptions.refresh_channel(channel.id)
         if on_off:
             reply = _("__Game State Notifications:__ **On**\n\n")
             reply += await self.check_notification_settings(ctx.guild)
@@ -533,6 +535,7 @@ class HockeySetCommands(MixinMeta):
         `periodrecap` is a recap of the period at the intermission.
         """
         await self.config.channel(channel).game_states.set(list(set(state)))
+        await self.subscriptions.refresh_channel(channel.id)
         await ctx.send(
             _("{channel} game updates set to {states}").format(
                 channel=channel.mention, states=humanize_list(list(set(state)))
@@ -573,6 +576,7 @@ class HockeySetCommands(MixinMeta):
                 _("The designated channel is not a news channel that I can publish in.")
             )
         await self.config.channel(channel).publish_states.set(list(set(state)))
+        await self.subscriptions.refresh_channel(channel.id)
         await ctx.send(
             _("{channel} game updates set to publish {states}").format(
                 channel=channel.mention, states=humanize_list(list(set(state)))
@@ -615,6 +619,7 @@ class HockeySetCommands(MixinMeta):
         else:
             cur_teams.append(team)
             await self.config.channel(channel).team.set(cur_teams)
+            await self.subscriptions.refresh_channel(channel.id)
         await ctx.send(
             _("{team} goals will be posted in {channel}").format(
                 team=team, channel=channel.mention
@@ -644,6 +649,7 @@ class HockeySetCommands(MixinMeta):
             return
         if team is None:
             await self.config.channel(channel).clear()
+            await self.subscriptions.refresh_channel(channel.id)
             await ctx.send(
                 _("No game updates will be posted in {channel}.").format(channel=channel.mention)
             )
@@ -654,6 +660,7 @@ class HockeySetCommands(MixinMeta):
                 cur_teams.remove(team)
                 if cur_teams == []:
                     await self.config.channel(channel).clear()
+                    await self.subscriptions.refresh_channel(channel.id)
                     await ctx.send(
                         _("No game updates will be posted in {channel}.").format(
                             channel=channel.mention
@@ -661,6 +668,7 @@ class HockeySetCommands(MixinMeta):
                     )
                 else:
                     await self.config.channel(channel).team.set(cur_teams)
+                    await self.subscriptions.refresh_channel(channel.id)
                     await ctx.send(
                         _("{team} goal updates removed from {channel}.").format(
                             team=team, channel=channel.mention
@@ -11,6 +11,7 @@ from redbot.core.i18n import Translator
 from redbot.core.utils.chat_formatting import box
 from tabulate import tabulate
 
+from .api import get_json
 from .constants import BASE_URL, HEADSHOT_URL, TEAMS
 
 _ = Translator("Hockey", __file__)
@@ -317,13 +318,7 @@ class Player:
         url = f"https://statsapi.web.nhl.com/api/v1/people/{self.id}/stats?stats=yearByYear"
         log.debug(url)
         log.debug(season)
-        if session is None:
-            async with aiohttp.ClientSession() as new_session:
-                async with new_session.get(url) as resp:
-                    data = await resp.json()
-        else:
-            async with session.get(url) as resp:
-                data = await resp.json()
+        data = await get_json(url, session)
         for seasons in reversed(data["stats"][0]["splits"]):
             if seasons["league"].get("id", None) != 133:
                 continue
@@ -361,13 +356,7 @@ class Player:
     @classmethod
     async def from_id(cls, player_id: int, session: Optional[aiohttp.ClientSession] = None) -> Player:
         url = f"https://records.nhl.com/site/api/player/{player_id}"
-        if session is None:
-            async with aiohttp.ClientSession() as new_session:
-                async with new_session.get(url) as resp:
-                    data = await resp.json()
-        else:
-            async with session.get(url) as resp:
-                data = await resp.json()
+        data = await get_json(url, session)
         return cls(*data["data"][0].values())
 
 
@@ -416,13 +405,7 @@ class Skater(Player):
         )
         log.debug(url)
         log.debug(season)
-        if session is None:
-            async with aiohttp.ClientSession() as new_session:
-                async with new_session.get(url) as resp:
-                    data = await resp.json()
-        else:
-            async with session.get(url) as resp:
-                data = await resp.json()
+        data = await get_json(url, session)
         for seasons in reversed(data["stats"][0]["splits"]):
             stats_season = seasons["season"]
             if season in [stats_season, None]:
@@ -629,13 +612,7 @@ class Goalie(Player):
         )
         log.debug(url)
         log.debug(season)
-        if session is None:
-            async with aiohttp.ClientSession() as new_session:
-                async with new_session.get(url) as resp:
-                    data = await resp.json()
-        else:
-            async with session.get(url) as resp:
-                data = await resp.json()
+        data = await get_json(url, session)
         for seasons in reversed(data["stats"][0]["splits"]):
             stats_season = seasons["season"]
             if season in [stats_season, None]:
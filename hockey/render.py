@@ -0,0 +1,140 @@
+import inspect
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import discord
+from redbot import VersionInfo, version_info
+from redbot.core.bot import Red
+
+from .helper import get_channel_obj, get_goal_role, get_team_role
+from .subscriptions import Subscriber
+
+log = logging.getLogger("red.trusty-cogs.Hockey")
+
+MAX_RENDERED = 256
+
+if version_info >= VersionInfo.from_str("3.4.0"):
+    MENTION_ROLES = {"allowed_mentions": discord.AllowedMentions(roles=True)}
+    NO_ROLE_MENTIONS = {"allowed_mentions": discord.AllowedMentions(roles=False)}
+else:
+    MENTION_ROLES = {}
+    NO_ROLE_MENTIONS = {}
+
+# (game link, event, variant)
+RenderKey = Tuple[str, Hashable, Hashable]
+
+
+class RenderCache:
+    """
+    Embeds and message text rendered for game events
+
+    Each event is rendered once per variant, such as the embed, the text
+    only version or the text with a particular set of role mentions, and
+    reused for every channel it's posted or edited in. Entries are
+    rendered again when the event's version changes. Cached embeds are
+    shared so they must not be modified after rendering.
+    """
+
+    def __init__(self, max_size: int = MAX_RENDERED):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._rendered: "OrderedDict[RenderKey, Tuple[Hashable, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._rendered)
+
+    def __repr__(self):
+        return "<RenderCache rendered={} hits={} misses={}>".format(
+            len(self._rendered), self.hits, self.misses
+        )
+
+    async def get(self, key: RenderKey, version: Hashable, render: Callable[[], Any]) -> Any:
+        """
+        Returns the rendered `key` calling `render` if it hasn't been
+        rendered yet or was rendered for a different `version`
+        """
+        cached = self._rendered.get(key)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        rendered = render()
+        if inspect.isawaitable(rendered):
+            rendered = await rendered
+        self._rendered[key] = (version, rendered)
+        self._rendered.move_to_end(key)
+        while len(self._rendered) > self.max_size:
+            self._rendered.popitem(last=False)
+        return rendered
+
+    def forget_game(self, link: str) -> None:
+        for key in [key for key in self._rendered if key[0] == link]:
+            del self._rendered[key]
+
+
+class GuildPost:
+    """
+    A guild's settings and roles resolved once for everything posted about an event
+    """
+
+    __slots__ = ("guild", "settings", "game_day_channels", "_goal_roles", "_team_roles")
+
+    def __init__(self, guild: discord.Guild, settings: dict):
+        self.guild = guild
+        self.settings = settings
+        self.game_day_channels = frozenset(settings.get("gdc") or [])
+        self._goal_roles: Dict[str, Optional[discord.Role]] = {}
+        self._team_roles: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def __repr__(self):
+        return "<GuildPost guild={}>".format(self.guild.id)
+
+    def goal_role(self, team_name: str) -> Optional[discord.Role]:
+        if team_name not in self._goal_roles:
+            self._goal_roles[team_name] = get_goal_role(self.guild, team_name)
+        return self._goal_roles[team_name]
+
+    async def team_roles(self, home_team: str, away_team: str) -> Tuple[str, str]:
+        """The home and away role mentions or team names if the roles don't exist"""
+        key = (home_team, away_team)
+        if key not in self._team_roles:
+            self._team_roles[key] = await get_team_role(self.guild, home_team, away_team)
+        return self._team_roles[key]
+
+
+async def resolve_guilds(bot: Red, guilds: Iterable[discord.Guild]) -> Dict[int, GuildPost]:
+    """
+    Reads the settings for every guild at once
+    """
+    config = bot.get_cog("Hockey").config
+    all_guilds = await config.all_guilds()
+    posts = {}
+    for guild in guilds:
+        if guild.id in posts:
+            continue
+        settings = all_guilds.get(guild.id)
+        if settings is None:
+            settings = await config.guild(guild).all()
+        posts[guild.id] = GuildPost(guild, settings)
+    return posts
+
+
+async def resolve_targets(
+    bot: Red, subscribers: Iterable[Subscriber]
+) -> List[Tuple[discord.TextChannel, GuildPost, dict]]:
+    """
+    Finds the channel, guild settings and channel settings for every subscriber
+    before anything is posted
+    """
+    channels = []
+    for subscriber in subscribers:
+        channel = await get_channel_obj(bot, subscriber.channel_id, subscriber.settings)
+        if not channel:
+            continue
+        channels.append((channel, subscriber.settings))
+    if not channels:
+        return []
+    posts = await resolve_guilds(bot, [channel.guild for channel, _settings in channels])
+    return [(channel, posts[channel.guild.id], settings) for channel, settings in channels]
@@ -9,6 +9,7 @@ from redbot import VersionInfo, version_info
 from redbot.core import Config
 from redbot.core.utils import AsyncIter
 
+from .api import get_json
 from .constants import BASE_URL, TEAMS
 
 log = logging.getLogger("red.trusty-cogs.Hockey")
@@ -101,13 +102,7 @@ class Standings:
         returns a list of standings objects and the location of the given
         style in the list
         """
-        if session is None:
-            async with aiohttp.ClientSession() as new_session:
-                async with new_session.get(BASE_URL + "/api/v1/standings") as resp:
-                    data = await resp.json()
-        else:
-            async with session.get(BASE_URL + "/api/v1/standings") as resp:
-                data = await resp.json()
+        data = await get_json(BASE_URL + "/api/v1/standings", session)
         return await Standings.get_team_standings_from_data(style, data)
 
     @staticmethod
@@ -175,8 +170,7 @@ class Standings:
         """
         log.debug("Updating Standings.")
         config = bot.get_cog("Hockey").config
-        async with bot.get_cog("Hockey").session.get(BASE_URL + "/api/v1/standings") as resp:
-            standings_data = await resp.json()
+        standings_data = await bot.get_cog("Hockey").api.get_json(BASE_URL + "/api/v1/standings")
 
         all_guilds = await config.all_guilds()
         async for guild_id, data in AsyncIter(all_guilds.items(), steps=100):
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from typing import Awaitable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from redbot.core import Config
+
+log = logging.getLogger("red.trusty-cogs.Hockey")
+
+# How many messages are sent at the same time when posting to every channel
+FANOUT_CONCURRENCY = 20
+# Discord allows 50 requests per second globally, leave room for everything else
+FANOUT_RATE = 40
+
+
+class Subscriber(NamedTuple):
+    channel_id: int
+    guild_id: Optional[int]
+    settings: dict
+
+
+class SubscriptionIndex:
+    """
+    In memory index of which channels want updates for which teams and game states
+
+    This is built from config once and kept up to date as channels are
+    added, changed or removed so finding the channels to post a goal or
+    game state in only looks at the channels subscribed to it.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.channels: Dict[int, dict] = {}
+        self._index: Dict[Tuple[str, str], Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def __repr__(self):
+        return "<SubscriptionIndex channels={} keys={}>".format(
+            len(self.channels), len(self._index)
+        )
+
+    async def load(self) -> None:
+        self.channels = {}
+        self._index = {}
+        for channel_id, data in (await self.config.all_channels()).items():
+            self._add(channel_id, data)
+
+    def _add(self, channel_id: int, data: dict) -> None:
+        teams = data.get("team") or []
+        if not teams:
+            return
+        self.channels[channel_id] = data
+        for team in teams:
+            for state in data.get("game_states", []):
+                self._index.setdefault((team, state), set()).add(channel_id)
+
+    def remove_channel(self, channel_id: int) -> None:
+        data = self.channels.pop(channel_id, None)
+        if data is None:
+            return
+        for team in data.get("team") or []:
+            for state in data.get("game_states", []):
+                channels = self._index.get((team, state))
+                if channels is None:
+                    continue
+                channels.discard(channel_id)
+                if not channels:
+                    del self._index[(team, state)]
+
+    async def refresh_channel(self, channel_id: int) -> None:
+        """Reload a channels settings after they have been changed in config"""
+        self.remove_channel(channel_id)
+        self._add(channel_id, await self.config.channel_from_id(channel_id).all())
+
+    def subscribers(self, teams: Iterable[str], state: str) -> List[Subscriber]:
+        """
+        Returns every channel following any of `teams` which wants `state` updates
+        """
+        channel_ids: Set[int] = set()
+        for team in teams:
+            channel_ids.update(self._index.get((team, state), ()))
+        return [
+            Subscriber(
+                channel_id, self.channels[channel_id].get("guild_id"), self.channels[channel_id]
+            )
+            for channel_id in channel_ids
+        ]
+
+
+class FanOut:
+    """
+    Runs sends to many channels at once while staying under Discord's global rate limit
+
+    At most `limit` sends run at the same time and new sends are
+    started no faster than `rate` per second. This is shared between
+    every game so several games posting at once are paced together.
+    """
+
+    def __init__(self, limit: int = FANOUT_CONCURRENCY, rate: float = FANOUT_RATE):
+        self._semaphore = asyncio.Semaphore(limit)
+        self._interval = 1 / rate
+        self._next_start = 0.0
+
+    async def _wait_turn(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_start)
+        self._next_start = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _run(self, coro: Awaitable):
+        async with self._semaphore:
+            await self._wait_turn()
+            return await coro
+
+    async def gather(self, coros: Iterable[Awaitable]) -> list:
+        """Runs every coroutine returning their results or exceptions in order"""
+        return await asyncio.gather(*[self._run(coro) for coro in coros], return_exceptions=True)
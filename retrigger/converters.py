@@ -1,6 +1,7 @@
 import asyncio
 import logging
-from typing import List, Pattern, Tuple, Union, Optional, Literal
+from enum import IntFlag
+from typing import List, Pattern, Set, Tuple, Union, Optional, Literal
 
 import discord
 from discord.ext.commands.converter import Converter, IDConverter, RoleConverter
@@ -120,6 +121,41 @@ class MultiResponse(Converter):
         return result
 
 
+class ResponseFlags(IntFlag):
+    """
+    Flags for every response type so a triggers responses can be
+    checked without searching the response_type list
+    """
+
+    NONE = 0
+    DM = 1 << 0
+    DMME = 1 << 1
+    REMOVE_ROLE = 1 << 2
+    ADD_ROLE = 1 << 3
+    BAN = 1 << 4
+    KICK = 1 << 5
+    TEXT = 1 << 6
+    DELETE = 1 << 7
+    PUBLISH = 1 << 8
+    REACT = 1 << 9
+    RENAME = 1 << 10
+    COMMAND = 1 << 11
+    MOCK = 1 << 12
+    RANDTEXT = 1 << 13
+    IMAGE = 1 << 14
+    RANDIMAGE = 1 << 15
+    RESIZE = 1 << 16
+    ROLES = ADD_ROLE | REMOVE_ROLE
+    AUTO_MOD = DELETE | KICK | BAN | ADD_ROLE | REMOVE_ROLE
+
+    @classmethod
+    def from_response_type(cls, response_type: List[str]) -> "ResponseFlags":
+        flags = cls.NONE
+        for response in response_type:
+            flags |= cls.__members__.get(response.upper(), cls.NONE)
+        return flags
+
+
 class Trigger:
     """
     Trigger class to handle trigger objects
@@ -144,6 +180,7 @@ class Trigger:
             "mock",
         ]
     ]
+    response_flags: ResponseFlags
     author: int
     count: int
     image: Union[List[Union[int, str]], str, None]
@@ -173,14 +210,19 @@ class Trigger:
         except Exception:
             raise
         self.response_type = response_type
+        self.response_flags = ResponseFlags.from_response_type(response_type)
         self.author = author
-        self.enabled = kwargs.get("enabled", True)
-        self.count = kwargs.get("count", 0)
+        # count and enabled change outside of commands so they're tracked
+        # to let the save loop only write what has changed
+        self._dirty: Set[str] = set()
+        self._enabled = kwargs.get("enabled", True)
+        self._count = kwargs.get("count", 0)
         self.image = kwargs.get("image", None)
         self.text = kwargs.get("text", None)
         self.whitelist = kwargs.get("whitelist", [])
         self.blacklist = kwargs.get("blacklist", [])
-        self.cooldown = kwargs.get("cooldown", {})
+        # the last time this trigger ran is tracked by the cogs cooldown store
+        self.cooldown = {k: v for k, v in kwargs.get("cooldown", {}).items() if k != "last"}
         self.multi_payload = kwargs.get("multi_payload", [])
         self.created_at = kwargs.get("created_at", 0)
         self.ignore_commands = kwargs.get("ignore_commands", False)
@@ -196,6 +238,38 @@ class Trigger:
         self.everyone_mention = kwargs.get("everyone_mention", False)
         self.nsfw = kwargs.get("nsfw", False)
 
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        if value != self._enabled:
+            self._dirty.add("enabled")
+        self._enabled = value
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @count.setter
+    def count(self, value: int) -> None:
+        if value != self._count:
+            self._dirty.add("count")
+        self._count = value
+
+    @property
+    def dirty(self) -> bool:
+        """Whether this trigger has changes that haven't been saved"""
+        return bool(self._dirty)
+
+    def dirty_json(self) -> dict:
+        """Returns only the fields that have changed since the last save"""
+        return {field: getattr(self, field) for field in self._dirty}
+
+    def mark_clean(self) -> None:
+        self._dirty.clear()
+
     def enable(self):
         """Explicitly enable this trigger"""
         self.enabled = True
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Upper bound on how many snowflakes a single trigger will remember.
+# Entries normally expire with the cooldown time, this only limits
+# memory when a very large number of members trigger within that window.
+MAX_COOLDOWN_ENTRIES = 100000
+
+
+class CooldownStore:
+    """
+    Tracks the last time a trigger ran for each guild, channel, or member id.
+
+    Entries are kept in the order they were last updated so expired ones
+    can be dropped from the front in O(expired) and lookups are a single
+    dict access.
+    """
+
+    __slots__ = ("ttl", "max_size", "dirty", "_last")
+
+    def __init__(self, ttl: float, max_size: Optional[int] = MAX_COOLDOWN_ENTRIES):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.dirty = False
+        self._last: "OrderedDict[int, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def __repr__(self):
+        return "<CooldownStore ttl={0.ttl} max_size={0.max_size} size={1}>".format(
+            self, len(self._last)
+        )
+
+    def on_cooldown(self, snowflake_id: int, now: float) -> bool:
+        """
+        Returns True if `snowflake_id` is still on cooldown
+        otherwise records `now` as the last time it ran and returns False.
+        """
+        last = self._last.get(snowflake_id)
+        if last is not None:
+            if (now - last) <= self.ttl:
+                return True
+            self._last.move_to_end(snowflake_id)
+        self._last[snowflake_id] = now
+        self.dirty = True
+        self.expire(now)
+        return False
+
+    def expire(self, now: float) -> None:
+        """Drop every expired entry and anything over the size limit"""
+        while self._last:
+            snowflake_id, last = next(iter(self._last.items()))
+            if (now - last) <= self.ttl and (
+                self.max_size is None or len(self._last) <= self.max_size
+            ):
+                break
+            self._last.popitem(last=False)
+
+    def snapshot(self, now: float) -> Dict[str, int]:
+        """A compact copy of the entries still on cooldown suitable for Config"""
+        self.expire(now)
+        return {str(k): int(v) for k, v in self._last.items()}
+
+    @classmethod
+    def from_snapshot(
+        cls, ttl: float, data: Dict[str, float], now: float, **kwargs
+    ) -> "CooldownStore":
+        store = cls(ttl, **kwargs)
+        for snowflake_id, last in sorted(data.items(), key=lambda x: x[1]):
+            store._last[int(snowflake_id)] = last
+        store.expire(now)
+        return store
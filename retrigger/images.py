@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import math
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    pass
+
+log = logging.getLogger("red.trusty-cogs.ReTrigger")
+
+# The smallest size resize triggers scale images to, each extra
+# matched character adds this many pixels to the longest side.
+RESIZE_STEP = 16
+# Sizes generated when an image for a resize trigger is first saved.
+PRECOMPUTE_SIZES = range(1, 11)
+
+
+class ResizeCache:
+    """
+    Cache of the encoded output of resize triggers keyed by (file, size)
+
+    Recently used variants are kept in memory up to `max_bytes` and every
+    variant is also written to a `resized` folder next to the original image
+    so evicted or previously generated variants only need to be read from
+    disk rather than resized again.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._memory: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+        self._dimensions: Dict[str, Tuple[int, int]] = {}
+
+    def __repr__(self):
+        return "<ResizeCache variants={} bytes={}>".format(len(self._memory), self.current_bytes)
+
+    @staticmethod
+    def variant_path(path: str, size: int) -> Path:
+        original = Path(path)
+        suffix = ".gif" if original.suffix.lower() == ".gif" else ".png"
+        return original.parent / "resized" / f"{original.stem}-{size}{suffix}"
+
+    async def clamp(self, path: str, size: int) -> int:
+        """
+        Returns the size the image will actually be resized to
+
+        Images are never scaled up so every size larger than the image
+        itself produces the same output and is cached as one variant.
+        """
+        size = max(size, 1)
+        if path not in self._dimensions:
+            loop = asyncio.get_running_loop()
+            self._dimensions[path] = await loop.run_in_executor(None, self._read_size, path)
+        largest = max(self._dimensions[path])
+        return min(size, max(math.ceil(largest / RESIZE_STEP), 1))
+
+    async def get(self, path: str, size: int) -> Optional[bytes]:
+        key = (path, size)
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            return data
+        variant = self.variant_path(path, size)
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self._read_variant, variant)
+        if data is not None:
+            self._remember(key, data)
+        return data
+
+    async def set(self, path: str, size: int, data: bytes) -> None:
+        variant = self.variant_path(path, size)
+        self._remember((path, size), data)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_variant, variant, data)
+
+    @staticmethod
+    def _read_size(path: str) -> Tuple[int, int]:
+        with Image.open(path) as im:
+            return im.size
+
+    @staticmethod
+    def _read_variant(variant: Path) -> Optional[bytes]:
+        if not variant.is_file():
+            return None
+        return variant.read_bytes()
+
+    @staticmethod
+    def _write_variant(variant: Path, data: bytes) -> None:
+        try:
+            variant.parent.mkdir(exist_ok=True, parents=True)
+            variant.write_bytes(data)
+        except OSError:
+            log.error("Error saving resized image %s", variant, exc_info=True)
+
+    def _remember(self, key: Tuple[str, int], data: bytes) -> None:
+        if key in self._memory:
+            self.current_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self.current_bytes += len(data)
+        while self.current_bytes > self.max_bytes and len(self._memory) > 1:
+            _key, evicted = self._memory.popitem(last=False)
+            self.current_bytes -= len(evicted)
+
+    async def remove(self, path: str) -> None:
+        """Forget every variant of an image that has been deleted"""
+        self._dimensions.pop(path, None)
+        for key in [k for k in self._memory if k[0] == path]:
+            self.current_bytes -= len(self._memory.pop(key))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._remove_variants, path)
+
+    @staticmethod
+    def _remove_variants(path: str) -> None:
+        original = Path(path)
+        folder = original.parent / "resized"
+        if not folder.is_dir():
+            return
+        for variant in folder.glob(f"{original.stem}-*"):
+            try:
+                variant.unlink()
+            except OSError:
+                log.error("Error deleting resized image %s", variant, exc_info=True)
@@ -0,0 +1,209 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    # Python < 3.11
+    import sre_parse
+
+try:
+    import regex as re
+except ImportError:
+    import re
+
+from .converters import Trigger
+
+# Syntax only understood by the regex module which the stdlib parser would
+# misread as plain literals (fuzzy matching and posix classes).
+# Patterns containing these are always searched.
+UNSAFE_SYNTAX = re.compile(r"\{[^}]*[eisd][^}]*\}|\[:")
+
+# characters the regex engines will match case-insensitively to an ASCII letter
+# but which do not casefold to that letter
+CASEFOLD_FIXES = str.maketrans({"ı": "i", "ſ": "s", "K": "k"})
+
+REPEATS = tuple(
+    getattr(sre_parse, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+
+
+def normalize(content: str) -> str:
+    """Normalize message content the same way literals are normalized"""
+    return content.casefold().translate(CASEFOLD_FIXES)
+
+
+def _required(pattern: sre_parse.SubPattern) -> Optional[List[str]]:
+    """
+    Find the best set of literals one of which must appear for `pattern` to match.
+
+    Only ASCII literals are collected and they are lowercased so that one search
+    over normalized content covers both case sensitive and insensitive patterns.
+    Returns None when no requirement could be determined.
+    """
+    candidates: List[List[str]] = []
+    run = ""
+    for op, av in pattern:
+        if op is sre_parse.LITERAL and av < 128:
+            run += chr(av).lower()
+            continue
+        if run:
+            candidates.append([run])
+            run = ""
+        if op is sre_parse.SUBPATTERN:
+            found = _required(av[-1])
+        elif op in REPEATS and av[0] >= 1:
+            found = _required(av[2])
+        elif op is sre_parse.BRANCH:
+            found = []
+            for branch in av[1]:
+                branch_required = _required(branch)
+                if not branch_required:
+                    found = None
+                    break
+                found.extend(branch_required)
+        else:
+            found = None
+        if found:
+            candidates.append(found)
+    if run:
+        candidates.append([run])
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: (min(len(s) for s in c), -len(c)))
+
+
+def required_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Returns a list of lowercase literals at least one of which must be
+    found in normalized content for `pattern` to possibly match.
+
+    None means the pattern could not be analysed and must always be searched.
+    """
+    if UNSAFE_SYNTAX.search(pattern):
+        return None
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        # regex module specific syntax or anything else we don't understand
+        return None
+    return _required(parsed)
+
+
+class TriggerMatcher:
+    """
+    Per guild index of triggers used to decide which triggers a message
+    could possibly run before any regex is searched.
+
+    Every trigger is assigned a bit based on its position in the guilds
+    trigger list so sets of triggers are plain integers and narrowing
+    them down for a message is a handful of bitwise operations.
+
+    Required literals are pulled out of every triggers regex and compiled
+    into a single Aho-Corasick automaton so a message is scanned once
+    to find which triggers could possibly match. The allowlist and blocklist
+    of every trigger are inverted into maps of channel, category, role, and
+    user id to the triggers that allow or deny it.
+    """
+
+    def __init__(self, triggers: Iterable[Trigger]):
+        self.triggers: List[Trigger] = list(triggers)
+        self.all: int = (1 << len(self.triggers)) - 1
+        self.always: int = 0
+        self.allowlisted: int = 0
+        self.allow: Dict[int, int] = {}
+        self.deny: Dict[int, int] = {}
+        self.nsfw: int = 0
+        self.check_edits: int = 0
+        self.ignore_commands: int = 0
+        self.ocr_search: int = 0
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+        for bit, trigger in enumerate(self.triggers):
+            flag = 1 << bit
+            if trigger.whitelist:
+                self.allowlisted |= flag
+                for snowflake_id in trigger.whitelist:
+                    self.allow[snowflake_id] = self.allow.get(snowflake_id, 0) | flag
+            else:
+                for snowflake_id in trigger.blacklist:
+                    self.deny[snowflake_id] = self.deny.get(snowflake_id, 0) | flag
+            if trigger.check_edits:
+                self.check_edits |= flag
+            if trigger.nsfw:
+                self.nsfw |= flag
+            if trigger.ignore_commands:
+                self.ignore_commands |= flag
+            if trigger.ocr_search:
+                self.ocr_search |= flag
+            literals = required_literals(trigger.regex.pattern)
+            if not literals:
+                self.always |= flag
+                continue
+            for literal in literals:
+                self._add(literal, flag)
+        self._build()
+
+    def __repr__(self):
+        return "<TriggerMatcher triggers={} states={}>".format(len(self.triggers), len(self._goto))
+
+    def _add(self, literal: str, flag: int) -> None:
+        state = 0
+        for char in literal:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+            state = nxt
+        self._out[state] |= flag
+
+    def _build(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def candidates(self, content: str) -> int:
+        """
+        Returns the triggers that could match `content`
+        """
+        found = self.always
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        for char in normalize(content):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= out[state]
+        return found
+
+    def allowed(self, snowflake_ids: Iterable[int]) -> int:
+        """
+        Returns the triggers allowed to run for the given channel, category,
+        author, and role ids based on each triggers allowlist or blocklist
+        """
+        allow = 0
+        deny = 0
+        for snowflake_id in snowflake_ids:
+            allow |= self.allow.get(snowflake_id, 0)
+            deny |= self.deny.get(snowflake_id, 0)
+        return (self.all & ~self.allowlisted & ~deny) | (self.allowlisted & allow)
+
+    def iter_triggers(self, triggers: int) -> Iterator[Trigger]:
+        """Yields the triggers in `triggers` in the order they were added"""
+        while triggers:
+            lowest = triggers & -triggers
+            yield self.triggers[lowest.bit_length() - 1]
+            triggers ^= lowest
@@ -445,9 +445,9 @@ class ReTriggerMenu(menus.MenuPages, inherit_buttons=False):
                     await self.message.edit(
                         content=_("This trigger has been deleted."), embed=kwargs["embed"]
                     )
-                    for t in self.cog.triggers[self.ctx.guild.id]:
-                        if t.name == self.source.selection.name:
-                            self.cog.triggers[self.ctx.guild.id].remove(t)
+                    await self.cog.remove_trigger_from_cache(
+                        self.ctx.guild.id, self.source.selection
+                    )
 
 
 class BaseMenu(menus.MenuPages, inherit_buttons=False):
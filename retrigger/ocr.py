@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Optional, Pattern, Tuple
+
+import aiohttp
+import discord
+
+try:
+    from PIL import Image
+
+    import pytesseract
+
+    ALLOW_OCR = True
+except ImportError:
+    ALLOW_OCR = False
+
+try:
+    import regex as re
+except ImportError:
+    import re
+
+log = logging.getLogger("red.trusty-cogs.ReTrigger")
+
+IMAGE_REGEX: Pattern = re.compile(
+    r"(?:(?:https?):\/\/)?[\w\/\-?=%.]+\.(?:png|jpg|jpeg)+", flags=re.I
+)
+
+# Images larger than this on either side are downscaled before OCR,
+# anything bigger mostly just costs tesseract time.
+MAX_OCR_SIZE = (1600, 1600)
+MAX_IMAGE_BYTES = 8 * 1000 * 1000
+
+
+class TTLCache:
+    """
+    Small LRU cache where entries also expire after `ttl` seconds
+    """
+
+    __slots__ = ("max_size", "ttl", "_data")
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        added, value = item
+        if (time.monotonic() - added) > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+
+class OCRService:
+    """
+    Runs OCR on message images for triggers with `ocr_search` enabled
+
+    OCR runs in a dedicated, bounded thread pool so it can't starve the
+    default executor. Results are cached both by image url and by the hash
+    of the image itself so a reposted image is only processed once.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_workers: int = 2,
+        cache_size: int = 512,
+        ttl: float = 3600,
+        timeout: float = 5,
+    ):
+        self.session = session
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="retrigger-ocr")
+        self.url_cache = TTLCache(cache_size, ttl)
+        self.hash_cache = TTLCache(cache_size, ttl)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+    @staticmethod
+    def _image_to_string(data: bytes) -> str:
+        with Image.open(BytesIO(data)) as im:
+            if im.width > MAX_OCR_SIZE[0] or im.height > MAX_OCR_SIZE[1]:
+                im.thumbnail(MAX_OCR_SIZE)
+            return pytesseract.image_to_string(im.convert("L"))
+
+    async def _read_url(self, url: str) -> Optional[bytes]:
+        async with self.session.get(url) as resp:
+            if resp.status != 200:
+                return None
+            if (resp.content_length or 0) > MAX_IMAGE_BYTES:
+                return None
+            return await resp.read()
+
+    async def image_text(self, url: str, attachment: Optional[discord.Attachment] = None) -> str:
+        """Returns the text in a single image, from cache where possible"""
+        text = self.url_cache.get(url)
+        if text is not None:
+            return text
+        try:
+            if attachment is not None:
+                if attachment.size > MAX_IMAGE_BYTES:
+                    return ""
+                data = await attachment.read()
+            else:
+                data = await self._read_url(url)
+        except Exception:
+            log.debug("Error downloading image for OCR %s", url, exc_info=True)
+            return ""
+        if not data:
+            return ""
+        digest = hashlib.sha1(data).digest()
+        text = self.hash_cache.get(digest)
+        if text is None:
+            loop = asyncio.get_running_loop()
+            task = loop.run_in_executor(self.executor, self._image_to_string, data)
+            try:
+                text = await asyncio.wait_for(task, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                return ""
+            except Exception:
+                log.debug("Error running OCR on %s", url, exc_info=True)
+                text = ""
+            self.hash_cache.set(digest, text)
+        self.url_cache.set(url, text)
+        return text
+
+    async def get_image_text(self, message: discord.Message) -> str:
+        """
+        Returns the text found in every attachment and image link on the message
+        """
+        tasks = [self.image_text(a.url, a) for a in message.attachments]
+        tasks += [self.image_text(link) for link in IMAGE_REGEX.findall(message.content)]
+        if not tasks:
+            return " "
+        return " " + "".join(await asyncio.gather(*tasks))
@@ -1,9 +1,12 @@
 import asyncio
+import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import Optional, Union
 
+import aiohttp
 import discord
 from discord.ext import tasks
 from redbot.core import Config, VersionInfo, checks, commands, modlog, version_info
@@ -23,7 +26,9 @@ from .converters import (
     ValidEmoji,
     ValidRegex,
 )
+from .images import ResizeCache
 from .menus import BaseMenu, ExplainReTriggerPages, ReTriggerMenu, ReTriggerPages
+from .ocr import OCRService
 from .triggerhandler import TriggerHandler
 
 log = logging.getLogger("red.trusty-cogs.ReTrigger")
@@ -46,7 +51,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
     """
 
     __author__ = ["TrustyJAID"]
-    __version__ = "2.21.1"
+    __version__ = "2.22.0"
 
     def __init__(self, bot):
         self.bot = bot
@@ -61,13 +66,28 @@ class ReTrigger(TriggerHandler, commands.Cog):
             "remove_role_logs": False,
             "filter_logs": False,
             "bypass": False,
+            "cooldowns": {},
         }
         self.config.register_guild(**default_guild)
         self.config.register_global(trigger_timeout=1)
         self.re_pool = Pool()
+        self.image_pool = ProcessPoolExecutor(max_workers=2)
+        self.resize_cache = ResizeCache()
+        self.session = aiohttp.ClientSession()
+        self.ocr_service = OCRService(self.session)
         self.triggers = {}
+        self.trigger_matchers = {}
         self.__unload = self.cog_unload
         self.trigger_timeout = 1
+        self.pattern_cache_stats = {"hits": 0, "misses": 0}
+        self.cooldowns = {}
+        self.save_stats = {
+            "cycles": 0,
+            "triggers": 0,
+            "bytes": 0,
+            "total_triggers": 0,
+            "total_bytes": 0,
+        }
         self.save_loop.start()
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
@@ -87,20 +107,43 @@ class ReTrigger(TriggerHandler, commands.Cog):
         log.debug("Closing process pools.")
         self.re_pool.close()
         self.bot.loop.run_in_executor(None, self.re_pool.join)
+        self.image_pool.shutdown(wait=False)
+        self.ocr_service.close()
+        self.bot.loop.create_task(self.session.close())
         self.save_loop.cancel()
 
     async def save_all_triggers(self):
+        """
+        Save every trigger that has changed since the last save
+
+        Only the changed fields are written with one config transaction per guild.
+        """
+        triggers_written = 0
+        bytes_written = 0
         for guild_id, triggers in self.triggers.items():
+            changed = [t for t in triggers if t.dirty]
+            if not changed:
+                continue
             guild = self.bot.get_guild(guild_id)
             if not guild:
                 continue
             async with self.config.guild(guild).trigger_list() as trigger_list:
-                for trigger in triggers:
-                    try:
-                        trigger_list[trigger.name] = await trigger.to_json()
-                    except KeyError:
+                for trigger in changed:
+                    changes = trigger.dirty_json()
+                    trigger.mark_clean()
+                    if trigger.name not in trigger_list:
+                        # the trigger was deleted since it was last saved
                         continue
-                    await asyncio.sleep(0.1)
+                    trigger_list[trigger.name].update(changes)
+                    triggers_written += 1
+                    bytes_written += len(json.dumps(changes))
+        bytes_written += await self.save_cooldowns(changed_only=True)
+        self.save_stats["cycles"] += 1
+        self.save_stats["triggers"] = triggers_written
+        self.save_stats["bytes"] = bytes_written
+        self.save_stats["total_triggers"] += triggers_written
+        self.save_stats["total_bytes"] += bytes_written
+        log.debug("Saved %s triggers (%s bytes)", triggers_written, bytes_written)
 
     @tasks.loop(seconds=120)
     async def save_loop(self):
@@ -136,6 +179,8 @@ class ReTrigger(TriggerHandler, commands.Cog):
                     # I might move this to DM the author of the trigger
                     # before this becomes actually breaking
                 self.triggers[guild].append(new_trigger)
+            self.rebuild_trigger_index(guild)
+            await self.load_cooldowns(guild, settings)
 
     @commands.group()
     @commands.guild_only()
@@ -399,18 +444,17 @@ class ReTrigger(TriggerHandler, commands.Cog):
         msg = _("Cooldown of {time}s per {style} set for Trigger `{name}`.")
         if style in ["user", "member"]:
             style = "author"
-        if style in ["guild", "server"]:
-            cooldown = {"time": time, "style": style, "last": 0}
-        else:
-            cooldown = {"time": time, "style": style, "last": []}
+        cooldown = {"time": time, "style": style}
         if time <= 0:
             cooldown = {}
             msg = _("Cooldown for Trigger `{name}` reset.")
         trigger_list = await self.config.guild(ctx.guild).trigger_list()
         trigger.cooldown = cooldown
+        self.cooldowns.get(ctx.guild.id, {}).pop(trigger.name, None)
+        await self.config.guild(ctx.guild).cooldowns.clear_raw(trigger.name)
         trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         await self.config.guild(ctx.guild).trigger_list.set(trigger_list)
         await ctx.send(msg.format(time=time, style=style, name=trigger.name))
 
@@ -442,7 +486,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
                     trigger.whitelist.append(obj.id)
                     trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} added `{list_type}` to its allowlist.")
         list_type = humanize_list([c.name for c in channel_user_role])
         await ctx.send(msg.format(list_type=list_type, name=trigger.name))
@@ -478,7 +522,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
                     trigger.whitelist.remove(obj.id)
                     trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} removed `{list_type}` from its allowlist.")
         list_type = humanize_list([c.name for c in channel_user_role])
         await ctx.send(msg.format(list_type=list_type, name=trigger.name))
@@ -511,7 +555,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
                     trigger.blacklist.append(obj.id)
                     trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} added `{list_type}` to its blocklist.")
         list_type = humanize_list([c.name for c in channel_user_role])
         await ctx.send(msg.format(list_type=list_type, name=trigger.name))
@@ -547,7 +591,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
                     trigger.blacklist.remove(obj.id)
                     trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} removed `{list_type}` from its blocklist.")
         list_type = humanize_list([c.name for c in channel_user_role])
         await ctx.send(msg.format(list_type=list_type, name=trigger.name))
@@ -575,7 +619,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} regex changed to ```bf\n{regex}\n```")
         await ctx.send(msg.format(name=trigger.name, regex=regex))
 
@@ -599,7 +643,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} OCR Search set to: {ocr_search}")
         await ctx.send(msg.format(name=trigger.name, ocr_search=trigger.ocr_search))
 
@@ -623,7 +667,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} NSFW set to: {nsfw}")
         await ctx.send(msg.format(name=trigger.name, nsfw=trigger.nsfw))
 
@@ -650,7 +694,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} read filenames set to: {read_filenames}")
         await ctx.send(msg.format(name=trigger.name, read_filenames=trigger.read_filenames))
 
@@ -680,7 +724,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} replies set to: {set_to}")
         await ctx.send(msg.format(name=trigger.name, set_to=trigger.reply))
 
@@ -706,7 +750,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} text-to-speech set to: {set_to}")
         await ctx.send(msg.format(name=trigger.name, set_to=trigger.tts))
 
@@ -734,7 +778,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} user mentions set to: {set_to}")
         await ctx.send(msg.format(name=trigger.name, set_to=trigger.user_mention))
 
@@ -762,7 +806,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} everyone mentions set to: {set_to}")
         await ctx.send(msg.format(name=trigger.name, set_to=trigger.everyone_mention))
 
@@ -790,7 +834,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} role mentions set to: {set_to}")
         await ctx.send(msg.format(name=trigger.name, set_to=trigger.role_mention))
 
@@ -815,7 +859,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} check edits set to: {ignore_edits}")
         await ctx.send(msg.format(name=trigger.name, ignore_edits=trigger.check_edits))
 
@@ -844,7 +888,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} text changed to `{text}`")
         await ctx.send(msg.format(name=trigger.name, text=text))
 
@@ -875,7 +919,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         if chance:
             msg = _("Trigger {name} chance changed to `1 in {chance}`")
         else:
@@ -919,7 +963,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} will now delete after `{time}` seconds.")
         await ctx.send(msg.format(name=trigger.name, time=delete_after_seconds))
 
@@ -943,7 +987,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} ignoring commands set to `{text}`")
         await ctx.send(msg.format(name=trigger.name, text=trigger.ignore_commands))
 
@@ -981,7 +1025,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} command changed to `{command}`")
         await ctx.send(msg.format(name=trigger.name, command=command))
 
@@ -1022,7 +1066,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} role edits changed to `{roles}`")
         await ctx.send(msg.format(name=trigger.name, roles=humanize_list([r.name for r in roles])))
 
@@ -1051,7 +1095,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} reactions changed to {emojis}")
         emoji_s = [f"<{e}>" for e in emojis if len(e) > 5] + [e for e in emojis if len(e) < 5]
         await ctx.send(msg.format(name=trigger.name, emojis=humanize_list(emoji_s)))
@@ -1074,7 +1118,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         async with self.config.guild(ctx.guild).trigger_list() as trigger_list:
             trigger_list[trigger.name] = await trigger.to_json()
         await self.remove_trigger_from_cache(ctx.guild.id, trigger)
-        self.triggers[ctx.guild.id].append(trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, trigger)
         msg = _("Trigger {name} has been enabled.")
         await ctx.send(msg.format(name=trigger.name))
 
@@ -1182,6 +1226,51 @@ class ReTrigger(TriggerHandler, commands.Cog):
             await self.config.guild(ctx.guild).bypass.set(bypass)
             await ctx.send(_("Safe Regex search re-enabled."))
 
+    @retrigger.command(hidden=True)
+    @checks.is_owner()
+    async def cachestats(self, ctx: commands.Context) -> None:
+        """
+        Show how often the regex workers had a pattern already compiled
+
+        Each process in the regex pool keeps its own cache of compiled patterns.
+        A miss means the pattern had to be sent to and compiled by a worker.
+
+        See https://regex101.com/ for help building a regex pattern.
+        See `[p]retrigger explain` or click the link below for more details.
+        [For more details click here.](https://github.com/TrustyJAID/Trusty-cogs/blob/master/retrigger/README.md)
+        """
+        hits = self.pattern_cache_stats["hits"]
+        misses = self.pattern_cache_stats["misses"]
+        total = hits + misses
+        rate = (hits / total) * 100 if total else 0
+        msg = _(
+            "__Pattern Cache__\n"
+            "Hits: **{hits}**\n"
+            "Misses: **{misses}**\n"
+            "Hit rate: **{rate:.2f}%**"
+        ).format(hits=hits, misses=misses, rate=rate)
+        await ctx.maybe_send_embed(msg)
+
+    @retrigger.command(hidden=True)
+    @checks.is_owner()
+    async def savestats(self, ctx: commands.Context) -> None:
+        """
+        Show how much trigger data was written by the save loop
+
+        Only triggers and cooldowns that have changed are saved each cycle.
+
+        See https://regex101.com/ for help building a regex pattern.
+        See `[p]retrigger explain` or click the link below for more details.
+        [For more details click here.](https://github.com/TrustyJAID/Trusty-cogs/blob/master/retrigger/README.md)
+        """
+        msg = _(
+            "__Save Loop__\n"
+            "Cycles: **{cycles}**\n"
+            "Last cycle: **{triggers}** triggers, **{bytes}** bytes\n"
+            "Total: **{total_triggers}** triggers, **{total_bytes}** bytes"
+        ).format(**self.save_stats)
+        await ctx.maybe_send_embed(msg)
+
     @retrigger.command(usage="[trigger]")
     @commands.bot_has_permissions(read_message_history=True, add_reactions=True)
     async def list(
@@ -1318,9 +1407,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
             created_at=ctx.message.id,
             delete_after=delete_after_seconds,
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1351,9 +1438,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["randtext"], author, text=text, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1381,9 +1466,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         guild = ctx.guild
         author = ctx.message.author.id
         new_trigger = Trigger(name, regex, ["dm"], author, text=text, created_at=ctx.message.id)
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1411,9 +1494,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         guild = ctx.guild
         author = ctx.message.author.id
         new_trigger = Trigger(name, regex, ["dmme"], author, text=text, created_at=ctx.message.id)
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1444,9 +1525,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["rename"], author, text=text, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1494,9 +1573,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["image"], author, image=filename, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1528,9 +1605,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["randimage"], author, image=filename, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1582,9 +1657,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["image"], author, image=filename, text=text, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1616,11 +1689,11 @@ class ReTrigger(TriggerHandler, commands.Cog):
         author = ctx.message.author.id
         if ctx.message.attachments != []:
             attachment_url = ctx.message.attachments[0].url
-            filename = await self.save_image_location(attachment_url, guild)
+            filename = await self.save_image_location(attachment_url, guild, precompute=True)
             if not filename:
                 return await ctx.send(_("That is not a valid file link."))
         elif image_url is not None:
-            filename = await self.save_image_location(image_url, guild)
+            filename = await self.save_image_location(image_url, guild, precompute=True)
             if not filename:
                 return await ctx.send(_("That is not a valid file link."))
         else:
@@ -1628,15 +1701,13 @@ class ReTrigger(TriggerHandler, commands.Cog):
             if not msg or not msg.attachments:
                 return
             image_url = msg.attachments[0].url
-            filename = await self.save_image_location(image_url, guild)
+            filename = await self.save_image_location(image_url, guild, precompute=True)
             if not filename:
                 return await ctx.send(_("That is not a valid file link."))
         new_trigger = Trigger(
             name, regex, ["resize"], author, image=filename, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1666,9 +1737,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["ban"], author, created_at=ctx.message.id, check_edits=True
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1698,9 +1767,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["kick"], author, created_at=ctx.message.id, check_edits=True
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1731,9 +1798,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["react"], author, text=emojis, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1759,9 +1824,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         guild = ctx.guild
         author = ctx.message.author.id
         new_trigger = Trigger(name, regex, ["publish"], author, created_at=ctx.message.id)
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1796,9 +1859,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["command"], author, text=command, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1849,9 +1910,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["mock"], author, text=command, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1892,9 +1951,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
             created_at=ctx.message.id,
             check_edits=True,
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1935,9 +1992,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["add_role"], author, text=role_ids, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -1978,9 +2033,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
         new_trigger = Trigger(
             name, regex, ["remove_role"], author, text=role_ids, created_at=ctx.message.id
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
@@ -2045,9 +2098,7 @@ class ReTrigger(TriggerHandler, commands.Cog):
             multi_payload=multi_response,
             created_at=ctx.message.id,
         )
-        if ctx.guild.id not in self.triggers:
-            self.triggers[ctx.guild.id] = []
-        self.triggers[ctx.guild.id].append(new_trigger)
+        await self.add_trigger_to_cache(ctx.guild.id, new_trigger)
         trigger_list = await self.config.guild(guild).trigger_list()
         trigger_list[name] = await new_trigger.to_json()
         await self.config.guild(guild).trigger_list.set(trigger_list)
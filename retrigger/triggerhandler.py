@@ -1,10 +1,13 @@
 import asyncio
 import functools
+import json
 import logging
 import multiprocessing as mp
 import os
 import random
 import string
+import time
+from concurrent.futures import ProcessPoolExecutor
 from copy import copy
 from datetime import datetime
 from io import BytesIO
@@ -20,11 +23,16 @@ from redbot.core.data_manager import cog_data_path
 from redbot.core.i18n import Translator
 from redbot.core.utils.chat_formatting import escape, humanize_list
 
-from .converters import Trigger
+from .converters import ResponseFlags, Trigger
+from .cooldowns import CooldownStore
+from .images import PRECOMPUTE_SIZES, ResizeCache
+from .matcher import TriggerMatcher
 from .message import ReTriggerMessage
+from .ocr import OCRService
+from .worker import HAS_TIMEOUT, PatternKey, batch_findall, resize_gif, resize_image
 
 try:
-    from PIL import Image, ImageSequence
+    from PIL import Image  # noqa: F401
 
     try:
         import pytesseract
@@ -48,14 +56,25 @@ except ImportError:
 log = logging.getLogger("red.trusty-cogs.ReTrigger")
 _ = Translator("ReTrigger", __file__)
 
+# keys required to build a discord.Message from a raw edit payload
+MESSAGE_PAYLOAD_KEYS = (
+    "id",
+    "author",
+    "content",
+    "attachments",
+    "embeds",
+    "edited_timestamp",
+    "type",
+    "pinned",
+    "mention_everyone",
+    "tts",
+)
+
 RE_CTX: Pattern = re.compile(r"{([^}]+)\}")
 RE_POS: Pattern = re.compile(r"{((\d+)[^.}]*(\.[^:}]+)?[^}]*)\}")
 LINK_REGEX: Pattern = re.compile(
     r"(http[s]?:\/\/[^\"\']*\.(?:png|jpg|jpeg|gif|mp3|mp4))", flags=re.I
 )
-IMAGE_REGEX: Pattern = re.compile(
-    r"(?:(?:https?):\/\/)?[\w\/\-?=%.]+\.(?:png|jpg|jpeg)+", flags=re.I
-)
 
 
 class TriggerHandler:
@@ -66,8 +85,15 @@ class TriggerHandler:
     config: Config
     bot: Red
     re_pool: Pool
+    image_pool: ProcessPoolExecutor
+    resize_cache: ResizeCache
+    session: aiohttp.ClientSession
+    ocr_service: OCRService
     triggers: Dict[int, List[Trigger]]
+    trigger_matchers: Dict[int, TriggerMatcher]
     trigger_timeout: int
+    pattern_cache_stats: Dict[str, int]
+    cooldowns: Dict[int, Dict[str, CooldownStore]]
     ALLOW_RESIZE: bool = ALLOW_RESIZE
     ALLOW_OCR: bool = ALLOW_OCR
 
@@ -75,11 +101,33 @@ class TriggerHandler:
         self.config: Config
         self.bot: Red
         self.re_pool: Pool
+        self.image_pool: ProcessPoolExecutor
+        self.resize_cache: ResizeCache
+        self.session: aiohttp.ClientSession
+        self.ocr_service: OCRService
         self.triggers: Dict[int, List[Trigger]]
+        self.trigger_matchers: Dict[int, TriggerMatcher]
         self.trigger_timeout: int
+        self.pattern_cache_stats: Dict[str, int]
+        self.cooldowns: Dict[int, Dict[str, CooldownStore]]
         self.ALLOW_RESIZE = ALLOW_RESIZE
         self.ALLOW_OCR = ALLOW_OCR
 
+    def rebuild_trigger_index(self, guild_id: int) -> None:
+        """Rebuilds the guilds prefilter after its triggers have changed"""
+        self.trigger_matchers[guild_id] = TriggerMatcher(self.triggers.get(guild_id, []))
+
+    def get_trigger_matcher(self, guild_id: int) -> TriggerMatcher:
+        if guild_id not in self.trigger_matchers:
+            self.rebuild_trigger_index(guild_id)
+        return self.trigger_matchers[guild_id]
+
+    async def add_trigger_to_cache(self, guild_id: int, trigger: Trigger) -> None:
+        if guild_id not in self.triggers:
+            self.triggers[guild_id] = []
+        self.triggers[guild_id].append(trigger)
+        self.rebuild_trigger_index(guild_id)
+
     async def remove_trigger_from_cache(self, guild_id: int, trigger: Trigger) -> None:
         try:
             for t in self.triggers[guild_id]:
@@ -89,6 +137,7 @@ class TriggerHandler:
             # it will get removed on the next reload of the cog
             log.info("Trigger can't be removed :blobthinking:")
             pass
+        self.rebuild_trigger_index(guild_id)
 
     async def can_edit(self, author: discord.Member, trigger: Trigger) -> bool:
         """Chekcs to see if the member is allowed to edit the trigger"""
@@ -149,7 +198,15 @@ class TriggerHandler:
             log.info("Creating guild folder")
             directory.mkdir(exist_ok=True, parents=True)
 
-    async def save_image_location(self, image_url: str, guild: discord.Guild) -> Optional[str]:
+    async def save_image_location(
+        self, image_url: str, guild: discord.Guild, precompute: bool = False
+    ) -> Optional[str]:
+        """
+        Downloads an image for a trigger into the guilds folder
+
+        `precompute` will generate the most common sizes in the background
+        for images used by resize triggers.
+        """
         good_image_url = LINK_REGEX.search(image_url)
         if not good_image_url:
             return None
@@ -159,11 +216,12 @@ class TriggerHandler:
         directory = cog_data_path(self) / str(guild.id)
         file_path = str(cog_data_path(self)) + f"/{guild.id}/{filename}"
         await self.make_guild_folder(directory)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(good_image_url.group(1)) as resp:
-                test = await resp.read()
-                with open(file_path, "wb") as f:
-                    f.write(test)
+        async with self.session.get(good_image_url.group(1)) as resp:
+            test = await resp.read()
+            with open(file_path, "wb") as f:
+                f.write(test)
+        if precompute and ALLOW_RESIZE:
+            self.bot.loop.create_task(self.precompute_resized_images(file_path))
         return filename
 
     async def wait_for_image(self, ctx: commands.Context) -> Optional[discord.Message]:
@@ -238,64 +296,112 @@ class TriggerHandler:
             else:
                 responses.append(message.content)
 
-    def resize_image(self, size: int, image: str) -> discord.File:
-        length, width = (16, 16)  # Start with the smallest size we want to upload
-        with Image.open(image) as im:
-            if size <= 0:
-                size = 1
-            im.thumbnail((length * size, width * size), Image.ANTIALIAS)
-            byte_array = BytesIO()
-            im.save(byte_array, format="PNG")
-            byte_array.seek(0)
-            return discord.File(byte_array, filename="resize.png")
-
-    def resize_gif(self, size: int, image: str) -> discord.File:
-        img_list = []
-        with Image.open(image) as im:
-            if size <= 0:
-                size = 1
-            length, width = (16 * size, 16 * size)
-            start_list = [frame.copy() for frame in ImageSequence.Iterator(im)]
-            for frame in start_list:
-                frame.thumbnail((length, width), Image.ANTIALIAS)
-                img_list.append(frame)
-        byte_array = BytesIO()
-        img_list[0].save(
-            byte_array, format="GIF", save_all=True, append_images=img_list, duration=0, loop=0
-        )
-        byte_array.seek(0)
-        return discord.File(byte_array, filename="resize.gif")
+    async def get_resized_image(self, path: str, size: int) -> bytes:
+        """
+        Returns the encoded image at `path` resized for `size`
+
+        Resizing runs in a separate bounded process pool and the results
+        are kept in `self.resize_cache` so the same size is only generated once.
+        """
+        size = await self.resize_cache.clamp(path, size)
+        data = await self.resize_cache.get(path, size)
+        if data is not None:
+            return data
+        func = resize_gif if path.lower().endswith(".gif") else resize_image
+        task = self.bot.loop.run_in_executor(self.image_pool, func, path, size)
+        data = await asyncio.wait_for(task, timeout=60)
+        await self.resize_cache.set(path, size, data)
+        return data
+
+    async def precompute_resized_images(self, path: str) -> None:
+        try:
+            sizes = sorted(
+                {await self.resize_cache.clamp(path, size) for size in PRECOMPUTE_SIZES}
+            )
+            for size in sizes:
+                await self.get_resized_image(path, size)
+        except Exception:
+            log.debug("Error precomputing resized images for %s", path, exc_info=True)
+
+    def get_cooldown_store(self, guild_id: int, trigger: Trigger) -> CooldownStore:
+        stores = self.cooldowns.setdefault(guild_id, {})
+        store = stores.get(trigger.name)
+        if store is None or store.ttl != trigger.cooldown["time"]:
+            store = CooldownStore(trigger.cooldown["time"])
+            stores[trigger.name] = store
+        return store
 
     async def check_trigger_cooldown(self, message: discord.Message, trigger: Trigger) -> bool:
-        now = datetime.now().timestamp()
-        if trigger.cooldown:
-            if trigger.cooldown["style"] in ["guild", "server"]:
-                last = trigger.cooldown["last"]
-                time = trigger.cooldown["time"]
-                if (now - last) > time:
-                    trigger.cooldown["last"] = now
-                    return False
+        if not trigger.cooldown:
+            return False
+        if trigger.cooldown["style"] in ["guild", "server"]:
+            snowflake = message.guild
+        else:
+            snowflake = getattr(message, trigger.cooldown["style"])
+        store = self.get_cooldown_store(message.guild.id, trigger)
+        return store.on_cooldown(snowflake.id, time.time())
+
+    async def load_cooldowns(self, guild_id: int, settings: dict) -> None:
+        """
+        Load the cooldown snapshots saved by the save loop
+
+        Triggers saved before cooldowns were stored separately have their
+        cooldown state migrated out of the trigger itself.
+        """
+        now = time.time()
+        snapshot = settings.get("cooldowns", {})
+        migrated = []
+        for name, trigger in settings["trigger_list"].items():
+            cooldown = trigger.get("cooldown")
+            if not cooldown:
+                continue
+            if "last" in cooldown:
+                migrated.append(name)
+            data = snapshot.get(name)
+            if data is None:
+                last = cooldown.get("last")
+                if isinstance(last, list):
+                    data = {str(x["id"]): x["last"] for x in last}
+                elif last:
+                    data = {str(guild_id): last}
                 else:
-                    return True
-            else:
-                style = trigger.cooldown["style"]
-                snowflake = getattr(message, style)
-                if snowflake.id not in [x["id"] for x in trigger.cooldown["last"]]:
-                    trigger.cooldown["last"].append({"id": snowflake.id, "last": now})
-                    return False
+                    continue
+            store = CooldownStore.from_snapshot(cooldown["time"], data, now)
+            store.dirty = name in migrated
+            self.cooldowns.setdefault(guild_id, {})[name] = store
+        if not migrated:
+            return
+        # Save the migrated cooldowns before removing them from the triggers
+        await self.save_cooldowns(changed_only=True)
+        async with self.config.guild_from_id(guild_id).trigger_list() as trigger_list:
+            for name in migrated:
+                if name in trigger_list:
+                    trigger_list[name].get("cooldown", {}).pop("last", None)
+        log.debug("Migrated cooldowns out of %s triggers in %s", len(migrated), guild_id)
+
+    async def save_cooldowns(self, changed_only: bool = False) -> int:
+        """
+        Save a snapshot of every cooldown store
+
+        With `changed_only` only stores which have changed since
+        they were last saved are written.
+        Returns the number of bytes written
+        """
+        now = time.time()
+        written = 0
+        for guild_id, stores in list(self.cooldowns.items()):
+            group = self.config.guild_from_id(guild_id).cooldowns
+            for name, store in list(stores.items()):
+                if changed_only and not store.dirty:
+                    continue
+                store.dirty = False
+                data = store.snapshot(now)
+                if data:
+                    await group.set_raw(name, value=data)
+                    written += len(json.dumps(data))
                 else:
-                    entity_list = trigger.cooldown["last"]
-                    for entity in entity_list:
-                        if entity["id"] == snowflake.id:
-                            last = entity["last"]
-                            time = trigger.cooldown["time"]
-                            if (now - last) > time:
-                                trigger.cooldown["last"].remove({"id": snowflake.id, "last": last})
-                                trigger.cooldown["last"].append({"id": snowflake.id, "last": now})
-                                return False
-                            else:
-                                return True
-        return False
+                    await group.clear_raw(name)
+        return written
 
     async def check_is_command(self, message: discord.Message) -> bool:
         """Checks if the message is a bot command"""
@@ -327,6 +433,31 @@ class TriggerHandler:
             return
         await self.check_triggers(message, False)
 
+    @staticmethod
+    def message_from_payload(
+        guild: discord.Guild, channel: discord.TextChannel, data: dict
+    ) -> Optional[discord.Message]:
+        """
+        Build a message from a raw edit payload without fetching it
+
+        Content edits include the full message object in the payload so
+        this avoids an API call per edit. Returns None when the payload is
+        partial or the author isn't cached as a member.
+        """
+        if any(key not in data for key in MESSAGE_PAYLOAD_KEYS):
+            return None
+        try:
+            message = discord.Message(state=channel._state, channel=channel, data=data)
+        except Exception:
+            log.debug("Error building message from edit payload", exc_info=True)
+            return None
+        if not isinstance(message.author, discord.Member):
+            member = guild.get_member(message.author.id)
+            if member is None:
+                return None
+            message.author = member
+        return message
+
     @commands.Cog.listener()
     async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
         if "content" not in payload.data:
@@ -341,23 +472,30 @@ class TriggerHandler:
         if version_info >= VersionInfo.from_str("3.4.0"):
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
-        if not any(t.check_edits for t in self.triggers[guild.id]):
+        if not self.get_trigger_matcher(guild.id).check_edits:
             # log.debug(f"No triggers in {guild=} have check_edits enabled")
             return
-        if "bot" in payload.data["author"]:
+        if "bot" in payload.data.get("author", {}):
             return
         channel = guild.get_channel(int(payload.data["channel_id"]))
-        try:
-            message = await channel.fetch_message(int(payload.data["id"]))
-        except (discord.errors.Forbidden, discord.errors.NotFound):
-            log.debug(
-                _("I don't have permission to read channel history or cannot find the message.")
-            )
-            return
-        except Exception:
-            log.info("Could not find channel or message")
-            # If we can't find the channel ignore it
+        if channel is None:
             return
+        message = self.message_from_payload(guild, channel, payload.data)
+        if message is None:
+            # the payload didn't have everything we need so get the full message
+            try:
+                message = await channel.fetch_message(int(payload.data["id"]))
+            except (discord.errors.Forbidden, discord.errors.NotFound):
+                log.debug(
+                    _(
+                        "I don't have permission to read channel history or cannot find the message."
+                    )
+                )
+                return
+            except Exception:
+                log.info("Could not find channel or message")
+                # If we can't find the channel ignore it
+                return
         if message.author.bot:
             # somehow we got a bot through the previous check :thonk:
             return
@@ -369,6 +507,9 @@ class TriggerHandler:
         search. This does all the permission checks and cooldown checks
         before actually running the regex to avoid possibly long regex
         operations.
+
+        Every trigger that passes the checks is searched in a single
+        batch and the first one to match, in trigger order, is performed.
         """
         guild: discord.Guild = cast(discord.Guild, message.guild)
         if guild.id not in self.triggers:
@@ -383,34 +524,45 @@ class TriggerHandler:
         is_command = await self.check_is_command(message)
         is_mod = await self.is_mod_or_admin(author)
 
+        matcher = self.get_trigger_matcher(guild.id)
+
+        search_content = message.content
+        if message.attachments:
+            search_content += " " + " ".join(f.filename for f in message.attachments)
+        eligible = matcher.candidates(search_content)
+        if ALLOW_OCR:
+            eligible |= matcher.ocr_search
+        snowflake_ids = [channel.id, author.id]
+        if channel.category_id:
+            snowflake_ids.append(channel.category_id)
+        snowflake_ids.extend(r.id for r in author.roles if not r.is_default())
+        eligible &= matcher.allowed(snowflake_ids)
+        if edit:
+            eligible &= matcher.check_edits
+        if not channel.is_nsfw():
+            eligible &= ~matcher.nsfw
+        if is_command:
+            eligible &= matcher.ignore_commands
+
         autoimmune = getattr(self.bot, "is_automod_immune", None)
-        auto_mod = ["delete", "kick", "ban", "add_role", "remove_role"]
-        for trigger in self.triggers[guild.id]:
+        is_immune: Optional[bool] = None
+        ocr_text: Optional[str] = None
+        to_search: List[Tuple[Trigger, str]] = []
+        for trigger in matcher.iter_triggers(eligible):
             if not trigger.enabled:
                 continue
-            if edit and not trigger.check_edits:
-                continue
             if trigger.chance:
                 if random.randint(0, trigger.chance) != 0:
                     continue
-            if trigger.nsfw and not channel.is_nsfw():
-                continue
-
-            allowed_trigger = await self.check_bw_list(trigger, message)
-            is_auto_mod = trigger.response_type in auto_mod
-            if not allowed_trigger:
-                continue
-            if allowed_trigger and (is_auto_mod and is_mod):
-                continue
-            # log.debug(f"Checking trigger {trigger.name}")
-            if is_command and not trigger.ignore_commands:
-                continue
 
-            if any(t for t in trigger.response_type if t in auto_mod):
-                if await autoimmune(message):
+            flags = trigger.response_flags
+            if flags & ResponseFlags.AUTO_MOD:
+                if is_immune is None:
+                    is_immune = await autoimmune(message)
+                if is_immune:
                     log.debug("ReTrigger: %r is immune from automated actions %r", author, trigger)
                     continue
-            if "delete" in trigger.response_type:
+            if flags & ResponseFlags.DELETE:
                 if channel_perms.manage_messages or is_mod:
                     log.debug(
                         "ReTrigger: Delete is ignored because %r has manage messages permission %r",
@@ -418,7 +570,7 @@ class TriggerHandler:
                         trigger,
                     )
                     continue
-            elif "kick" in trigger.response_type:
+            elif flags & ResponseFlags.KICK:
                 if channel_perms.kick_members or is_mod:
                     log.debug(
                         "ReTrigger: Kick is ignored because %r has kick permissions %r",
@@ -426,7 +578,7 @@ class TriggerHandler:
                         trigger,
                     )
                     continue
-            elif "ban" in trigger.response_type:
+            elif flags & ResponseFlags.BAN:
                 if channel_perms.ban_members or is_mod:
                     log.debug(
                         "ReTrigger: Ban is ignored because %r has ban permissions %r",
@@ -434,7 +586,7 @@ class TriggerHandler:
                         trigger,
                     )
                     continue
-            elif any(t for t in trigger.response_type if t in ["add_role", "remove_role"]):
+            elif flags & ResponseFlags.ROLES:
                 if channel_perms.manage_roles or is_mod:
                     log.debug(
                         "ReTrigger: role change is ignored because %r has mange roles permissions %r",
@@ -455,12 +607,28 @@ class TriggerHandler:
                 content = message.content + " " + " ".join(f.filename for f in message.attachments)
 
             if trigger.ocr_search and ALLOW_OCR:
-                content += await self.get_image_text(message)
+                if ocr_text is None:
+                    ocr_text = await self.get_image_text(message)
+                content += ocr_text
+
+            to_search.append((trigger, content))
 
-            search = await self.safe_regex_search(guild, trigger, content)
+        if not to_search:
+            return
+        results = await self.safe_regex_batch(guild, to_search)
+        for (trigger, content), search in zip(to_search, results):
             if not search[0]:
+                log.warning(
+                    "ReTrigger: regex process took too long. Removing from memory "
+                    "%s (%s) Author %s Offending regex `%s` Name: %s",
+                    guild.name,
+                    guild.id,
+                    trigger.author,
+                    trigger.regex.pattern,
+                    trigger.name,
+                )
                 trigger.enabled = False
-                return
+                continue
             elif search[0] and search[1] != []:
                 if await self.check_trigger_cooldown(message, trigger):
                     continue
@@ -477,32 +645,100 @@ class TriggerHandler:
         image links and all attachments on the message
         then runs them through pytesseract. All contents
         from pytesseract are returned as a string.
+
+        The work is done by the cogs OCRService which caches
+        results so reposted images are only processed once.
         """
-        content = " "
-        for attachment in message.attachments:
-            temp = BytesIO()
-            await attachment.save(temp)
-            task = functools.partial(pytesseract.image_to_string, Image.open(temp))
-            new_task = self.bot.loop.run_in_executor(None, task)
+        return await self.ocr_service.get_image_text(message)
+
+    def _pool_task(self, func, args: tuple) -> asyncio.Future:
+        """
+        Submit `func` to the process pool and return an asyncio future for the result
+
+        The pools result handler thread resolves the future so no executor
+        thread is left blocking while the pool works.
+        """
+        loop = self.bot.loop
+        future = loop.create_future()
+
+        def _resolve(method: str, value: Any) -> None:
+            if not future.done():
+                getattr(future, method)(value)
+
+        def _callback(result: Any) -> None:
             try:
-                content += await asyncio.wait_for(new_task, timeout=5)
-            except asyncio.TimeoutError:
+                loop.call_soon_threadsafe(_resolve, "set_result", result)
+            except RuntimeError:
+                # the loop was closed while the pool was working
                 pass
-        good_image_url = IMAGE_REGEX.findall(message.content)
-        for link in good_image_url:
-            temp = BytesIO()
-            async with aiohttp.ClientSession() as session:
-                async with session.get(link) as resp:
-                    data = await resp.read()
-                    temp.write(data)
-                    temp.seek(0)
-            task = functools.partial(pytesseract.image_to_string, Image.open(temp))
-            new_task = self.bot.loop.run_in_executor(None, task)
+
+        def _error_callback(error: BaseException) -> None:
             try:
-                content += await asyncio.wait_for(new_task, timeout=5)
-            except asyncio.TimeoutError:
+                loop.call_soon_threadsafe(_resolve, "set_exception", error)
+            except RuntimeError:
                 pass
-        return content
+
+        self.re_pool.apply_async(func, args, callback=_callback, error_callback=_error_callback)
+        return future
+
+    async def safe_regex_batch(
+        self, guild: discord.Guild, searches: List[Tuple[Trigger, str]]
+    ) -> List[Tuple[bool, list]]:
+        """
+        Search multiple triggers against their content in a single process pool task
+
+        Each unique content is only sent once along with the keys of the patterns
+        to search, the workers keep the compiled patterns cached and the patterns
+        are only sent when a worker doesn't have them yet.
+
+        If the batch as a whole fails or times out we fall back to searching
+        each trigger without a result individually so only the offending
+        trigger is removed.
+        """
+        if await self.config.guild(guild).bypass():
+            return [(True, trigger.regex.findall(content)) for trigger, content in searches]
+        contents: List[str] = []
+        batch: List[Tuple[PatternKey, Optional[str], int]] = []
+        for trigger, content in searches:
+            if content not in contents:
+                contents.append(content)
+            key = (guild.id, trigger.name, hash(trigger.regex.pattern))
+            batch.append((key, None, contents.index(content)))
+        if HAS_TIMEOUT:
+            # every pattern is limited to trigger_timeout inside the worker
+            timeout = self.trigger_timeout * len(batch) + 5
+        else:
+            # without per pattern timeouts one bad pattern could hold the
+            # whole batch so don't wait any longer than a single search would
+            timeout = self.trigger_timeout + 5
+        results: List[Tuple[Optional[bool], list]] = [(None, [])] * len(batch)
+        try:
+            task = self._pool_task(batch_findall, (contents, batch, self.trigger_timeout))
+            results = await asyncio.wait_for(task, timeout=timeout)
+            missing = [i for i, result in enumerate(results) if result[0] is None]
+            self.pattern_cache_stats["hits"] += len(batch) - len(missing)
+            self.pattern_cache_stats["misses"] += len(missing)
+            if missing:
+                # the worker hasn't compiled these yet so send the patterns along
+                resend = [
+                    (batch[i][0], searches[i][0].regex.pattern, batch[i][2]) for i in missing
+                ]
+                task = self._pool_task(batch_findall, (contents, resend, self.trigger_timeout))
+                for i, result in zip(missing, await asyncio.wait_for(task, timeout=timeout)):
+                    results[i] = result
+            return results
+        except asyncio.TimeoutError:
+            log.warning(
+                "ReTrigger: batched regex search timed out in %s (%s), searching individually.",
+                guild.name,
+                guild.id,
+            )
+        except Exception:
+            log.error("ReTrigger encountered an error in batched regex search", exc_info=True)
+        for i, (trigger, content) in enumerate(searches):
+            if results[i][0] is None:
+                results[i] = await self.safe_regex_search(guild, trigger, content)
+        return results
 
     async def safe_regex_search(
         self, guild: discord.Guild, trigger: Trigger, content: str
@@ -564,17 +800,12 @@ class TriggerHandler:
         if "resize" in trigger.response_type and own_permissions.attach_files and ALLOW_RESIZE:
             await channel.trigger_typing()
             path = str(cog_data_path(self)) + f"/{guild.id}/{trigger.image}"
-            if path.lower().endswith(".gif"):
-                task = functools.partial(self.resize_gif, size=len(find[0]) - 3, image=path)
-            else:
-                task = functools.partial(self.resize_image, size=len(find[0]) - 3, image=path)
-            new_task = self.bot.loop.run_in_executor(None, task)
+            filename = "resize.gif" if path.lower().endswith(".gif") else "resize.png"
             try:
-                file: discord.File = await asyncio.wait_for(new_task, timeout=60)
+                data = await self.get_resized_image(path, len(find[0]) - 3)
+                await channel.send(file=discord.File(BytesIO(data), filename=filename))
             except asyncio.TimeoutError:
-                pass
-            try:
-                await channel.send(file=file)
+                log.debug("Resizing image for trigger %r in %r timed out", trigger, guild)
             except discord.errors.Forbidden:
                 log.debug("Retrigger encountered an error in %r with trigger %r", guild, trigger)
             except Exception:
@@ -1152,6 +1383,7 @@ class TriggerHandler:
                         if isinstance(image, list):
                             for i in image:
                                 path = str(cog_data_path(self)) + f"/{guild_id}/{i}"
+                                await self.resize_cache.remove(path)
                                 try:
                                     os.remove(path)
                                 except Exception:
@@ -1161,6 +1393,7 @@ class TriggerHandler:
                                     log.error(msg, exc_info=True)
                         else:
                             path = str(cog_data_path(self)) + f"/{guild_id}/{image}"
+                            await self.resize_cache.remove(path)
                             try:
                                 os.remove(path)
                             except Exception:
@@ -1169,5 +1402,7 @@ class TriggerHandler:
                                 )
                                 log.error(msg, exc_info=True)
                     del trigger_list[triggers]
+                    self.cooldowns.get(guild_id, {}).pop(trigger_name, None)
+                    await self.config.guild_from_id(guild_id).cooldowns.clear_raw(trigger_name)
                     return True
         return False
@@ -0,0 +1,110 @@
+"""
+Functions run inside the ReTrigger process pool.
+
+These need to live at the module level so that they can be pickled
+and sent to the worker processes.
+"""
+from collections import OrderedDict
+from io import BytesIO
+from typing import List, Optional, Pattern, Tuple
+
+try:
+    from PIL import Image, ImageSequence
+except ImportError:
+    pass
+
+try:
+    import regex as re
+
+    HAS_TIMEOUT = True
+except ImportError:
+    import re
+
+    HAS_TIMEOUT = False
+
+# (guild_id, trigger_name, pattern_hash)
+PatternKey = Tuple[int, str, int]
+
+# Every worker process keeps its own cache of compiled patterns.
+# Keys include a hash of the pattern so editing a triggers regex produces
+# a new key and the old compiled pattern simply ages out of the cache.
+MAX_CACHED_PATTERNS = 2048
+PATTERN_CACHE: "OrderedDict[PatternKey, Pattern]" = OrderedDict()
+
+
+def _get_pattern(key: PatternKey, pattern: Optional[str]) -> Optional[Pattern]:
+    compiled = PATTERN_CACHE.get(key)
+    if compiled is not None:
+        PATTERN_CACHE.move_to_end(key)
+        return compiled
+    if pattern is None:
+        return None
+    compiled = re.compile(pattern)
+    PATTERN_CACHE[key] = compiled
+    if len(PATTERN_CACHE) > MAX_CACHED_PATTERNS:
+        PATTERN_CACHE.popitem(last=False)
+    return compiled
+
+
+def _findall(compiled: Pattern, content: str, timeout: float) -> list:
+    if HAS_TIMEOUT:
+        return compiled.findall(content, timeout=timeout)
+    return compiled.findall(content)
+
+
+def batch_findall(
+    contents: List[str],
+    searches: List[Tuple[PatternKey, Optional[str], int]],
+    timeout: float,
+) -> List[Tuple[Optional[bool], list]]:
+    """
+    Run every pattern in `searches` against its content in a single task.
+
+    `searches` is a list of `(key, pattern, content_index)` so each unique piece of
+    content is only sent to the worker once. The pattern may be None in which
+    case it is looked up in this workers cache by key, if it isn't cached
+    `(None, [])` is returned so the caller can resend it with the pattern.
+
+    When the regex module is available each pattern gets its own timeout
+    and a pattern that times out returns `(False, [])` without affecting
+    the results of the rest.
+    """
+    results: List[Tuple[Optional[bool], list]] = []
+    for key, pattern, index in searches:
+        try:
+            compiled = _get_pattern(key, pattern)
+            if compiled is None:
+                results.append((None, []))
+                continue
+            results.append((True, _findall(compiled, contents[index], timeout)))
+        except (TimeoutError, ValueError):
+            results.append((False, []))
+        except Exception:
+            results.append((True, []))
+    return results
+
+
+def resize_image(path: str, size: int) -> bytes:
+    """Scale a still image to fit within `16 * size` pixels and encode it as PNG"""
+    length, width = (16, 16)  # Start with the smallest size we want to upload
+    with Image.open(path) as im:
+        im.thumbnail((length * max(size, 1), width * max(size, 1)), Image.LANCZOS)
+        byte_array = BytesIO()
+        im.save(byte_array, format="PNG")
+        return byte_array.getvalue()
+
+
+def resize_gif(path: str, size: int) -> bytes:
+    """Scale every frame of a gif to fit within `16 * size` pixels"""
+    img_list = []
+    length, width = (16 * max(size, 1), 16 * max(size, 1))
+    with Image.open(path) as im:
+        for frame in ImageSequence.Iterator(im):
+            frame = frame.copy()
+            frame.thumbnail((length, width), Image.LANCZOS)
+            img_list.append(frame)
+    byte_array = BytesIO()
+    img_list[0].save(
+        byte_array, format="GIF", save_all=True, append_images=img_list[1:], duration=0, loop=0
+    )
+    return byte_array.getvalue()
@@ -1,22 +1,30 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Literal, Optional, Tuple, Union, cast
+from typing import Dict, List, Literal, Optional, Tuple, Union, cast
 
 import discord
-from discord.utils import snowflake_time
+from discord.utils import time_snowflake
 from redbot import VersionInfo, version_info
 from redbot.core import Config, commands
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
-from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
-from .starboard_entry import FakePayload, StarboardEntry, StarboardMessage
+from .starboard_entry import FakePayload, PendingReactions, StarboardEntry, StarboardMessage
 
 _ = Translator("Starboard", __file__)
 log = logging.getLogger("red.trusty-cogs.Starboard")
 
+# How long reactions on the same message are collected before being applied.
+# Popular posts can receive dozens of reactions a second, this turns
+# them into a single update and a single edit of the starboard message.
+REACTION_WINDOW = 1.5
+# How often messages changed by reactions are written to config.
+SAVE_INTERVAL = 60
+# How many old messages are pruned from a starboard each time the lock is held.
+PRUNE_BATCH_SIZE = 500
+
 
 @cog_i18n(_)
 class StarboardEvents:
@@ -24,6 +32,9 @@ class StarboardEvents:
     config: Config
     starboards: Dict[int, StarboardEntry]
     ready: asyncio.Event
+    pending_reactions: Dict[Tuple[int, str, int, int], PendingReactions]
+    pending_edits: Dict[int, str]
+    emoji_index: Dict[int, Dict[str, List[StarboardEntry]]]
 
     async def _build_embed(
         self, guild: discord.Guild, message: discord.Message, starboard: StarboardEntry
@@ -99,11 +110,69 @@ class StarboardEvents:
         em.set_footer(text=f"{channel.guild.name} | {channel.name}")
         return em
 
+    def rebuild_emoji_index(self, guild_id: int) -> None:
+        """
+        Rebuilds the guilds emoji to starboard lookup and clears each
+        starboards cached allowlist and blocklist after its settings change
+        """
+        index: Dict[str, List[StarboardEntry]] = {}
+        for starboard in self.starboards.get(guild_id, {}).values():
+            starboard.invalidate_allowed()
+            index.setdefault(starboard.emoji, []).append(starboard)
+        self.emoji_index[guild_id] = index
+
     async def _save_starboards(self, guild: discord.Guild) -> None:
+        self.rebuild_emoji_index(guild.id)
         async with self.config.guild(guild).starboards() as starboards:
             for name, starboard in self.starboards[guild.id].items():
+                starboard.pop_changes()
                 starboards[name] = await starboard.to_json()
 
+    async def _save_changed_starboards(self) -> None:
+        """
+        Saves only the messages changed by reactions since the last save
+
+        Serializing every message on every reaction gets expensive for guilds
+        tracking a lot of messages so reactions only mark what changed
+        and this writes those entries in a single transaction per guild.
+        """
+        for guild_id, starboards in list(self.starboards.items()):
+            changed = [(s, *s.pop_changes()) for s in list(starboards.values()) if s.changed]
+            if not changed:
+                continue
+            try:
+                async with self.config.guild_from_id(guild_id).starboards() as data:
+                    for starboard, messages, index in changed:
+                        saved = data.get(starboard.name)
+                        if not saved or not isinstance(saved.get("messages"), dict):
+                            data[starboard.name] = await starboard.to_json()
+                            continue
+                        starboard.update_json(saved, messages, index)
+            except Exception:
+                # keep the changes so they're written on the next save
+                for starboard, messages, index in changed:
+                    starboard.restore_changes(messages, index)
+                log.exception("Error saving starboard messages in %s", guild_id)
+
+    async def _flush_and_save(self) -> None:
+        """
+        Applies every buffered reaction immediately and saves the result
+
+        Used when the cog unloads so reactions still waiting
+        for the rest of their window aren't lost.
+        """
+        for key in list(self.pending_reactions):
+            await self._apply_pending_reactions(key)
+        await self._save_changed_starboards()
+
+    async def save_changed_loop(self) -> None:
+        while True:
+            await asyncio.sleep(SAVE_INTERVAL)
+            try:
+                await self._save_changed_starboards()
+            except Exception:
+                log.exception("Error saving starboard messages")
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
         await self.ready.wait()
@@ -134,6 +203,16 @@ class StarboardEvents:
             async with starboard.lock:
                 await self._loop_messages(payload, starboard, star_channel)
 
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        for starboard in self.starboards.get(channel.guild.id, {}).values():
+            starboard.invalidate_allowed()
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        for starboard in self.starboards.get(role.guild.id, {}).values():
+            starboard.invalidate_allowed()
+
     async def is_bot_or_server_owner(self, member: discord.Member) -> bool:
         guild = member.guild
         if not guild:
@@ -150,13 +229,14 @@ class StarboardEvents:
         based on the reactions added.
         This covers all reaction event types
         """
+        starboards = self.emoji_index.get(payload.guild_id, {}).get(str(payload.emoji))
+        if not starboards:
+            return
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
         channel = guild.get_channel(payload.channel_id)
 
-        if guild.id not in self.starboards:
-            return
         if version_info >= VersionInfo.from_str("3.4.0"):
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
@@ -164,92 +244,155 @@ class StarboardEvents:
         member = guild.get_member(payload.user_id)
         if member and member.bot:
             return
-        starboard = None
-        for name, s_board in self.starboards[guild.id].items():
-            if s_board.emoji == str(payload.emoji):
-                starboard = s_board
-        if not starboard:
-            return
-        if not starboard.enabled:
+        for starboard in starboards:
+            if not starboard.enabled:
+                continue
+            allowed_roles = starboard.check_roles(member)
+            allowed_channel = starboard.check_channel(self.bot, channel)
+            if any((not allowed_roles, not allowed_channel)):
+                log.debug("User or channel not in allowlist")
+                continue
+
+            star_channel = guild.get_channel(starboard.channel)
+            if not star_channel:
+                continue
+            if (
+                not star_channel.permissions_for(guild.me).send_messages
+                or not star_channel.permissions_for(guild.me).embed_links
+            ):
+                continue
+
+            self._queue_reaction(payload, starboard)
+
+    def _queue_reaction(
+        self,
+        payload: Union[discord.RawReactionActionEvent, FakePayload],
+        starboard: StarboardEntry,
+    ) -> None:
+        """
+        Buffers a reaction event so every reaction on the same message within
+        `REACTION_WINDOW` seconds is applied at once.
+        """
+        key = (payload.guild_id, starboard.name, payload.channel_id, payload.message_id)
+        pending = self.pending_reactions.get(key)
+        if pending is None:
+            pending = PendingReactions(payload=payload, starboard=starboard)
+            pending.task = self.bot.loop.create_task(self._flush_reactions(key))
+            self.pending_reactions[key] = pending
+        added = getattr(payload, "event_type", None) == "REACTION_ADD"
+        pending.users[payload.user_id] = added
+
+    async def _flush_reactions(self, key: Tuple[int, str, int, int]) -> None:
+        await asyncio.sleep(REACTION_WINDOW)
+        await self._apply_pending_reactions(key)
+
+    async def _apply_pending_reactions(self, key: Tuple[int, str, int, int]) -> None:
+        # remove the buffer before waiting on the lock so that new reactions
+        # start a new buffer instead of being lost while this one is applied
+        pending = self.pending_reactions.pop(key, None)
+        if pending is None:
             return
-        allowed_roles = starboard.check_roles(member)
-        allowed_channel = starboard.check_channel(self.bot, channel)
-        if any((not allowed_roles, not allowed_channel)):
-            log.debug("User or channel not in allowlist")
+        guild = self.bot.get_guild(pending.payload.guild_id)
+        if not guild:
             return
-
-        star_channel = guild.get_channel(starboard.channel)
+        star_channel = guild.get_channel(pending.starboard.channel)
         if not star_channel:
             return
-        if (
-            not star_channel.permissions_for(guild.me).send_messages
-            or not star_channel.permissions_for(guild.me).embed_links
-        ):
-            return
+        try:
+            async with pending.starboard.lock:
+                await self._apply_reactions(guild, pending, star_channel)
+        except Exception:
+            log.exception("Error updating starboard %r", pending.starboard)
 
-        async with starboard.lock:
-            star_message = await self._loop_messages(payload, starboard, star_channel)
-            if star_message is True:
-                return
+    async def _apply_reactions(
+        self, guild: discord.Guild, pending: PendingReactions, star_channel: discord.TextChannel
+    ) -> None:
+        payload = pending.payload
+        starboard = pending.starboard
+        channel = guild.get_channel(payload.channel_id)
+        star_message = await self._loop_messages(
+            payload, starboard, star_channel, users=pending.users
+        )
+        if star_message is True:
+            return
 
-            if star_message is False:
-                if getattr(payload, "event_type", None) == "REACTION_REMOVE":
-                    # Return early so we don't create a new starboard message
-                    # when the first time we're seeing the message is on a
-                    # reaction remove event
-                    return
-                try:
-                    msg = await channel.fetch_message(payload.message_id)
-                except (discord.errors.NotFound, discord.Forbidden):
-                    return
-                reactions = [payload.user_id]
-                if payload.user_id == msg.author.id:
-                    if not starboard.selfstar:
-                        reactions.remove(payload.user_id)
-                star_message = StarboardMessage(
-                    guild=guild.id,
-                    original_message=payload.message_id,
-                    original_channel=payload.channel_id,
-                    new_message=None,
-                    new_channel=None,
-                    author=msg.author.id,
-                    reactions=reactions,
-                )
-            starboard.stars_added += 1
-            key = f"{payload.channel_id}-{payload.message_id}"
-            # await star_message.update_count(self.bot, starboard, remove)
-            count = len(star_message.reactions)
-            log.debug(f"First time {count=} {starboard.threshold=}")
-            if count < starboard.threshold:
-                if key not in starboard.messages:
-                    self.starboards[guild.id][starboard.name].messages[key] = star_message
-                await self._save_starboards(guild)
+        if star_message is False:
+            added = [user_id for user_id, add in pending.users.items() if add]
+            if not added:
+                # Return early so we don't create a new starboard message
+                # when the first time we're seeing the message is on a
+                # reaction remove event
                 return
             try:
                 msg = await channel.fetch_message(payload.message_id)
             except (discord.errors.NotFound, discord.Forbidden):
                 return
-            if not starboard.selfstar and msg.author.id == payload.user_id:
-                log.debug("Is a selfstar so let's return")
-                # this is here to prevent 1 threshold selfstars
-                return
-            em = await self._build_embed(guild, msg, starboard)
-            count_msg = "{} **#{}**".format(payload.emoji, count)
-            post_msg = await star_channel.send(count_msg, embed=em)
-            if starboard.autostar:
-                try:
-                    await post_msg.add_reaction(starboard.emoji)
-                except Exception:
-                    log.exception("Error adding autostar.")
-            if key not in starboard.messages:
-                self.starboards[guild.id][starboard.name].messages[key] = star_message
-            star_message.new_message = post_msg.id
-            star_message.new_channel = star_channel.id
-            starboard.starred_messages += 1
-            index_key = f"{star_channel.id}-{post_msg.id}"
-            self.starboards[guild.id][starboard.name].messages[key] = star_message
-            self.starboards[guild.id][starboard.name].starboarded_messages[index_key] = key
-            await self._save_starboards(guild)
+            reactions = {u for u in added if starboard.selfstar or u != msg.author.id}
+            star_message = StarboardMessage(
+                guild=guild.id,
+                original_message=payload.message_id,
+                original_channel=payload.channel_id,
+                new_message=None,
+                new_channel=None,
+                author=msg.author.id,
+                reactions=reactions,
+            )
+            starboard.stars_added += len(reactions)
+        key = (payload.channel_id, payload.message_id)
+        # await star_message.update_count(self.bot, starboard, remove)
+        count = len(star_message.reactions)
+        log.debug(f"First time {count=} {starboard.threshold=}")
+        if count < starboard.threshold:
+            starboard.add_message(key, star_message)
+            starboard.mark_changed(key)
+            return
+        try:
+            msg = await channel.fetch_message(payload.message_id)
+        except (discord.errors.NotFound, discord.Forbidden):
+            return
+        em = await self._build_embed(guild, msg, starboard)
+        count_msg = "{} **#{}**".format(payload.emoji, count)
+        post_msg = await star_channel.send(count_msg, embed=em)
+        if starboard.autostar:
+            try:
+                await post_msg.add_reaction(starboard.emoji)
+            except Exception:
+                log.exception("Error adding autostar.")
+        starboard.add_message(key, star_message)
+        star_message.new_message = post_msg.id
+        star_message.new_channel = star_channel.id
+        starboard.starred_messages += 1
+        index_key = (star_channel.id, post_msg.id)
+        self.starboards[guild.id][starboard.name].starboarded_messages[index_key] = key
+        starboard.mark_changed(key, index_key)
+
+    def _schedule_edit(
+        self, starboard_msg: StarboardMessage, star_channel: discord.TextChannel, content: str
+    ) -> None:
+        """
+        Edits the starboard message to `content` in the background
+
+        If an edit for the message is still in progress only the latest
+        content is kept and sent once that edit is done.
+        """
+        running = starboard_msg.new_message in self.pending_edits
+        self.pending_edits[starboard_msg.new_message] = content
+        if not running:
+            # create a task because otherwise we could wait up to an hour to open the lock.
+            # This is thanks to announcement channels and published messages.
+            self.bot.loop.create_task(self._edit_message(starboard_msg, star_channel))
+
+    async def _edit_message(
+        self, starboard_msg: StarboardMessage, star_channel: discord.TextChannel
+    ) -> None:
+        message_id = starboard_msg.new_message
+        sent = None
+        try:
+            while (content := self.pending_edits.get(message_id)) != sent:
+                await starboard_msg.edit(star_channel, content)
+                sent = content
+        finally:
+            self.pending_edits.pop(message_id, None)
 
     async def red_delete_data_for_user(
         self,
@@ -262,9 +405,9 @@ class StarboardEvents:
         """
         for guild_id, starboards in self.starboards.items():
             for starboard, entry in starboards.items():
-                for message_ids, message in entry.messages.items():
+                for message_ids, message in list(entry.messages.items()):
                     if message.author == user_id:
-                        index_key = f"{message.new_channel}-{message.new_message}"
+                        index_key = (message.new_channel, message.new_message)
                         try:
                             del self.starboards[guild_id][starboard].messages[message_ids]
                             del self.starboards[guild_id][starboard].starboarded_messages[
@@ -289,46 +432,37 @@ class StarboardEvents:
         while True:
             total_pruned = 0
             guilds_ignored = 0
-            to_purge = datetime.utcnow() - purge
+            to_purge = time_snowflake(datetime.utcnow() - purge)
             # Prune only the last 30 days worth of data
-            for guild_id, starboards in self.starboards.items():
+            for guild_id, starboards in list(self.starboards.items()):
                 guild = self.bot.get_guild(guild_id)
                 if not guild:
                     guilds_ignored += 1
                     continue
                 # log.debug(f"Cleaning starboard data for {guild.name} ({guild.id})")
-                for name, starboard in starboards.items():
-                    async with starboard.lock:
-                        to_rem = []
-                        to_rem_index = []
-                        try:
-                            async for message_ids, message in AsyncIter(
-                                starboard.messages.items(), steps=500
-                            ):
-                                if message.new_message:
-                                    if snowflake_time(message.new_message) < to_purge:
-                                        to_rem.append(message_ids)
-                                        index_key = f"{message.new_channel}-{message.new_message}"
-                                        to_rem_index.append(index_key)
-                                else:
-                                    if snowflake_time(message.original_message) < to_purge:
-                                        to_rem.append(message_ids)
-                            for m in to_rem:
-                                log.debug(f"Removing {m}")
-                                del starboard.messages[m]
-                                total_pruned += 1
-                            for m in to_rem_index:
-                                del starboard.starboarded_messages[m]
-                            if len(to_rem) > 0:
-                                log.info(
-                                    f"Starboard pruned {len(to_rem)} messages that are "
-                                    f"{humanize_timedelta(timedelta=purge)} old from "
-                                    f"{guild.name} ({guild.id})"
-                                )
-                        except Exception:
-                            log.exception("Error trying to clenaup old starboard messages.")
-                await self._save_starboards(guild)
+                for name, starboard in list(starboards.items()):
+                    pruned = 0
+                    try:
+                        while True:
+                            # only hold the lock for a small batch at a time so
+                            # reactions can still be handled while pruning
+                            async with starboard.lock:
+                                removed = starboard.prune(to_purge, PRUNE_BATCH_SIZE)
+                            pruned += removed
+                            if removed < PRUNE_BATCH_SIZE:
+                                break
+                            await asyncio.sleep(0)
+                    except Exception:
+                        log.exception("Error trying to clenaup old starboard messages.")
+                    total_pruned += pruned
+                    if pruned:
+                        log.info(
+                            f"Starboard pruned {pruned} messages that are "
+                            f"{humanize_timedelta(timedelta=purge)} old from "
+                            f"{guild.name} ({guild.id})"
+                        )
             if total_pruned:
+                await self._save_changed_starboards()
                 log.info(
                     f"Starboard has pruned {total_pruned} messages and ignored {guilds_ignored} guilds."
                 )
@@ -341,6 +475,7 @@ class StarboardEvents:
         starboard: StarboardEntry,
         star_channel: discord.TextChannel,
         is_clear: bool = False,
+        users: Optional[Dict[int, bool]] = None,
     ) -> Union[StarboardMessage, bool]:
         """
         This handles finding if we have already saved a message internally
@@ -355,6 +490,9 @@ class StarboardEvents:
                 The channel which we want to send starboard messages into.
             is_clear: bool
                 Whether or not the reaction event was for clearing all emojis.
+            users: Optional[Dict[int, bool]]
+                The users who added (True) or removed (False) their reaction.
+                Defaults to the user from the payload.
 
         Returns
         -------
@@ -368,11 +506,9 @@ class StarboardEvents:
                 False if we want to post the new starboard message.
 
         """
-        try:
-            guild = star_channel.guild
-        except AttributeError:
+        if star_channel is None:
             return False
-        key = f"{payload.channel_id}-{payload.message_id}"
+        key = (payload.channel_id, payload.message_id)
         if key in starboard.messages:
             # the starred message was an original starboard message
             starboard_msg = starboard.messages[key]
@@ -385,38 +521,42 @@ class StarboardEvents:
             return False
 
         # await starboard_msg.update_count(self.bot, starboard, remove)
-        if not starboard.selfstar and payload.user_id == starboard_msg.author:
-            return True
+        if users is None:
+            added = getattr(payload, "event_type", None) == "REACTION_ADD"
+            users = {getattr(payload, "user_id", 0): added}
+        if not starboard.selfstar:
+            users = {u: added for u, added in users.items() if u != starboard_msg.author}
+            if not users:
+                return True
 
-        if getattr(payload, "event_type", None) == "REACTION_ADD":
-            if (user_id := getattr(payload, "user_id", 0)) not in starboard_msg.reactions:
-                starboard_msg.reactions.append(user_id)
-                log.debug("Adding user in _loop_messages")
-                starboard.stars_added += 1
-        else:
-            if (user_id := getattr(payload, "user_id", 0)) in starboard_msg.reactions:
+        for user_id, added in users.items():
+            if added:
+                if user_id not in starboard_msg.reactions:
+                    starboard_msg.reactions.add(user_id)
+                    log.debug("Adding user in _loop_messages")
+                    starboard.stars_added += 1
+            elif user_id in starboard_msg.reactions:
                 starboard_msg.reactions.remove(user_id)
                 log.debug("Removing user in _loop_messages")
                 starboard.stars_added -= 1
+        starboard.mark_changed(key)
 
         if not starboard_msg.new_message or not starboard_msg.new_channel:
             return starboard_msg
         count = len(starboard_msg.reactions)
         log.debug(f"Existing {count=} {starboard.threshold=}")
         if count < starboard.threshold:
+            index_key = (starboard_msg.new_channel, starboard_msg.new_message)
             try:
-                index_key = f"{starboard_msg.new_channel}-{starboard_msg.new_message}"
                 del starboard.starboarded_messages[index_key]
                 log.debug("Removed old message from index")
             except KeyError:
                 pass
             await starboard_msg.delete(star_channel)
             starboard.starred_messages -= 1
-            await self._save_starboards(guild)
+            starboard.mark_changed(key, index_key)
             return True
         log.debug("Editing starboard")
         count_message = f"{starboard.emoji} **#{count}**"
-        self.bot.loop.create_task(starboard_msg.edit(star_channel, count_message))
-        # create a task because otherwise we could wait up to an hour to open the lock.
-        # This is thanks to announcement channels and published messages.
+        self._schedule_edit(starboard_msg, star_channel, count_message)
         return True
@@ -27,7 +27,7 @@ class Starboard(StarboardEvents, commands.Cog):
     Create a starboard to *pin* those special comments indefinitely
     """
 
-    __version__ = "2.5.6"
+    __version__ = "2.6.0"
     __author__ = "TrustyJAID"
 
     def __init__(self, bot):
@@ -39,6 +39,10 @@ class Starboard(StarboardEvents, commands.Cog):
         self.init_task: asyncio.Task = self.bot.loop.create_task(self.initialize())
         self.ready = asyncio.Event()
         self.cleanup_loop: Optional[asyncio.Task] = None
+        self.save_loop: Optional[asyncio.Task] = None
+        self.pending_reactions = {}
+        self.pending_edits = {}
+        self.emoji_index = {}
 
     async def initialize(self) -> None:
         log.debug("Started building starboards cache from config.")
@@ -51,8 +55,10 @@ class Starboard(StarboardEvents, commands.Cog):
                 except Exception:
                     log.exception("error converting starboard")
                 self.starboards[guild_id][name] = starboard
+            self.rebuild_emoji_index(guild_id)
 
         self.cleanup_loop = asyncio.create_task(self.cleanup_old_messages())
+        self.save_loop = asyncio.create_task(self.save_changed_loop())
         self.ready.set()
         log.debug("Done building starboards cache from config.")
 
@@ -61,6 +67,12 @@ class Starboard(StarboardEvents, commands.Cog):
         self.init_task.cancel()
         if self.cleanup_loop:
             self.cleanup_loop.cancel()
+        for pending in self.pending_reactions.values():
+            if pending.task:
+                pending.task.cancel()
+        if self.save_loop:
+            self.save_loop.cancel()
+            self.bot.loop.create_task(self._flush_and_save())
 
     async def cog_check(self, ctx: commands.Context) -> bool:
         return self.ready.is_set()
@@ -235,6 +247,7 @@ class Starboard(StarboardEvents, commands.Cog):
             try:
                 del self.starboards[ctx.guild.id][starboard.name]
                 del starboards[starboard.name]
+                self.rebuild_emoji_index(ctx.guild.id)
             except Exception:
                 log.exception("Error removing starboard")
                 await ctx.send("Deleting the starboard failed.")
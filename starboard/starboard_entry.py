@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple, Union
 
 import discord
 from redbot import VersionInfo, version_info
@@ -12,6 +13,19 @@ from redbot.core.utils import AsyncIter
 
 log = logging.getLogger("red.trusty-cogs.starboard")
 
+# (channel_id, message_id) used to index messages in memory,
+# saved to config as the string "channel_id-message_id"
+MessageKey = Tuple[int, int]
+
+
+def key_to_str(key: MessageKey) -> str:
+    return "{}-{}".format(*key)
+
+
+def key_from_str(key: str) -> MessageKey:
+    channel_id, message_id = key.split("-")
+    return (int(channel_id), int(message_id))
+
 
 @dataclass
 class FakePayload:
@@ -25,6 +39,30 @@ class FakePayload:
     event_type: str
 
 
+class AllowedIDs(NamedTuple):
+    """The IDs in a starboards allowlist and blocklist split by type"""
+
+    whitelist_channels: FrozenSet[int]
+    whitelist_roles: FrozenSet[int]
+    blacklist_channels: FrozenSet[int]
+    blacklist_roles: FrozenSet[int]
+
+
+@dataclass
+class PendingReactions:
+    """
+    Reaction changes on a single message waiting to be applied together
+
+    `users` maps each user ID to whether their latest event added (True)
+    or removed (False) their reaction so only the final state is applied.
+    """
+
+    payload: Union[discord.RawReactionActionEvent, FakePayload]
+    starboard: StarboardEntry
+    users: Dict[int, bool] = field(default_factory=dict)
+    task: Optional[asyncio.Task] = None
+
+
 @dataclass
 class StarboardEntry:
     def __init__(self, **kwargs):
@@ -39,13 +77,24 @@ class StarboardEntry:
         self.selfstar: bool = kwargs.get("selfstar", False)
         self.blacklist: List[int] = kwargs.get("blacklist", [])
         self.whitelist: List[int] = kwargs.get("whitelist", [])
-        self.messages: Dict[str, StarboardMessage] = kwargs.get("messages", {})
-        self.starboarded_messages: Dict[str, str] = kwargs.get("starboarded_messages", {})
+        self.messages: Dict[MessageKey, StarboardMessage] = kwargs.get("messages", {})
+        self.starboarded_messages: Dict[MessageKey, MessageKey] = kwargs.get(
+            "starboarded_messages", {}
+        )
         self.threshold: int = kwargs.get("threshold", 1)
         self.autostar: bool = kwargs.get("autostar", False)
         self.starred_messages: int = kwargs.get("starred_messages", 0)
         self.stars_added: int = kwargs.get("stars_added", 0)
         self.lock: asyncio.Lock = asyncio.Lock()
+        self.changed_messages: Set[MessageKey] = set()
+        self.changed_index: Set[MessageKey] = set()
+        self._allowed: Optional[AllowedIDs] = None
+        # (snowflake, key) for every message ordered by age so pruning only
+        # needs to look at messages old enough to be removed
+        self._by_age: List[Tuple[int, MessageKey]] = [
+            (message.age_snowflake, key) for key, message in self.messages.items()
+        ]
+        heapq.heapify(self._by_age)
 
     def __repr__(self) -> str:
         return (
@@ -53,6 +102,33 @@ class StarboardEntry:
             "enabled={0.enabled} threshold={0.threshold}>"
         ).format(self)
 
+    def invalidate_allowed(self) -> None:
+        """Clears the cached allowlist and blocklist after they're changed"""
+        self._allowed = None
+
+    def allowed_ids(self, guild: discord.Guild) -> AllowedIDs:
+        """
+        Returns the channels and roles in the allowlist and blocklist that
+        still exist in the guild. These are cached until the starboard
+        or the guilds channels or roles change.
+        """
+        if self._allowed is None:
+            self._allowed = AllowedIDs(
+                whitelist_channels=frozenset(
+                    i for i in self.whitelist if guild.get_channel(i) is not None
+                ),
+                whitelist_roles=frozenset(
+                    i for i in self.whitelist if guild.get_role(i) is not None
+                ),
+                blacklist_channels=frozenset(
+                    i for i in self.blacklist if guild.get_channel(i) is not None
+                ),
+                blacklist_roles=frozenset(
+                    i for i in self.blacklist if guild.get_role(i) is not None
+                ),
+            )
+        return self._allowed
+
     def check_roles(self, member: Union[discord.Member, discord.User]) -> bool:
         """
         Checks if the user is allowed to add to the starboard
@@ -73,26 +149,15 @@ class StarboardEntry:
             # this will account for non-members reactions and still count
             # for the starboard count
             return True
-        guild = member.guild
-        whitelisted_roles = [
-            guild.get_role(rid) for rid in self.whitelist if guild.get_role(rid) is not None
-        ]
-        blacklisted_roles = [
-            guild.get_role(rid) for rid in self.blacklist if guild.get_role(rid) is not None
-        ]
-        if whitelisted_roles:
+        allowed = self.allowed_ids(member.guild)
+        if allowed.whitelist_roles:
             # only count if the whitelist contains actual roles
-            for role in whitelisted_roles:
-                if role in member.roles:
-                    return True
-            return False
             # Since we'd normally return True
             # if there is a whitelist we want to ensure only whitelisted
             # roles can starboard something
-        if blacklisted_roles:
-            for role in blacklisted_roles:
-                if role in member.roles:
-                    return False
+            return any(role.id in allowed.whitelist_roles for role in member.roles)
+        if allowed.blacklist_roles:
+            return not any(role.id in allowed.blacklist_roles for role in member.roles)
 
         return True
 
@@ -117,16 +182,9 @@ class StarboardEntry:
         guild = bot.get_guild(self.guild)
         if channel.is_nsfw() and not guild.get_channel(self.channel).is_nsfw():
             return False
-        whitelisted_channels = [
-            guild.get_channel(cid).id
-            for cid in self.whitelist
-            if guild.get_channel(cid) is not None
-        ]
-        blacklisted_channels = [
-            guild.get_channel(cid).id
-            for cid in self.blacklist
-            if guild.get_channel(cid) is not None
-        ]
+        allowed = self.allowed_ids(guild)
+        whitelisted_channels = allowed.whitelist_channels
+        blacklisted_channels = allowed.blacklist_channels
         if whitelisted_channels:
             if channel.id in whitelisted_channels:
                 return True
@@ -140,6 +198,68 @@ class StarboardEntry:
                 return False
         return True
 
+    def add_message(self, key: MessageKey, message: StarboardMessage) -> None:
+        """Starts tracking `message` if it isn't already"""
+        if key in self.messages:
+            return
+        self.messages[key] = message
+        heapq.heappush(self._by_age, (message.age_snowflake, key))
+
+    def prune(self, before: int, limit: int) -> int:
+        """
+        Removes up to `limit` messages whose age snowflake is older than `before`
+
+        Entries left in the heap by messages that were removed or whose age
+        changed after being posted are skipped or re-queued as they come up.
+
+        Returns
+        -------
+            int
+                The number of messages removed.
+        """
+        removed = 0
+        while self._by_age and self._by_age[0][0] < before and removed < limit:
+            snowflake, key = heapq.heappop(self._by_age)
+            message = self.messages.get(key)
+            if message is None:
+                continue
+            if message.age_snowflake != snowflake:
+                heapq.heappush(self._by_age, (message.age_snowflake, key))
+                continue
+            del self.messages[key]
+            index_key = None
+            if message.new_message:
+                index_key = (message.new_channel, message.new_message)
+                self.starboarded_messages.pop(index_key, None)
+            self.mark_changed(key, index_key)
+            removed += 1
+        return removed
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changed_messages or self.changed_index)
+
+    def mark_changed(self, key: MessageKey, index_key: Optional[MessageKey] = None) -> None:
+        """
+        Records that the message saved under `key` and optionally the
+        starboarded message index `index_key` need to be saved.
+        """
+        self.changed_messages.add(key)
+        if index_key is not None:
+            self.changed_index.add(index_key)
+
+    def pop_changes(self) -> Tuple[Set[MessageKey], Set[MessageKey]]:
+        """Returns and resets the message and index keys changed since the last save"""
+        changes = (self.changed_messages, self.changed_index)
+        self.changed_messages = set()
+        self.changed_index = set()
+        return changes
+
+    def restore_changes(self, messages: Set[MessageKey], index: Set[MessageKey]) -> None:
+        """Marks changes returned by `pop_changes` again after a failed save"""
+        self.changed_messages.update(messages)
+        self.changed_index.update(index)
+
     async def to_json(self) -> dict:
         return {
             "name": self.name,
@@ -152,41 +272,72 @@ class StarboardEntry:
             "blacklist": self.blacklist,
             "whitelist": self.whitelist,
             "messages": {
-                k: m.to_json() async for k, m in AsyncIter(self.messages.items(), steps=500)
+                key_to_str(k): m.to_json()
+                async for k, m in AsyncIter(self.messages.items(), steps=500)
+            },
+            "starboarded_messages": {
+                key_to_str(k): key_to_str(v)
+                async for k, v in AsyncIter(self.starboarded_messages.items(), steps=500)
             },
-            "starboarded_messages": self.starboarded_messages,
             "threshold": self.threshold,
             "autostar": self.autostar,
             "starred_messages": self.starred_messages,
             "stars_added": self.stars_added,
         }
 
+    def update_json(self, data: dict, messages: Set[MessageKey], index: Set[MessageKey]) -> None:
+        """
+        Applies only the changed messages and index entries to a copy of
+        this starboards saved data along with the running totals.
+        """
+        for key in messages:
+            if key in self.messages:
+                data["messages"][key_to_str(key)] = self.messages[key].to_json()
+            else:
+                data["messages"].pop(key_to_str(key), None)
+        for index_key in index:
+            if index_key in self.starboarded_messages:
+                original = key_to_str(self.starboarded_messages[index_key])
+                data["starboarded_messages"][key_to_str(index_key)] = original
+            else:
+                data["starboarded_messages"].pop(key_to_str(index_key), None)
+        data["starred_messages"] = self.starred_messages
+        data["stars_added"] = self.stars_added
+
     @classmethod
     async def from_json(cls, data: dict, guild_id: Optional[int]):
         messages = data.get("messages", {})
         guild = data.get("guild", guild_id)
         if guild is None and guild_id is not None:
             guild = guild_id
-        starboarded_messages = data.get("starboarded_messages", {})
+        starboarded_messages = {}
+        async for k, v in AsyncIter(data.get("starboarded_messages", {}).items(), steps=500):
+            try:
+                starboarded_messages[key_from_str(k)] = key_from_str(v)
+            except ValueError:
+                # older versions indexed messages that were never posted as "None-None"
+                continue
         if isinstance(messages, list):
             new_messages = {}
             async for message_data in AsyncIter(messages, steps=500):
                 message_obj = StarboardMessage.from_json(message_data, guild)
                 if not message_obj.guild:
                     message_obj.guild = guild
-                key = f"{message_obj.original_channel}-{message_obj.original_message}"
+                key = (message_obj.original_channel, message_obj.original_message)
                 new_messages[key] = message_obj
             messages = new_messages
         else:
             new_messages = {}
-            async for key, value in AsyncIter(messages.items()):
+            async for key, value in AsyncIter(messages.items(), steps=500):
                 msg = StarboardMessage.from_json(value, guild)
-                new_messages[key] = msg
+                new_messages[key_from_str(key)] = msg
             messages = new_messages
         if not starboarded_messages:
-            async for message_ids, obj in AsyncIter(messages.items()):
-                key = f"{obj.new_channel}-{obj.new_message}"
-                starboarded_messages[key] = f"{obj.original_channel}-{obj.original_message}"
+            async for message_ids, obj in AsyncIter(messages.items(), steps=500):
+                if not obj.new_message or not obj.new_channel:
+                    continue
+                key = (obj.new_channel, obj.new_message)
+                starboarded_messages[key] = (obj.original_channel, obj.original_message)
         starred_messages = data.get("starred_messages", len(starboarded_messages))
         stars_added = data.get("stars_added", 0)
         if not stars_added:
@@ -226,9 +377,19 @@ class StarboardMessage:
     """A class to hold message objects pertaining
     To starboarded messages including the original
     message ID, and the starboard message ID
-    as well as a list of users who have added their "vote"
+    as well as a set of users who have added their "vote"
     """
 
+    __slots__ = (
+        "guild",
+        "original_message",
+        "original_channel",
+        "new_message",
+        "new_channel",
+        "author",
+        "reactions",
+    )
+
     def __init__(self, **kwargs):
         self.guild: int = kwargs.get("guild", None)
         self.original_message: int = kwargs.get("original_message", 0)
@@ -236,7 +397,12 @@ class StarboardMessage:
         self.new_message: Optional[int] = kwargs.get("new_message")
         self.new_channel: Optional[int] = kwargs.get("new_channel")
         self.author: int = kwargs.get("author", 0)
-        self.reactions: List[int] = kwargs.get("reactions", [])
+        self.reactions: Set[int] = set(kwargs.get("reactions", []))
+
+    @property
+    def age_snowflake(self) -> int:
+        """The snowflake used to determine how old this entry is for pruning"""
+        return self.new_message or self.original_message
 
     def __repr__(self) -> str:
         return (
@@ -323,11 +489,10 @@ class StarboardMessage:
                     continue
                 if not starboard.selfstar and user.id == orig_msg.author.id:
                     continue
-                if user.id not in self.reactions and not user.bot:
-                    self.reactions.append(user.id)
-        if remove and remove in self.reactions:
-            self.reactions.remove(remove)
-        self.reactions = list(set(self.reactions))
+                if not user.bot:
+                    self.reactions.add(user.id)
+        if remove:
+            self.reactions.discard(remove)
         return self
 
     def to_json(self) -> Dict[str, Union[List[int], int, None]]:
@@ -338,7 +503,7 @@ class StarboardMessage:
             "new_message": self.new_message,
             "new_channel": self.new_channel,
             "author": self.author,
-            "reactions": self.reactions,
+            "reactions": list(self.reactions),
         }
 
     @classmethod